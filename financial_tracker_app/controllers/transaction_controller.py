@@ -24,7 +24,7 @@ class TransactionController:
             database: A Database object with a connection to the SQLite database.
         """
         self.db = database
-        self.transaction_repository = TransactionRepository(database.conn)
+        self.transaction_repository = TransactionRepository(database.conn, database.read_conn)
 
         # Cache for transactions
         self.transactions = []
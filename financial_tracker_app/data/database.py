@@ -2,6 +2,8 @@
 
 import sqlite3
 import os
+import queue
+from contextlib import contextmanager
 from datetime import datetime
 from typing import List, Dict, Optional, Any, Union
 from decimal import Decimal # Import Decimal for potential type hints or internal use
@@ -17,13 +19,113 @@ except ImportError:
         def is_enabled(self, category):
             return False
     debug_config = DummyDebugConfig()
-    def debug_print(category, message):
+    def debug_print(category, message, *args):
         pass
 # --- End Updated Imports ---
 
 # Define a consistent date format string
 DB_DATE_FORMAT = "%Y-%m-%d" # Using only date part based on GUI usage
 
+# date.toordinal() + this offset == CAST(julianday('YYYY-MM-DD') AS INTEGER) in SQLite
+JULIAN_DAY_OFFSET = 1721424
+
+# Stored in PRAGMA user_version once the special categories are in place.
+# Bump it whenever CategoryManager.special_categories changes.
+SCHEMA_VERSION = 1
+
+# Number of read-only connections kept alongside the single writer connection
+READ_POOL_SIZE = 2
+
+# Per-connection cache settings, applied to the writer and every read connection:
+# a 64 MB page cache, temp tables/indexes in memory and 256 MB of memory-mapped I/O
+_CONNECTION_PRAGMAS = (
+    "PRAGMA cache_size = -65536",
+    "PRAGMA temp_store = MEMORY",
+    "PRAGMA mmap_size = 268435456",
+)
+
+def to_julian_day(date_str: str) -> int:
+    """Convert a 'YYYY-MM-DD' date string to the integer stored in transaction_date_jd."""
+    return datetime.strptime(date_str, DB_DATE_FORMAT).toordinal() + JULIAN_DAY_OFFSET
+
+# Full schema, applied in one executescript() call inside a single transaction.
+# Every statement is idempotent (IF NOT EXISTS) so it is safe to run on each start.
+_SCHEMA_SQL = """
+BEGIN;
+
+-- Currencies Table
+CREATE TABLE IF NOT EXISTS currencies (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    currency TEXT NOT NULL,             -- e.g., US Dollar
+    currency_code TEXT UNIQUE NOT NULL, -- e.g., USD
+    currency_symbol TEXT                -- e.g., $
+);
+
+-- Bank Accounts Table
+CREATE TABLE IF NOT EXISTS bank_accounts (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    account TEXT NOT NULL UNIQUE,     -- Added UNIQUE constraint for account name
+    account_type TEXT NOT NULL,       -- e.g., Bank account, Credit Card
+    account_details TEXT,             -- e.g., Last 4 digits ****1234
+    currency_id INTEGER NOT NULL,
+    FOREIGN KEY (currency_id) REFERENCES currencies (id) ON DELETE RESTRICT -- Prevent deleting used currency
+);
+
+-- Categories Table
+CREATE TABLE IF NOT EXISTS categories (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    category TEXT NOT NULL,
+    type TEXT NOT NULL CHECK(type IN ('Income', 'Expense')), -- Type constraint
+    UNIQUE(category, type) -- Ensure category name is unique per type
+);
+
+-- Sub Categories Table
+CREATE TABLE IF NOT EXISTS sub_categories (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    sub_category TEXT NOT NULL,
+    category_id INTEGER NOT NULL,
+    FOREIGN KEY (category_id) REFERENCES categories (id) ON DELETE CASCADE, -- Cascade delete if category is removed
+    UNIQUE(category_id, sub_category) -- Ensure subcategory is unique within its parent category
+);
+
+-- Transactions Table
+CREATE TABLE IF NOT EXISTS transactions (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    transaction_name TEXT,             -- Optional name/title
+    transaction_description TEXT,
+    account_id INTEGER NOT NULL,
+    transaction_value REAL NOT NULL,   -- Amount (REAL is suitable for SQLite floats)
+    transaction_type TEXT NOT NULL CHECK(transaction_type IN ('Income', 'Expense')),
+    transaction_category INTEGER NOT NULL, -- Reverted name
+    transaction_sub_category INTEGER NOT NULL, -- Reverted name
+    transaction_date TEXT NOT NULL,    -- Store as ISO format string 'YYYY-MM-DD'
+    transaction_date_jd INTEGER,       -- Julian day of transaction_date, used for sorting and ranges
+    FOREIGN KEY (account_id) REFERENCES bank_accounts (id) ON DELETE RESTRICT,
+    FOREIGN KEY (transaction_category) REFERENCES categories (id) ON DELETE RESTRICT, -- Reverted name
+    FOREIGN KEY (transaction_sub_category) REFERENCES sub_categories (id) ON DELETE RESTRICT -- Reverted name
+);
+
+-- Create indexes for faster lookups on foreign keys and dates
+CREATE INDEX IF NOT EXISTS idx_transactions_account ON transactions (account_id);
+CREATE INDEX IF NOT EXISTS idx_transactions_category ON transactions (transaction_category); -- Reverted name
+CREATE INDEX IF NOT EXISTS idx_transactions_subcategory ON transactions (transaction_sub_category); -- Reverted name
+CREATE INDEX IF NOT EXISTS idx_transactions_date ON transactions (transaction_date_jd);
+CREATE INDEX IF NOT EXISTS idx_subcat_category ON sub_categories (category_id);
+
+-- Budgets (Keep schema as is for now)
+CREATE TABLE IF NOT EXISTS budgets (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    category_id INTEGER,
+    sub_category_id INTEGER, -- Maybe budget by subcategory?
+    amount REAL NOT NULL,
+    month TEXT NOT NULL,     -- e.g., 'YYYY-MM'
+    FOREIGN KEY (category_id) REFERENCES categories (id) ON DELETE CASCADE,
+    FOREIGN KEY (sub_category_id) REFERENCES sub_categories(id) ON DELETE CASCADE
+);
+
+COMMIT;
+"""
+
 class Database:
     def __init__(self, db_path=None):
         # Set the database path
@@ -33,11 +135,17 @@ class Database:
         
         # Store the path for potential backup operations
         self.db_path = db_path
-        
-        # Connect to the database
-        self.conn = sqlite3.connect(db_path)
+
+        # Connect to the database. isolation_level=None leaves transaction control to us:
+        # single statements autocommit, multi-statement writes use BEGIN / `with self.conn:`
+        self.conn = sqlite3.connect(db_path, isolation_level=None)
         self.conn.row_factory = sqlite3.Row
         self.conn.execute("PRAGMA foreign_keys = ON") # Enable foreign key constraints
+        # WAL lets the read connections below run while the writer is mid-transaction
+        self.conn.execute("PRAGMA journal_mode = WAL")
+        # In WAL mode NORMAL only syncs at checkpoints and is still safe against corruption
+        self.conn.execute("PRAGMA synchronous = NORMAL")
+        self._apply_connection_pragmas(self.conn)
         
         # Initialize database if tables don't exist
         self.create_tables()
@@ -45,8 +153,17 @@ class Database:
         # Create category manager instance
         self.category_manager = CategoryManager(self.conn)
         
-        # Ensure special categories exist
-        self.category_manager.ensure_special_categories()
+        # Ensure special categories exist, but only when the stored schema version says
+        # they may be missing (or one was deleted since); otherwise startup skips the work
+        schema_version = self.conn.execute("PRAGMA user_version").fetchone()[0]
+        if schema_version != SCHEMA_VERSION or not self.category_manager.has_special_categories():
+            self.category_manager.ensure_special_categories()
+            self.conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+        # Read-only connections for queries, so long reads don't serialize against writes
+        self._read_pool = queue.Queue()
+        for _ in range(READ_POOL_SIZE):
+            self._read_pool.put(self._open_read_connection())
 
     def create_tables(self):
         """Create necessary tables if they don't exist."""
@@ -56,95 +173,92 @@ class Database:
 
         cursor = self.conn.cursor()
         try:
-            # --- Currencies Table ---
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS currencies (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    currency TEXT NOT NULL,             -- e.g., US Dollar
-                    currency_code TEXT UNIQUE NOT NULL, -- e.g., USD
-                    currency_symbol TEXT                -- e.g., $
-                )
-            """)
-
-            # --- Bank Accounts Table ---
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS bank_accounts (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    account TEXT NOT NULL UNIQUE,     -- Added UNIQUE constraint for account name
-                    account_type TEXT NOT NULL,       -- e.g., Bank account, Credit Card
-                    account_details TEXT,             -- e.g., Last 4 digits ****1234
-                    currency_id INTEGER NOT NULL,
-                    FOREIGN KEY (currency_id) REFERENCES currencies (id) ON DELETE RESTRICT -- Prevent deleting used currency
-                )
-            """)
-
-            # --- Categories Table ---
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS categories (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    category TEXT NOT NULL,
-                    type TEXT NOT NULL CHECK(type IN ('Income', 'Expense')), -- Type constraint
-                    UNIQUE(category, type) -- Ensure category name is unique per type
-                )
-            """)
-
-            # --- Sub Categories Table ---
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS sub_categories (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    sub_category TEXT NOT NULL,
-                    category_id INTEGER NOT NULL,
-                    FOREIGN KEY (category_id) REFERENCES categories (id) ON DELETE CASCADE, -- Cascade delete if category is removed
-                    UNIQUE(category_id, sub_category) -- Ensure subcategory is unique within its parent category
-                )
-            """)
-
-            # --- Transactions Table ---
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS transactions (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    transaction_name TEXT,             -- Optional name/title
-                    transaction_description TEXT,
-                    account_id INTEGER NOT NULL,
-                    transaction_value REAL NOT NULL,   -- Amount (REAL is suitable for SQLite floats)
-                    transaction_type TEXT NOT NULL CHECK(transaction_type IN ('Income', 'Expense')),
-                    transaction_category INTEGER NOT NULL, -- Reverted name
-                    transaction_sub_category INTEGER NOT NULL, -- Reverted name
-                    transaction_date TEXT NOT NULL,    -- Store as ISO format string 'YYYY-MM-DD'
-                    FOREIGN KEY (account_id) REFERENCES bank_accounts (id) ON DELETE RESTRICT,
-                    FOREIGN KEY (transaction_category) REFERENCES categories (id) ON DELETE RESTRICT, -- Reverted name
-                    FOREIGN KEY (transaction_sub_category) REFERENCES sub_categories (id) ON DELETE RESTRICT, -- Reverted name
-                    -- Add check constraint for date format to enforce ISO format 'YYYY-MM-DD'
-                    CHECK(transaction_date GLOB '[0-9][0-9][0-9][0-9]-[0-9][0-9]-[0-9][0-9]')
-                )
-            """)
-            # Create indexes for faster lookups on foreign keys and dates
-            cursor.execute("CREATE INDEX IF NOT EXISTS idx_transactions_account ON transactions (account_id);")
-            cursor.execute("CREATE INDEX IF NOT EXISTS idx_transactions_category ON transactions (transaction_category);") # Reverted name
-            cursor.execute("CREATE INDEX IF NOT EXISTS idx_transactions_subcategory ON transactions (transaction_sub_category);") # Reverted name
-            cursor.execute("CREATE INDEX IF NOT EXISTS idx_transactions_date ON transactions (transaction_date);")
-            cursor.execute("CREATE INDEX IF NOT EXISTS idx_subcat_category ON sub_categories (category_id);")
-
-
-            # --- Budgets Table (Keep schema as is for now) ---
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS budgets (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    category_id INTEGER,
-                    sub_category_id INTEGER, -- Maybe budget by subcategory?
-                    amount REAL NOT NULL,
-                    month TEXT NOT NULL,     -- e.g., 'YYYY-MM'
-                    FOREIGN KEY (category_id) REFERENCES categories (id) ON DELETE CASCADE,
-                    FOREIGN KEY (sub_category_id) REFERENCES sub_categories(id) ON DELETE CASCADE
-                )
-            """)
-
-            self.conn.commit()
+            # Older databases predate transaction_date_jd; add and backfill it before the
+            # schema script indexes that column
+            self._migrate_transaction_date_jd(cursor)
+
+            cursor.executescript(_SCHEMA_SQL)
         except sqlite3.Error as e:
             debug_print('FOREIGN_KEYS', f"Error creating/ensuring tables: {e}")
             if self.conn:
                  self.conn.rollback() # Rollback any partial changes if error occurs
 
+    def _open_read_connection(self):
+        """Open a query-only connection to the same database file for the read pool."""
+        conn = sqlite3.connect(self.db_path, isolation_level=None, check_same_thread=False)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA query_only = ON")
+        self._apply_connection_pragmas(conn)
+        return conn
+
+    @staticmethod
+    def _apply_connection_pragmas(conn):
+        """Apply the shared cache/mmap settings to a freshly opened connection."""
+        for pragma in _CONNECTION_PRAGMAS:
+            conn.execute(pragma)
+
+    @contextmanager
+    def read_conn(self):
+        """
+        Borrow a read-only connection from the pool for the duration of the block.
+
+        If every pooled connection is already in use (e.g. a caller is still iterating
+        a generator), a temporary read connection is opened for the block instead of
+        blocking. Reads never borrow the writer: it may be inside a BEGIN (see
+        _save_changes, bulk_ensure), and a read there would see uncommitted rows.
+
+        Example:
+            with db.read_conn() as conn:
+                rows = conn.execute("SELECT ...").fetchall()
+        """
+        try:
+            conn = self._read_pool.get_nowait()
+        except queue.Empty:
+            conn = self._open_read_connection()
+            try:
+                yield conn
+            finally:
+                conn.close()
+            return
+        try:
+            yield conn
+        finally:
+            self._read_pool.put(conn)
+
+    def _migrate_transaction_date_jd(self, cursor):
+        """Add and backfill transaction_date_jd on databases created before it existed."""
+        cursor.execute("PRAGMA table_info(transactions)")
+        columns = {row[1] for row in cursor.fetchall()}
+        # No columns means a fresh database; the schema script creates the table with it
+        if not columns or 'transaction_date_jd' in columns:
+            return
+
+        debug_print('FOREIGN_KEYS', "Migrating transactions table: adding transaction_date_jd")
+        cursor.execute("BEGIN")
+        with self.conn:
+            cursor.execute("ALTER TABLE transactions ADD COLUMN transaction_date_jd INTEGER")
+            cursor.execute("UPDATE transactions SET transaction_date_jd = CAST(julianday(transaction_date) AS INTEGER)")
+            # The old date index was on the TEXT column; the schema script recreates it on the integer one
+            cursor.execute("DROP INDEX IF EXISTS idx_transactions_date")
+
+    @contextmanager
+    def bulk_ensure(self):
+        """
+        Group many ensure_category/ensure_subcategory calls into one commit.
+
+        Outside the block each ensure_* insert autocommits on its own; inside it
+        they all join one explicit transaction, committed once when the block
+        exits or rolled back if it raises.
+
+        Example:
+            with db.bulk_ensure():
+                for name, type_ in rows:
+                    db.ensure_category(name, type_)
+        """
+        self.conn.execute("BEGIN")
+        with self.conn:
+            yield self
+
     def ensure_category(self, category_name: str, transaction_type: str = 'Expense') -> Optional[int]:
         """
         Ensure a category exists in the database.
@@ -183,12 +297,9 @@ class Database:
                 "INSERT INTO categories (category, type) VALUES (?, ?)",
                 (category_name, transaction_type)
             )
-            self.conn.commit()
             return cursor.lastrowid
         except sqlite3.Error as e:
             print(f"Error ensuring category {category_name}: {e}")
-            if self.conn.in_transaction:
-                self.conn.rollback()
             return None
 
     def ensure_subcategory(self, subcategory_name: str, category_id: int) -> Optional[int]:
@@ -224,12 +335,9 @@ class Database:
                 "INSERT INTO sub_categories (sub_category, category_id) VALUES (?, ?)",
                 (subcategory_name, category_id)
             )
-            self.conn.commit()
             return cursor.lastrowid
         except sqlite3.Error as e:
             print(f"Error ensuring subcategory {subcategory_name}: {e}")
-            if self.conn.in_transaction:
-                self.conn.rollback()
             return None
 
     def get_default_category_id(self, transaction_type: str) -> Optional[int]:
@@ -254,14 +362,13 @@ class Database:
             or None if the account or its currency does not exist
         """
         try:
-            cursor = self.conn.cursor()
-            cursor.execute("""
-                SELECT c.currency, c.currency_code, c.currency_symbol
-                FROM bank_accounts ba
-                JOIN currencies c ON ba.currency_id = c.id
-                WHERE ba.id = ?
-            """, (account_id,))
-            result = cursor.fetchone()
+            with self.read_conn() as conn:
+                result = conn.execute("""
+                    SELECT c.currency, c.currency_code, c.currency_symbol
+                    FROM bank_accounts ba
+                    JOIN currencies c ON ba.currency_id = c.id
+                    WHERE ba.id = ?
+                """, (account_id,)).fetchone()
             
             if result:
                 return {
@@ -275,7 +382,15 @@ class Database:
             return {'currency': 'US Dollar', 'currency_code': 'USD', 'currency_symbol': '$'}  # Default fallback
 
     def close(self):
-        """Close the database connection."""
+        """Close the database connection and the pooled read connections."""
+        while True:
+            try:
+                self._read_pool.get_nowait().close()
+            except queue.Empty:
+                break
+            except sqlite3.Error as e:
+                debug_print('FOREIGN_KEYS', f"Error closing read connection: {e}")
+
         if self.conn:
             try:
                 self.conn.close()
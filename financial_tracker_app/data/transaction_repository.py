@@ -5,11 +5,62 @@ related to transactions.
 """
 
 import sqlite3
+from contextlib import closing, nullcontext
 from datetime import datetime
 
+from financial_tracker_app.data.database import to_julian_day
 from financial_tracker_app.models.transaction import Transaction
 from financial_tracker_app.utils.debug_config import debug_print
 
+# Shared SELECT for all read paths; callers append WHERE/ORDER BY/LIMIT clauses.
+# Column order must match _transaction_from_row.
+_SELECT_TRANSACTIONS = '''
+    SELECT t.rowid, t.transaction_name, t.transaction_value,
+           t.account_id, a.account as account_name,
+           t.transaction_type,
+           t.transaction_category, c.category as category_name,
+           t.transaction_sub_category, sc.sub_category as subcategory_name,
+           t.transaction_description, t.transaction_date,
+           cur.currency, cur.currency_code, cur.currency_symbol
+    FROM transactions t
+    LEFT JOIN bank_accounts a ON t.account_id = a.id
+    LEFT JOIN currencies cur ON a.currency_id = cur.id
+    LEFT JOIN categories c ON t.transaction_category = c.id
+    LEFT JOIN sub_categories sc ON t.transaction_sub_category = sc.id
+'''
+
+def _transaction_from_row(row):
+    """Build a Transaction from a row returned by _SELECT_TRANSACTIONS."""
+    data = {
+        'rowid': row[0],
+        'transaction_name': row[1],
+        'transaction_value': row[2],
+        'account_id': row[3],
+        'account': row[4],
+        'transaction_type': row[5],
+        'transaction_category': row[6],
+        'category': row[7],
+        'transaction_sub_category': row[8],
+        'sub_category': row[9],
+        'transaction_description': row[10],
+        'transaction_date': row[11]
+    }
+
+    # Create a Transaction object
+    transaction = Transaction.from_dict(data)
+    transaction.account_name = data['account']
+    transaction.category_name = data['category']
+    transaction.subcategory_name = data['sub_category']
+
+    # Same shape as Database.get_account_currency(), without the extra query per account
+    if row[13] is not None:
+        transaction.currency_info = {
+            'currency': row[12],
+            'currency_code': row[13],
+            'currency_symbol': row[14] or '$'
+        }
+    return transaction
+
 class TransactionRepository:
     """
     A repository class for transaction data.
@@ -18,14 +69,18 @@ class TransactionRepository:
     including fetching, saving, updating, and deleting transactions.
     """
 
-    def __init__(self, db_connection):
+    def __init__(self, db_connection, read_conn=None):
         """
         Initialize the repository with a database connection.
 
         Args:
-            db_connection: A SQLite database connection.
+            db_connection: A SQLite database connection, used for writes.
+            read_conn (callable, optional): Context manager factory that lends a
+                read-only connection, e.g. Database.read_conn. Reads use
+                db_connection when omitted.
         """
         self.conn = db_connection
+        self._read_conn = read_conn or (lambda: nullcontext(self.conn))
 
     def get_all(self):
         """
@@ -34,51 +89,73 @@ class TransactionRepository:
         Returns:
             list: A list of Transaction objects.
         """
+        # closing() returns the pooled read connection even if building the list fails
+        with closing(self.iter_all()) as transactions:
+            return list(transactions)
+
+    def iter_all(self):
+        """
+        Iterate over all transactions without materializing the full result.
+
+        Rows are converted to Transaction objects one at a time as the cursor
+        is consumed, so memory use stays constant regardless of table size.
+
+        The generator holds a pooled read connection until it is exhausted or
+        closed. Callers that may stop early must close it, e.g.
+        ``with contextlib.closing(repo.iter_all()) as rows:``.
+
+        Yields:
+            Transaction: Transactions ordered by date, newest first.
+        """
         try:
-            cursor = self.conn.execute('''
-                SELECT t.rowid, t.transaction_name, t.transaction_value,
-                       t.account_id, a.name as account_name,
-                       t.transaction_type,
-                       t.transaction_category, c.name as category_name,
-                       t.transaction_sub_category, sc.name as subcategory_name,
-                       t.transaction_description, t.transaction_date
-                FROM transactions t
-                LEFT JOIN accounts a ON t.account_id = a.id
-                LEFT JOIN categories c ON t.transaction_category = c.id
-                LEFT JOIN subcategories sc ON t.transaction_sub_category = sc.id
-                ORDER BY t.transaction_date DESC
-            ''')
-
-            transactions = []
-            for row in cursor:
-                # Create a dictionary from the row
-                data = {
-                    'rowid': row[0],
-                    'transaction_name': row[1],
-                    'transaction_value': row[2],
-                    'account_id': row[3],
-                    'account': row[4],
-                    'transaction_type': row[5],
-                    'transaction_category': row[6],
-                    'category': row[7],
-                    'transaction_sub_category': row[8],
-                    'sub_category': row[9],
-                    'transaction_description': row[10],
-                    'transaction_date': row[11]
-                }
-
-                # Create a Transaction object
-                transaction = Transaction.from_dict(data)
-                transaction.account_name = data['account']
-                transaction.category_name = data['category']
-                transaction.subcategory_name = data['sub_category']
-
-                transactions.append(transaction)
-
-            return transactions
+            with self._read_conn() as conn:
+                cursor = conn.execute(
+                    _SELECT_TRANSACTIONS + " ORDER BY t.transaction_date_jd DESC, t.rowid DESC"
+                )
+                for row in cursor:
+                    yield _transaction_from_row(row)
 
         except sqlite3.Error as e:
             debug_print('TRANSACTION_REPO', f"Error fetching transactions: {e}")
+
+    def get_page(self, limit, before_date=None, before_rowid=None):
+        """
+        Get one page of transactions using keyset pagination.
+
+        Pass the date and rowid of the last transaction of the previous page to
+        fetch the next one. Unlike OFFSET, the cost of a page does not grow with
+        how far into the history it is.
+
+        Args:
+            limit (int): Maximum number of transactions to return.
+            before_date (str, optional): Only return transactions older than this
+                YYYY-MM-DD date (or on this date with a smaller rowid).
+            before_rowid (int, optional): Tie-breaker for transactions sharing
+                before_date.
+
+        Returns:
+            list: A list of at most `limit` Transaction objects, newest first.
+        """
+        query = _SELECT_TRANSACTIONS
+        params = []
+        if before_date is not None:
+            before_jd = to_julian_day(before_date)
+            if before_rowid is not None:
+                query += " WHERE (t.transaction_date_jd < ? OR (t.transaction_date_jd = ? AND t.rowid < ?))"
+                params.extend([before_jd, before_jd, before_rowid])
+            else:
+                query += " WHERE t.transaction_date_jd < ?"
+                params.append(before_jd)
+        query += " ORDER BY t.transaction_date_jd DESC, t.rowid DESC LIMIT ?"
+        params.append(limit)
+
+        try:
+            with self._read_conn() as conn:
+                cursor = conn.execute(query, params)
+                return [_transaction_from_row(row) for row in cursor]
+
+        except sqlite3.Error as e:
+            debug_print('TRANSACTION_REPO', f"Error fetching transaction page: {e}")
             return []
 
     def get_by_id(self, rowid):
@@ -92,45 +169,11 @@ class TransactionRepository:
             Transaction: A Transaction object, or None if not found.
         """
         try:
-            cursor = self.conn.execute('''
-                SELECT t.rowid, t.transaction_name, t.transaction_value,
-                       t.account_id, a.name as account_name,
-                       t.transaction_type,
-                       t.transaction_category, c.name as category_name,
-                       t.transaction_sub_category, sc.name as subcategory_name,
-                       t.transaction_description, t.transaction_date
-                FROM transactions t
-                LEFT JOIN accounts a ON t.account_id = a.id
-                LEFT JOIN categories c ON t.transaction_category = c.id
-                LEFT JOIN subcategories sc ON t.transaction_sub_category = sc.id
-                WHERE t.rowid = ?
-            ''', (rowid,))
-
-            row = cursor.fetchone()
+            with self._read_conn() as conn:
+                row = conn.execute(_SELECT_TRANSACTIONS + " WHERE t.rowid = ?", (rowid,)).fetchone()
+
             if row:
-                # Create a dictionary from the row
-                data = {
-                    'rowid': row[0],
-                    'transaction_name': row[1],
-                    'transaction_value': row[2],
-                    'account_id': row[3],
-                    'account': row[4],
-                    'transaction_type': row[5],
-                    'transaction_category': row[6],
-                    'category': row[7],
-                    'transaction_sub_category': row[8],
-                    'sub_category': row[9],
-                    'transaction_description': row[10],
-                    'transaction_date': row[11]
-                }
-
-                # Create a Transaction object
-                transaction = Transaction.from_dict(data)
-                transaction.account_name = data['account']
-                transaction.category_name = data['category']
-                transaction.subcategory_name = data['sub_category']
-
-                return transaction
+                return _transaction_from_row(row)
 
             return None
 
@@ -159,31 +202,31 @@ class TransactionRepository:
             data = transaction.to_dict()
 
             # Insert the transaction
-            cursor = self.conn.execute('''
-                INSERT INTO transactions(
-                    transaction_name, transaction_value, account_id,
-                    transaction_type, transaction_category,
-                    transaction_sub_category, transaction_description, transaction_date
-                )
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-            ''', (
-                data['transaction_name'],
-                data['transaction_value'],
-                data['account_id'],
-                data['transaction_type'],
-                data['transaction_category'],
-                data['transaction_sub_category'],
-                data['transaction_description'],
-                data['transaction_date']
-            ))
-
-            self.conn.commit()
+            with self.conn:
+                cursor = self.conn.execute('''
+                    INSERT INTO transactions(
+                        transaction_name, transaction_value, account_id,
+                        transaction_type, transaction_category,
+                        transaction_sub_category, transaction_description, transaction_date,
+                        transaction_date_jd
+                    )
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ''', (
+                    data['transaction_name'],
+                    data['transaction_value'],
+                    data['account_id'],
+                    data['transaction_type'],
+                    data['transaction_category'],
+                    data['transaction_sub_category'],
+                    data['transaction_description'],
+                    data['transaction_date'],
+                    to_julian_day(data['transaction_date'])
+                ))
+
             return cursor.lastrowid, {}
 
         except sqlite3.Error as e:
             debug_print('TRANSACTION_REPO', f"Error saving transaction: {e}")
-            if self.conn.in_transaction:
-                self.conn.rollback()
             return None, {'database': str(e)}
 
     def update(self, transaction):
@@ -207,36 +250,36 @@ class TransactionRepository:
             data = transaction.to_dict()
 
             # Update the transaction
-            self.conn.execute('''
-                UPDATE transactions
-                SET transaction_name = ?,
-                    transaction_value = ?,
-                    account_id = ?,
-                    transaction_type = ?,
-                    transaction_category = ?,
-                    transaction_sub_category = ?,
-                    transaction_description = ?,
-                    transaction_date = ?
-                WHERE rowid = ?
-            ''', (
-                data['transaction_name'],
-                data['transaction_value'],
-                data['account_id'],
-                data['transaction_type'],
-                data['transaction_category'],
-                data['transaction_sub_category'],
-                data['transaction_description'],
-                data['transaction_date'],
-                data['rowid']
-            ))
-
-            self.conn.commit()
+            with self.conn:
+                self.conn.execute('''
+                    UPDATE transactions
+                    SET transaction_name = ?,
+                        transaction_value = ?,
+                        account_id = ?,
+                        transaction_type = ?,
+                        transaction_category = ?,
+                        transaction_sub_category = ?,
+                        transaction_description = ?,
+                        transaction_date = ?,
+                        transaction_date_jd = ?
+                    WHERE rowid = ?
+                ''', (
+                    data['transaction_name'],
+                    data['transaction_value'],
+                    data['account_id'],
+                    data['transaction_type'],
+                    data['transaction_category'],
+                    data['transaction_sub_category'],
+                    data['transaction_description'],
+                    data['transaction_date'],
+                    to_julian_day(data['transaction_date']),
+                    data['rowid']
+                ))
+
             return True, {}
 
         except sqlite3.Error as e:
             debug_print('TRANSACTION_REPO', f"Error updating transaction: {e}")
-            if self.conn.in_transaction:
-                self.conn.rollback()
             return False, {'database': str(e)}
 
     def delete(self, rowid):
@@ -250,12 +293,10 @@ class TransactionRepository:
             bool: True if the deletion was successful, False otherwise.
         """
         try:
-            self.conn.execute('DELETE FROM transactions WHERE rowid = ?', (rowid,))
-            self.conn.commit()
+            with self.conn:
+                self.conn.execute('DELETE FROM transactions WHERE rowid = ?', (rowid,))
             return True
 
         except sqlite3.Error as e:
             debug_print('TRANSACTION_REPO', f"Error deleting transaction {rowid}: {e}")
-            if self.conn.in_transaction:
-                self.conn.rollback()
             return False
\ No newline at end of file
@@ -1,7 +1,94 @@
 # --- START OF FILE custom_widgets.py ---
 
 from PyQt6.QtWidgets import QComboBox, QDateEdit, QCalendarWidget
-from PyQt6.QtCore import QDate, Qt, pyqtSignal
+from PyQt6.QtCore import QDate, QPoint, Qt, QTimer, pyqtSignal
+from PyQt6.QtGui import QBrush, QColor, QPainter, QPen, QPixmap, QPolygon
+
+# Arrow colours shared by both paintEvents
+_ARROW_COLOR = QColor(150, 150, 150)  # Even lighter gray
+_ARROW_PEN = QPen(_ARROW_COLOR)
+
+# The down arrow is rendered once on first paint (a QPixmap needs the QApplication)
+# and blitted afterwards, instead of setting up pen, brush and polygon every repaint
+_ARROW_PIXMAP = None
+
+def _arrow_pixmap():
+    """Return the pre-rendered down-arrow triangle, rendering it on first use."""
+    global _ARROW_PIXMAP
+    if _ARROW_PIXMAP is None:
+        pixmap = QPixmap(8, 7)
+        pixmap.fill(Qt.GlobalColor.transparent)
+        painter = QPainter(pixmap)
+        painter.setPen(_ARROW_PEN)
+        painter.setBrush(QBrush(_ARROW_COLOR))
+        # A tiny triangle, 6px wide and 5px tall
+        painter.drawPolygon(QPolygon([QPoint(0, 0), QPoint(6, 0), QPoint(3, 5)]))
+        painter.end()
+        _ARROW_PIXMAP = pixmap
+    return _ARROW_PIXMAP
+
+def _draw_arrow(widget):
+    """Draw the subtle down arrow over a widget's drop-down area."""
+    # Arrow centred in the 20px clickable area at the right edge (matches SpreadsheetDelegate)
+    arrow_x = widget.width() - 1 - 10
+    arrow_y = (widget.height() - 1) // 2
+    painter = QPainter(widget)
+    painter.drawPixmap(arrow_x - 3, arrow_y - 2, _arrow_pixmap())
+    painter.end()
+
+# Stylesheets are shared module constants so every instance hands Qt the same string
+# instead of building a fresh literal per widget (the delegate creates many of these).
+_ARROW_DATE_STYLE = """
+ArrowDateEdit {
+    background-color: #2d323b;
+    color: #f3f3f3;
+    border: 1px solid #444;
+    border-radius: 4px;
+    padding: 6px;
+    padding-right: 15px;
+    min-height: 20px;
+}
+
+ArrowDateEdit::drop-down {
+    subcontrol-origin: padding;
+    subcontrol-position: top right;
+    width: 12px;
+    background: transparent;
+    border: none;
+}
+
+ArrowDateEdit::down-arrow {
+    image: none;
+    width: 0px;
+    height: 0px;
+}
+"""
+
+_ARROW_COMBO_STYLE = """
+ArrowComboBox {
+    background-color: #2d323b;
+    color: #f3f3f3;
+    border: 1px solid #444;
+    border-radius: 4px;
+    padding: 6px;
+    padding-right: 15px;
+    min-height: 20px;
+}
+
+ArrowComboBox::drop-down {
+    subcontrol-origin: padding;
+    subcontrol-position: top right;
+    width: 12px;
+    background: transparent;
+    border: none;
+}
+
+ArrowComboBox::down-arrow {
+    image: none;
+    width: 0px;
+    height: 0px;
+}
+"""
 
 class ArrowDateEdit(QDateEdit):
     """Custom QDateEdit with consistent styling that always shows a down arrow
@@ -13,6 +100,15 @@ class ArrowDateEdit(QDateEdit):
     def __init__(self, parent=None):
         super().__init__(parent)
 
+        # Calendar selections are coalesced: only the last date picked before control
+        # returns to the event loop is applied, so a burst of clicks costs one update.
+        # setDate() itself stays synchronous.
+        self._pending_date = None
+        self._date_timer = QTimer(self)
+        self._date_timer.setSingleShot(True)
+        self._date_timer.setInterval(0)
+        self._date_timer.timeout.connect(self._apply_pending_date)
+
         # Set calendar popup
         self.setCalendarPopup(True)
 
@@ -26,50 +122,51 @@ class ArrowDateEdit(QDateEdit):
         self.setProperty("hasCustomArrow", True)
 
         # Basic styling - no border for dropdown button
-        self.setStyleSheet("""
-            ArrowDateEdit {
-                background-color: #2d323b;
-                color: #f3f3f3;
-                border: 1px solid #444;
-                border-radius: 4px;
-                padding: 6px;
-                padding-right: 15px;
-                min-height: 20px;
-            }
-
-            ArrowDateEdit::drop-down {
-                subcontrol-origin: padding;
-                subcontrol-position: top right;
-                width: 12px;
-                background: transparent;
-                border: none;
-            }
-
-            ArrowDateEdit::down-arrow {
-                image: none;
-                width: 0px;
-                height: 0px;
-            }
-        """)
-
-        # Configure the calendar widget
-        self._setup_calendar()
-
-    def _setup_calendar(self):
-        """Configure the calendar widget to prevent auto-selection"""
-        calendar = self.calendarWidget()
-        if calendar:
-            # Make sure the calendar shows the original date
-            calendar.setSelectedDate(self.date())
+        self.setStyleSheet(_ARROW_DATE_STYLE)
 
-            # Connect to the calendar's clicked signal
-            calendar.clicked.connect(self._on_date_selected)
+        # The calendar widget is built on first use (see calendarWidget), since
+        # calling QDateEdit.calendarWidget() allocates the whole popup
+        self._calendar_ready = False
+
+    def _setup_calendar(self, calendar):
+        """Configure the calendar widget to prevent auto-selection"""
+        # Make sure the calendar shows the original date
+        calendar.setSelectedDate(self.date())
+
+        # Connect to the calendar's clicked signal
+        calendar.clicked.connect(self._on_date_selected)
+        self._calendar_ready = True
+
+    def calendarWidget(self):
+        """Return the popup calendar, configuring it the first time it is requested"""
+        calendar = super().calendarWidget()
+        if calendar and not self._calendar_ready:
+            self._setup_calendar(calendar)
+        return calendar
+
+    def mousePressEvent(self, event):
+        """Set up the calendar before Qt opens the popup on the first click"""
+        if not self._calendar_ready:
+            self.calendarWidget()
+        super().mousePressEvent(event)
+
+    def keyPressEvent(self, event):
+        """Set up the calendar before Qt can open the popup from the keyboard (F4, Alt+Down)"""
+        if not self._calendar_ready:
+            self.calendarWidget()
+        super().keyPressEvent(event)
 
     def _on_date_selected(self, date):
-        """Handle date selection in the calendar"""
-        # Update the date and emit our custom signal
-        self.setDate(date)
-        self.dateSelected.emit(date)
+        """Handle date selection in the calendar, deferring it to the next event-loop turn"""
+        self._pending_date = date
+        self._date_timer.start()
+
+    def _apply_pending_date(self):
+        """Apply the last date selected in the calendar and emit our custom signal"""
+        if self._pending_date is not None:
+            date, self._pending_date = self._pending_date, None
+            self.setDate(date)
+            self.dateSelected.emit(date)
 
     def setDate(self, date):
         """Override setDate to store the original date"""
@@ -82,31 +179,7 @@ class ArrowDateEdit(QDateEdit):
         super().paintEvent(event)
 
         # Then draw our custom arrow
-        from PyQt6.QtGui import QPainter, QColor, QPen, QPolygon
-        from PyQt6.QtCore import QPoint
-
-        painter = QPainter(self)
-
-        # Calculate arrow position - centered in clickable area
-        rect = self.rect()
-        arrow_width = 20  # Match the width in SpreadsheetDelegate
-        arrow_x = int(rect.right() - (arrow_width / 2))  # Center in the clickable area
-        arrow_y = rect.center().y()
-
-        # Draw a simple down arrow (triangle) with a very minimal style
-        arrow_size = 3  # Tiny arrow
-
-        # Create a polygon for the arrow
-        arrow = QPolygon([
-            QPoint(arrow_x - arrow_size, int(arrow_y - arrow_size/2)),
-            QPoint(arrow_x + arrow_size, int(arrow_y - arrow_size/2)),
-            QPoint(arrow_x, arrow_y + arrow_size)
-        ])
-
-        # Fill the arrow with a more subtle color
-        painter.setPen(QPen(QColor(150, 150, 150)))  # Even lighter gray
-        painter.setBrush(QColor(150, 150, 150))  # Even lighter gray fill
-        painter.drawPolygon(arrow)
+        _draw_arrow(self)
 
 class ArrowComboBox(QComboBox):
     """Custom QComboBox with consistent styling that always shows a down arrow"""
@@ -117,59 +190,11 @@ class ArrowComboBox(QComboBox):
         self.setProperty("hasCustomArrow", True)
 
         # Basic styling - no border for dropdown button
-        self.setStyleSheet("""
-            ArrowComboBox {
-                background-color: #2d323b;
-                color: #f3f3f3;
-                border: 1px solid #444;
-                border-radius: 4px;
-                padding: 6px;
-                padding-right: 15px;
-                min-height: 20px;
-            }
-
-            ArrowComboBox::drop-down {
-                subcontrol-origin: padding;
-                subcontrol-position: top right;
-                width: 12px;
-                background: transparent;
-                border: none;
-            }
-
-            ArrowComboBox::down-arrow {
-                image: none;
-                width: 0px;
-                height: 0px;
-            }
-        """)
+        self.setStyleSheet(_ARROW_COMBO_STYLE)
 
     def paintEvent(self, event):
         # First draw the basic combobox
         super().paintEvent(event)
 
         # Then draw our custom arrow
-        from PyQt6.QtGui import QPainter, QColor, QPen, QPolygon
-        from PyQt6.QtCore import QPoint
-
-        painter = QPainter(self)
-
-        # Calculate arrow position - centered in clickable area
-        rect = self.rect()
-        arrow_width = 20  # Match the width in SpreadsheetDelegate
-        arrow_x = int(rect.right() - (arrow_width / 2))  # Center in the clickable area, convert to int
-        arrow_y = rect.center().y()
-
-        # Draw a simple down arrow (triangle) with a very minimal style
-        arrow_size = 3  # Tiny arrow
-
-        # Create a polygon for the arrow
-        arrow = QPolygon([
-            QPoint(arrow_x - arrow_size, int(arrow_y - arrow_size/2)),
-            QPoint(arrow_x + arrow_size, int(arrow_y - arrow_size/2)),
-            QPoint(arrow_x, arrow_y + arrow_size)
-        ])
-
-        # Fill the arrow with a more subtle color
-        painter.setPen(QPen(QColor(150, 150, 150)))  # Even lighter gray
-        painter.setBrush(QColor(150, 150, 150))  # Even lighter gray fill
-        painter.drawPolygon(arrow)
+        _draw_arrow(self)
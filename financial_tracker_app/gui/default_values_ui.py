@@ -2,89 +2,219 @@
 UI Module for Setting Default Transaction Values
 """
 from PyQt6.QtWidgets import (QDialog, QVBoxLayout, QFormLayout, QLineEdit,
-                             QComboBox, QDateEdit, QPushButton, QDialogButtonBox,
-                             QLabel, QWidget)
-from PyQt6.QtCore import QDate, Qt
-from PyQt6.QtGui import QIcon
+                             QPushButton, QDialogButtonBox, QLabel, QWidget)
+from PyQt6.QtCore import QDate, Qt, QConcatenateTablesProxyModel
+from PyQt6.QtGui import QIcon, QStandardItem, QStandardItemModel
 
 from financial_tracker_app.logic.default_values import default_values
 from financial_tracker_app.gui.custom_widgets import ArrowComboBox, ArrowDateEdit # Use custom widgets
 from financial_tracker_app.utils.debug_config import debug_config, debug_print
 from decimal import Decimal, InvalidOperation
 
+# Two-decimal quantizer for the value_in default, shared instead of rebuilt per call
+_Q2 = Decimal("0.00")
+
+# Window icon, looked up once (QIcon.fromTheme scans the icon theme paths)
+_SETTINGS_ICON = None
+
+def _settings_icon():
+    """Return the dialog's window icon, resolving the theme icon on first use."""
+    global _SETTINGS_ICON
+    if _SETTINGS_ICON is None:
+        _SETTINGS_ICON = QIcon.fromTheme("preferences-system", QIcon(":/icons/settings.png")) # Example icon
+    return _SETTINGS_ICON
+
+# Form labels derived from field keys ('cat_in' -> 'Cat:'), built once per key
+_LABEL_CACHE = {}
+
+def _label_for(field_key):
+    """Return the dialog label for a form field key."""
+    label_text = _LABEL_CACHE.get(field_key)
+    if label_text is None:
+        label_text = field_key.replace('_in', '').replace('_', ' ').capitalize() + ":"
+        _LABEL_CACHE[field_key] = label_text
+    return label_text
+
+# --- Per-widget-type handlers ---
+# Each field is handled by looking up type(widget) in the dicts below instead of
+# walking an isinstance chain (see _handler_for for subclasses). Builders create the
+# dialog's input widget from the main form's widget, loaders show a stored default,
+# savers read the value back.
+
+def _build_line(ref_widget, label_text):
+    widget = QLineEdit()
+    widget.setPlaceholderText(f"Default {label_text.replace(':', '')} (optional)")
+    return widget
+
+def _build_combo(ref_widget, label_text):
+    widget = ArrowComboBox() # Create a new instance for the dialog
+    _share_combo_items(ref_widget, widget)
+    widget._ref_widget = ref_widget # _load_combo looks defaults up in the reference's index
+    return widget
+
+def _build_date(ref_widget, label_text):
+    widget = ArrowDateEdit() # Create a new instance
+    widget.setDisplayFormat("dd MMM yyyy") # ArrowDateEdit already enables the calendar popup
+    # Add a way to clear the date default? Maybe a checkbox?
+    # For simplicity, let's assume setting a date is always desired if the dialog is used.
+    # We can add a "Clear Date Default" button later if needed.
+    return widget
+
+def _share_combo_items(ref_widget, widget):
+    """
+    Show the reference combo's items behind a "(No Default)" entry.
+
+    The reference model is shared through a proxy rather than copied row by
+    row, so the dialog always reflects the main form's current list.
+    """
+    # Add a "None" option at the beginning to allow clearing the default
+    no_default_model = QStandardItemModel(widget)
+    no_default_model.appendRow(QStandardItem("(No Default)"))
+
+    proxy = QConcatenateTablesProxyModel(widget)
+    proxy.addSourceModel(no_default_model)
+    proxy.addSourceModel(ref_widget.model())
+    widget.setModel(proxy)
+    widget.setModelColumn(0)
+
+    # Drop the reference combo's lookup index whenever it is repopulated
+    if not getattr(ref_widget, '_index_invalidation_connected', False):
+        ref_model = ref_widget.model()
+        for signal in (ref_model.modelReset, ref_model.rowsInserted,
+                       ref_model.rowsRemoved, ref_model.dataChanged):
+            signal.connect(lambda *args, w=ref_widget: _invalidate_combo_index(w))
+        ref_widget._index_invalidation_connected = True
+
+def _invalidate_combo_index(ref_widget):
+    ref_widget._id_index = None
+    ref_widget._text_index = None
+
+def _combo_index(ref_widget):
+    """
+    Return (id -> row, text -> row) maps for a reference combo, built on first use.
+
+    Rows are those of the reference combo itself; the first occurrence wins, as
+    with findData/findText.
+    """
+    id_index = getattr(ref_widget, '_id_index', None)
+    text_index = getattr(ref_widget, '_text_index', None)
+    if id_index is None or text_index is None:
+        id_index, text_index = {}, {}
+        for i in range(ref_widget.count()):
+            id_index.setdefault(ref_widget.itemData(i), i)
+            text_index.setdefault(ref_widget.itemText(i), i)
+        ref_widget._id_index = id_index
+        ref_widget._text_index = text_index
+    return id_index, text_index
+
+def _load_line(widget, field_key, current_default, today):
+    widget.clear()
+    if current_default is not None:
+        # Handle Decimal display
+        if field_key == 'value_in':
+             try: widget.setText(str(Decimal(current_default if isinstance(current_default, str) else str(current_default)).quantize(_Q2)))
+             except (InvalidOperation, TypeError, ValueError): pass # Leave blank on error
+        else: widget.setText(str(current_default))
+
+def _load_combo(widget, field_key, current_default, today):
+    # Set current selection based on stored default. Rows are looked up in the
+    # reference combo's index; +1 skips the "(No Default)" row (a miss gives -1 + 1 = 0)
+    selected_index = 0 # Default to "(No Default)"
+    if current_default is not None:
+        id_index, text_index = _combo_index(widget._ref_widget)
+        if field_key == 'type_in': # Type stored as text
+            selected_index = text_index.get(str(current_default), -1) + 1
+        else: # Account/Cat/Subcat stored as ID
+            try:
+                selected_index = id_index.get(int(current_default), -1) + 1
+            except (ValueError, TypeError): pass # Ignore invalid stored ID format
+    widget.setCurrentIndex(selected_index)
+
+def _load_date(widget, field_key, current_default, today):
+    # Only non-empty strings can hold a stored ISO date; skip the parse otherwise
+    if isinstance(current_default, str) and current_default:
+        date = QDate.fromString(current_default, "yyyy-MM-dd")
+        if date.isValid():
+            widget.setDate(date)
+        else:
+            widget.setDate(today) # Fallback
+    else:
+        widget.setDate(today) # Default to today if no default set
+
+def _save_line(widget, field_key, old_value):
+    value = widget.text().strip()
+    if not value: # Treat empty string as clearing the default
+        return None
+    # Ensure value is stored correctly (string for Decimal)
+    if field_key == 'value_in':
+         try:
+             # Validate and format in one pass; store the quantized string so the
+             # next open displays it as-is
+             value = str(Decimal(value).quantize(_Q2))
+         except InvalidOperation:
+             if debug_config.is_enabled('DEFAULTS'):
+                 debug_print('DEFAULTS', f"Invalid decimal format '{value}' for '{field_key}', not saving default.")
+             value = old_value # Keep old value on error
+    return value
+
+def _save_combo(widget, field_key, old_value):
+    if widget.currentIndex() > 0: # Index 0 is "(No Default)"
+        if field_key == 'type_in':
+            return widget.currentText() # Store text
+        return widget.currentData() # Store ID (already int or None)
+    return None # Clear default
+
+def _save_date(widget, field_key, old_value):
+    return widget.date().toString("yyyy-MM-dd") # Store ISO string
+
+_BUILDERS = {QLineEdit: _build_line, ArrowComboBox: _build_combo, ArrowDateEdit: _build_date}
+_LOADERS = {QLineEdit: _load_line, ArrowComboBox: _load_combo, ArrowDateEdit: _load_date}
+_SAVERS = {QLineEdit: _save_line, ArrowComboBox: _save_combo, ArrowDateEdit: _save_date}
+
+def _handler_for(handlers, widget):
+    """
+    Return the handler registered for a widget's type, or None.
+
+    The exact type is a single dict probe; subclasses of a registered type fall back
+    to the nearest registered base class, matching the old isinstance checks.
+    """
+    handler = handlers.get(type(widget))
+    if handler is None:
+        for cls in type(widget).__mro__[1:]:
+            handler = handlers.get(cls)
+            if handler is not None:
+                break
+    return handler
+
 class DefaultValuesDialog(QDialog):
     """Dialog for setting default transaction values."""
 
     def __init__(self, parent, form_widgets_ref):
         super().__init__(parent)
         self.setWindowTitle("Set Default Transaction Values")
-        self.setWindowIcon(QIcon.fromTheme("preferences-system", QIcon(":/icons/settings.png"))) # Example icon
+        self.setWindowIcon(_settings_icon())
         self.setMinimumWidth(400)
 
         self.form_widgets_ref = form_widgets_ref # Reference to main GUI's form widgets
         self.input_widgets = {} # To store widgets created in this dialog
 
         layout = QVBoxLayout(self)
+        # Rows go into a detached layout that is attached to the dialog in one shot
+        # after the loop, so adding N rows doesn't invalidate the dialog layout N times
         form_layout = QFormLayout()
 
         # Dynamically create input fields based on the main form's widgets
         for field_key, ref_widget in self.form_widgets_ref.items():
-            label_text = field_key.replace('_in', '').replace('_', ' ').capitalize() + ":"
-            current_default = default_values.get_value(field_key)
-            widget = None
-
-            if isinstance(ref_widget, QLineEdit):
-                widget = QLineEdit()
-                if current_default is not None:
-                    # Handle Decimal display
-                    if field_key == 'value_in':
-                         try: widget.setText(str(Decimal(str(current_default)).quantize(Decimal("0.00"))))
-                         except (InvalidOperation, TypeError, ValueError): pass # Leave blank on error
-                    else: widget.setText(str(current_default))
-                widget.setPlaceholderText(f"Default {label_text.replace(':', '')} (optional)")
-
-            elif isinstance(ref_widget, ArrowComboBox): # Use ArrowComboBox
-                widget = ArrowComboBox() # Create a new instance for the dialog
-                # Copy items and data from the reference widget
-                for i in range(ref_widget.count()):
-                    widget.addItem(ref_widget.itemText(i), ref_widget.itemData(i))
-
-                # Add a "None" option at the beginning to allow clearing the default
-                widget.insertItem(0, "(No Default)", userData=None)
-
-                # Set current selection based on stored default
-                selected_index = 0 # Default to "(No Default)"
-                if current_default is not None:
-                    if field_key == 'type_in': # Type stored as text
-                        found_idx = widget.findText(str(current_default))
-                        if found_idx != -1: selected_index = found_idx
-                    else: # Account/Cat/Subcat stored as ID
-                        try:
-                            value_id = int(current_default)
-                            found_idx = widget.findData(value_id)
-                            if found_idx != -1: selected_index = found_idx
-                        except (ValueError, TypeError): pass # Ignore invalid stored ID format
-                widget.setCurrentIndex(selected_index)
-
-            elif isinstance(ref_widget, ArrowDateEdit): # Use ArrowDateEdit
-                widget = ArrowDateEdit() # Create a new instance
-                widget.setDisplayFormat("dd MMM yyyy")
-                widget.setCalendarPopup(True)
-                # Add a way to clear the date default? Maybe a checkbox?
-                # For simplicity, let's assume setting a date is always desired if the dialog is used.
-                # We can add a "Clear Date Default" button later if needed.
-                if current_default is not None:
-                    date = QDate.fromString(str(current_default), "yyyy-MM-dd")
-                    if date.isValid():
-                        widget.setDate(date)
-                    else:
-                        widget.setDate(QDate.currentDate()) # Fallback
-                else:
-                    widget.setDate(QDate.currentDate()) # Default to today if no default set
-
-            if widget:
-                self.input_widgets[field_key] = widget
-                form_layout.addRow(QLabel(label_text), widget)
+            builder = _handler_for(_BUILDERS, ref_widget)
+            if builder is None:
+                continue
+            label_text = _label_for(field_key)
+            widget = builder(ref_widget, label_text)
+            self.input_widgets[field_key] = widget
+            form_layout.addRow(QLabel(label_text), widget)
+
+        # Fill the widgets with the stored defaults
+        self.refresh_from_defaults()
 
         layout.addLayout(form_layout)
 
@@ -94,44 +224,45 @@ class DefaultValuesDialog(QDialog):
         button_box.rejected.connect(self.reject)
         layout.addWidget(button_box)
 
+    def refresh_from_defaults(self):
+        """
+        Update the existing input widgets from the stored defaults.
+
+        Used on construction and when the cached dialog is shown again, so repeat
+        opens only reset each widget's state instead of rebuilding the form.
+        """
+        defaults_snapshot = default_values.get_all()
+        # Kept so accept() only writes the fields the user actually changed
+        self._initial = defaults_snapshot
+        today = QDate.currentDate() # Read the clock once per refresh, not per date field
+        for field_key, widget in self.input_widgets.items():
+            # Nothing listens to these widgets while they are filled; skip the signal fan-out
+            was_blocked = widget.blockSignals(True)
+            _handler_for(_LOADERS, widget)(widget, field_key, defaults_snapshot.get(field_key), today)
+            widget.blockSignals(was_blocked)
+
     def accept(self):
         """Save the defaults when OK is clicked."""
         debug_print('DEFAULTS', "Saving defaults from dialog...")
+        changes = {}
         for field_key, widget in self.input_widgets.items():
-            value = None
-            if isinstance(widget, QLineEdit):
-                value = widget.text().strip()
-                if not value: # Treat empty string as clearing the default
-                    value = None
-                # Ensure value is stored correctly (string for Decimal)
-                elif field_key == 'value_in':
-                     try:
-                         # Validate it's a number, but store as string
-                         Decimal(value)
-                     except InvalidOperation:
-                         debug_print('DEFAULTS', f"Invalid decimal format '{value}' for '{field_key}', not saving default.")
-                         value = default_values.get_value(field_key) # Keep old value on error
-
-            elif isinstance(widget, QComboBox):
-                index = widget.currentIndex()
-                if index > 0: # Index 0 is "(No Default)"
-                    if field_key == 'type_in':
-                        value = widget.currentText() # Store text
-                    else:
-                        value = widget.currentData() # Store ID (already int or None)
-                else:
-                    value = None # Clear default
-
-            elif isinstance(widget, QDateEdit):
-                value = widget.date().toString("yyyy-MM-dd") # Store ISO string
-
-            # Only set if the value is determined (could be None to clear)
-            if value is not None or isinstance(widget, QLineEdit) or isinstance(widget, QComboBox):
-                 default_values.set_value(field_key, value)
+            # A None value clears the default
+            old_value = self._initial.get(field_key)
+            value = _handler_for(_SAVERS, widget)(widget, field_key, old_value)
+            if value != old_value:
+                changes[field_key] = value
+
+        if changes:
+            default_values.set_many(changes)
 
         super().accept() # Close the dialog
 
 def show_default_values_dialog(parent, form_widgets_ref):
-    """Create and show the Default Values dialog."""
-    dialog = DefaultValuesDialog(parent, form_widgets_ref)
+    """Show the Default Values dialog, building it only on first use."""
+    dialog = getattr(parent, '_default_values_dialog', None)
+    if dialog is None or dialog.form_widgets_ref is not form_widgets_ref:
+        dialog = DefaultValuesDialog(parent, form_widgets_ref)
+        parent._default_values_dialog = dialog
+    else:
+        dialog.refresh_from_defaults()
     return dialog.exec()
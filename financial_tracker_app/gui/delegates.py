@@ -1,27 +1,138 @@
 # --- START OF FILE delegates.py ---
 
+import re
 import sys
+import weakref
+from collections import defaultdict
+from functools import lru_cache
 from PyQt6.QtWidgets import (QStyledItemDelegate, QComboBox, QLineEdit, QDateEdit,
                              QStyleOptionViewItem, QStyle, QWidget, QStyleOptionComboBox,
-                             QStylePainter, QTextEdit)
-from PyQt6.QtCore import Qt, QModelIndex, QTimer, QDate, QLocale, QRect, QPoint
-from PyQt6.QtGui import QColor, QIcon, QPixmap, QPainter
+                             QStylePainter, QTextEdit, QCompleter, QApplication)
+from PyQt6.QtCore import Qt, QModelIndex, QTimer, QDate, QLocale, QRect, QPoint, QPointF, QSize, QStringListModel
+from PyQt6.QtGui import (QColor, QFont, QIcon, QPixmap, QPainter, QPen, QPolygon, QBrush,
+                         QStandardItem, QStandardItemModel, QStaticText, QPalette)
+from datetime import date
 from decimal import Decimal, InvalidOperation, ROUND_HALF_UP
 
 # --- Updated Imports ---
 # Assuming Database might be needed indirectly via parent_window, but not directly imported
 # from financial_tracker_app.data.database import Database
-from financial_tracker_app.logic.commands import CellEditCommand # Keep if used directly, otherwise remove
 from financial_tracker_app.gui.custom_widgets import ArrowComboBox, ArrowDateEdit
-from financial_tracker_app.utils.debug_config import debug_config, debug_print
+from financial_tracker_app.utils.debug_config import debug_print
 from financial_tracker_app.data.column_config import get_column_config, DISPLAY_TITLES, DB_FIELDS # Import DB_FIELDS
 # --- End Updated Imports ---
 
+# Width of the clickable arrow/icon area at the right edge of each dropdown/date cell.
+# Only the width is stored per column; the rect is derived from the cell on demand.
+ARROW_AREA_WIDTHS = {
+    'account': 20,
+    'transaction_type': 20,
+    'category': 20,
+    'sub_category': 20,
+    'transaction_date': 30,
+}
+_ARROW_GLYPH_COLOR = QColor(150, 150, 150)
+
+# Display text for the special UNCATEGORIZED category, shared by every cell showing it
+_UNCATEGORIZED = sys.intern('UNCATEGORIZED')
+
+# Representative text for columns whose content has a predictable width; their
+# size hints are measured from these once instead of from every cell
+_SIZE_HINT_SAMPLES = {
+    'transaction_date': "00 MMM 0000",
+    'transaction_value': "$999,999.99",
+    'transaction_type': "Expense",
+    'category': "UNCATEGORIZED",
+    'sub_category': "UNCATEGORIZED",
+}
+_CELL_PADDING = 6 # Horizontal/vertical padding around measured text, matching the editors
+
+# Upper bound on laid-out cell texts kept by paint(); the oldest entry is dropped when full
+_STATIC_TEXT_CACHE_SIZE = 2048
+
+# Quantizers for 0..9 decimal places (_QUANTIZERS[2] == Decimal('0.01')), built once
+_QUANTIZERS = tuple(Decimal(1).scaleb(-i) for i in range(10))
+
+# displayText runs for every visible cell on every repaint; amount and date text
+# is a pure function of the value, so recent results are memoized
+
+@lru_cache(maxsize=4096)
+def _format_decimal(value, decimals, grouping, group_sep, decimal_point):
+    """Format a Decimal with the given places, then map ',' / '.' to the given separators."""
+    text = format(value.quantize(_QUANTIZERS[decimals], rounding=ROUND_HALF_UP), f"{grouping}.{decimals}f")
+    return text.translate({ord(','): group_sep, ord('.'): decimal_point})
+
+_MONTHS = ('Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec')
+
+@lru_cache(maxsize=4096)
+def _format_iso_date(value):
+    """
+    Return a 'yyyy-MM-dd' string as 'dd MMM yyyy', or None if it isn't a valid date.
+
+    Pure Python (same output as QDate's "dd MMM yyyy"), so no PyQt calls per cell.
+    """
+    y, m, d = value[:4], value[5:7], value[8:10]
+    if not (value[4] == '-' and value[7] == '-' and y.isdigit() and m.isdigit() and d.isdigit()):
+        return None
+    try:
+        date(int(y), int(m), int(d)) # Rejects e.g. 2024-02-30, as QDate.isValid() does
+    except ValueError:
+        return None
+    return f"{d} {_MONTHS[int(m) - 1]} {y}"
+
+_MONTH_NUMBERS = {name: number for number, name in enumerate(_MONTHS, 1)}
+
+def _parse_date_text(value):
+    """
+    Return (year, month, day) for 'yyyy-MM-dd' or 'dd MMM yyyy' text, or None.
+
+    The inverse of _format_iso_date, used by the date editor instead of trying
+    QDate.fromString with one format after another.
+    """
+    if len(value) == 10 and value[4] == '-' and value[7] == '-':
+        y, m, d = value[:4], value[5:7], value[8:10]
+        if not (y.isdigit() and m.isdigit() and d.isdigit()):
+            return None
+        parts = (int(y), int(m), int(d))
+    elif len(value) == 11 and value[2] == ' ' and value[6] == ' ':
+        month = _MONTH_NUMBERS.get(value[3:6])
+        d, y = value[:2], value[7:]
+        if month is None or not (d.isdigit() and y.isdigit()):
+            return None
+        parts = (int(y), month, int(d))
+    else:
+        return None
+    try:
+        date(*parts)
+    except ValueError:
+        return None
+    return parts
+
+# Currency symbols and 3-letter ISO codes stripped from an amount before parsing it
+_CURRENCY_RE = re.compile(r'[$€£¥₹₽₩₴₦₱฿₫₲₪₡₢₣₤₥₧₨₭₮₯₰₳₵₶₷₸₺₻₼₾₿]|\b[A-Z]{3}\b')
+# Trailing ' USD'-style currency code on a typed amount
+_TRAILING_CODE_RE = re.compile(r'\s[A-Z]{3}$')
+
 class SpreadsheetDelegate(QStyledItemDelegate):
+    # Fixed attribute layout: paint() and the editor hooks read several of these per call.
+    # parent_window is a property over _pw_ref and must not be listed.
+    __slots__ = (
+        'locale', 'down_arrow_icon', '_pw_ref',
+        'accounts_list', 'categories_list', 'subcategories_list',
+        '_cols', '_editing_cell', '_tab_navigation', '_dropdown_reload_pending',
+        '_editor_pool', '_use_completer_threshold', '_hint_cache', '_hint_font',
+        '_arrow_pm', '_calendar_pm', '_static_text_cache',
+        '_amount_table', '_amount_symbol', '_amount_grouping', '_amount_separators',
+        '_accounts_by_id', '_categories_by_id', '_subcategories_by_id',
+        '_uncategorized_ids', '_cat_conflict_map', '_id_names_by_col', '_current_col_key',
+        '_cats_by_type', '_name_to_catid', '_catid_by_name', '_subs_by_cat',
+        '_account_model', '_cat_models', '_cat_name_models', '_subcat_models',
+    )
+
     def __init__(self, parent=None):
         super().__init__(parent) # parent is now the main_window instance
-        # Store the reference to the main window passed as parent
-        self.parent_window = parent
+        # Store a weak reference to the main window passed as parent (see parent_window)
+        self._pw_ref = weakref.ref(parent) if parent is not None else None
         if not self.parent_window:
             # This should ideally not happen now
             print("CRITICAL WARNING: SpreadsheetDelegate initialized without a valid parent window!")
@@ -29,35 +140,54 @@ class SpreadsheetDelegate(QStyledItemDelegate):
         else:
              # Use the parent window's locale for consistency
             self.locale = self.parent_window.locale if hasattr(self.parent_window, 'locale') else QLocale()
+        self._build_amount_table()
 
         # Fallback icon - stylesheet should override
         self.down_arrow_icon = QIcon.fromTheme("go-down", QIcon(":/icons/down-arrow.png")) # Keep if you have resources
 
-        # CSS style for dropdowns to ensure arrows are visible
-        self.dropdown_style = """
-            QComboBox, ArrowComboBox, QDateEdit {
-                background-color: #2d323b;
-                color: #f3f3f3;
-                border: 1px solid #444;
-                border-radius: 4px;
-                padding: 6px;
-                padding-right: 15px;
-                min-height: 20px;
-            }
-            QComboBox::drop-down, ArrowComboBox::drop-down, QDateEdit::drop-down {
-                subcontrol-origin: padding;
-                subcontrol-position: top right;
-                width: 12px;
-                background: transparent;
-                border: none;
-            }
-            /* Hide the default down arrow for QDateEdit */
-            QDateEdit::down-arrow {
-                width: 0px;
-                height: 0px;
-                background: transparent;
-            }
-        """
+        # (row, col) of the cell with an open editor, so paint() can skip its glyph
+        # without querying the table for every cell
+        self._editing_cell = None
+        self.closeEditor.connect(self._clear_editing_cell)
+
+        # Set while a dropdown reload is queued, so several auto-created
+        # UNCATEGORIZED entries trigger a single reload
+        self._dropdown_reload_pending = False
+
+        # True while Tab/Backtab moves editing to the next cell; combo editors
+        # opened that way don't show their popup
+        self._tab_navigation = False
+
+        # Category IDs whose display name is forced by the window's ID conflict
+        # mapping (see set_conflict_map)
+        self._cat_conflict_map = {}
+
+        # Column key of the cell displayText is formatting, or None when unknown
+        # (set by initStyleOption and display_text_for)
+        self._current_col_key = None
+
+        # Idle editors by column key, reused instead of rebuilt on every edit
+        self._editor_pool = {}
+
+        # Size hints by column, valid for the font they were measured with
+        self._hint_cache = {}
+        self._hint_font = None
+
+        # Above this many categories of one type the category editor is a
+        # QLineEdit with a completer, which only renders the matching rows
+        self._use_completer_threshold = 200
+
+        # Cell glyphs are rendered once here; paint() only blits them
+        self._arrow_pm = self._render_arrow_pixmap()
+        self._calendar_pm = self._render_calendar_pixmap()
+
+        # Cell text laid out once per (text, font) and redrawn with drawStaticText,
+        # so repaints don't re-shape the same strings
+        self._static_text_cache = {}
+
+        # Editor styling lives in the main window's stylesheet (see the
+        # #delegate_dropdown / #delegate_description rules there), which Qt parses
+        # once, rather than being set on every editor
 
         # Store references to the main GUI data needed for dropdowns
         # These will be populated by the main GUI after initialization
@@ -65,59 +195,342 @@ class SpreadsheetDelegate(QStyledItemDelegate):
         self.categories_list = [] # List of dicts {id: ..., name: ..., type: ...}
         self.subcategories_list = [] # List of dicts {id: ..., name: ..., category_id: ...}
 
+        # Column keys by visual index, copied from the window once instead of
+        # probed with hasattr/len on every paint and editor call
+        self._refresh_cols()
+        self._build_lookup_indexes()
+
+    def _refresh_cols(self):
+        """Cache the parent window's column keys as a tuple."""
+        self._cols = tuple(getattr(self.parent_window, 'COLS', ()))
+
+    @staticmethod
+    def _render_arrow_pixmap():
+        """Pre-render the small down-arrow triangle drawn in dropdown cells."""
+        pixmap = QPixmap(8, 7)
+        pixmap.fill(Qt.GlobalColor.transparent)
+        p = QPainter(pixmap)
+        p.setPen(QPen(_ARROW_GLYPH_COLOR))
+        p.setBrush(QBrush(_ARROW_GLYPH_COLOR))
+        p.drawPolygon(QPolygon([QPoint(0, 0), QPoint(6, 0), QPoint(3, 5)]))
+        p.end()
+        return pixmap
+
+    @staticmethod
+    def _render_calendar_pixmap():
+        """Pre-render the small calendar icon drawn in date cells."""
+        pixmap = QPixmap(9, 9)
+        pixmap.fill(Qt.GlobalColor.transparent)
+        p = QPainter(pixmap)
+        p.setPen(QPen(_ARROW_GLYPH_COLOR))
+        p.setBrush(Qt.BrushStyle.NoBrush)
+        p.drawRect(QRect(0, 0, 8, 8))
+        p.drawLine(0, 1, 8, 1) # Header line
+        p.end()
+        return pixmap
+
+    @property
+    def parent_window(self):
+        """
+        The main window, or None once it has been garbage collected.
+
+        Held weakly so the delegate doesn't keep the window (and its widgets) alive.
+        """
+        return self._pw_ref() if self._pw_ref is not None else None
+
+    def setLocale(self, locale):
+        """Switch the locale used for amounts and dates, rebuilding the amount table."""
+        self.locale = locale
+        self._build_amount_table()
+        _format_decimal.cache_clear()
+
+    def _build_amount_table(self):
+        """
+        Build the str.translate table that normalises a typed amount for self.locale.
+
+        One translate pass drops group separators and a single-character currency
+        symbol and maps the decimal point to '.', replacing chained str.replace calls.
+        """
+        table = {ord(ch): None for ch in self.locale.groupSeparator()}
+        symbol = self.locale.currencySymbol()
+        if len(symbol) == 1:
+            table[ord(symbol)] = None
+            self._amount_symbol = None
+        else:
+            # Multi-character symbols ('US$', 'CHF') must be removed as a whole
+            self._amount_symbol = symbol or None
+        for ch in self.locale.decimalPoint():
+            table[ord(ch)] = '.'
+        self._amount_table = table
+
+        # Reverse direction for _format_amount: Python's ',' / '.' to the locale's separators
+        if self.locale.numberOptions() & QLocale.NumberOption.OmitGroupSeparator:
+            self._amount_grouping = ''
+        else:
+            self._amount_grouping = ','
+        self._amount_separators = (self.locale.groupSeparator(), self.locale.decimalPoint())
+
+    def _format_amount(self, amount, decimals=2):
+        """Format a Decimal amount in self.locale, without going through float."""
+        try:
+            return _format_decimal(amount, decimals, self._amount_grouping, *self._amount_separators)
+        except (InvalidOperation, TypeError): # NaN/Infinity (signalling NaNs aren't hashable)
+            return str(amount)
+
+    def attach_to_model(self, model):
+        """
+        Invalidate the delegate's row- and column-keyed state when the table model changes.
+
+        _editing_cell is keyed by row and the size hint cache by column; both go
+        stale when rows or columns are inserted, removed or reset.
+        """
+        for signal in (model.rowsInserted, model.rowsRemoved):
+            signal.connect(self._invalidate_row_state)
+        for signal in (model.modelReset, model.layoutChanged,
+                       model.columnsInserted, model.columnsRemoved):
+            signal.connect(self._invalidate_model_state)
+
+    def _invalidate_row_state(self, *args):
+        self._editing_cell = None
+
+    def _invalidate_model_state(self, *args):
+        self._editing_cell = None
+        self._hint_cache.clear()
+
+    def _schedule_popup(self, editor):
+        """Open a new combo editor's list once it is shown, unless reached by tabbing."""
+        if not self._tab_navigation:
+            QTimer.singleShot(0, editor.showPopup)
+
+    def _end_tab_navigation(self):
+        self._tab_navigation = False
+
+    def _clear_editing_cell(self, editor=None, hint=None):
+        self._editing_cell = None
+
+    def _schedule_dropdown_reload(self):
+        """Queue one _load_dropdown_data() call on the event loop."""
+        if not self._dropdown_reload_pending:
+            self._dropdown_reload_pending = True
+            QTimer.singleShot(0, self._do_reload)
+
+    def _do_reload(self):
+        self._dropdown_reload_pending = False
+        if self.parent_window:
+            self.parent_window._load_dropdown_data()
+
+    def _row_data(self, row):
+        """Return the parent window's data dict for a table row, or None."""
+        if self.parent_window is None or not hasattr(self.parent_window, '_row_data'):
+            return None
+        return self.parent_window._row_data(row)
+
+    def _pooled(self, editor, col_key):
+        """Mark a newly built editor as belonging to the pool for col_key."""
+        editor._pool_key = col_key
+        return editor
+
+    def _take_pooled_editor(self, col_key, parent):
+        """Return an idle pooled editor for col_key, reparented to parent, or None."""
+        editor = self._editor_pool.pop(col_key, None)
+        if editor is not None:
+            if editor.parent() is not parent:
+                editor.setParent(parent)
+            editor.setEnabled(True)
+        return editor
+
+    def _take_pooled_combo(self, col_key, parent):
+        """Return a pooled ArrowComboBox for col_key, building one if the pool is empty."""
+        editor = self._take_pooled_editor(col_key, parent)
+        if editor is None:
+            editor = self._pooled(ArrowComboBox(parent), col_key)
+            editor.setObjectName("delegate_dropdown")
+            editor.setEditable(False)
+        return editor
+
+    @staticmethod
+    def _set_placeholder(editor, text):
+        """Show a single disabled entry, on a model of the editor's own so shared models stay untouched."""
+        model = QStandardItemModel(editor)
+        item = QStandardItem(text)
+        item.setEnabled(False)
+        model.appendRow(item)
+        editor.setModel(model)
+
+    def destroyEditor(self, editor, index):
+        """Keep pooled editors for the next edit in the same column instead of deleting them."""
+        # The view releases every editor through here, including ones it closes itself
+        # without closeEditor (e.g. on a current-cell change), so the cell's glyph is
+        # restored in all cases. Only clear it if no newer editor has taken over.
+        if index.isValid() and self._editing_cell == (index.row(), index.column()):
+            self._editing_cell = None
+        col_key = getattr(editor, '_pool_key', None)
+        if col_key is not None and col_key not in self._editor_pool:
+            editor.hide()
+            self._editor_pool[col_key] = editor
+            return
+        super().destroyEditor(editor, index)
+
+    def _clear_editor_pool(self):
+        for editor in self._editor_pool.values():
+            editor.deleteLater()
+        self._editor_pool.clear()
+
+    def arrow_rect(self, cell_rect, col_key):
+        """Return the clickable arrow/icon rect inside cell_rect, or None for plain columns."""
+        width = ARROW_AREA_WIDTHS.get(col_key)
+        if width is None:
+            return None
+        return cell_rect.adjusted(cell_rect.width() - width, 0, 0, 0)
+
     def setEditorDataSources(self, accounts, categories, subcategories):
         """Called by the main GUI to provide data for dropdowns."""
         self.accounts_list = accounts
         self.categories_list = categories
         self.subcategories_list = subcategories
+        self._refresh_cols()
+        self._clear_editor_pool()
+        self._hint_cache.clear()
+        self._build_lookup_indexes()
+
+    def _build_lookup_indexes(self):
+        """
+        Group the dropdown sources so editors don't filter the full lists on every open.
+
+        _cats_by_type maps a transaction type to (display name, id) pairs, with
+        category ID 1 already shown as UNCATEGORIZED; _subs_by_cat maps a
+        category ID to its subcategory dicts.
+        """
+        # IDs of the special UNCATEGORIZED categories, so displayText checks a set
+        # instead of asking the CategoryManager for every cell
+        category_manager = getattr(self.parent_window, 'category_manager', None)
+        if category_manager is not None:
+            self._uncategorized_ids = frozenset(
+                cat_id for cat_id in category_manager.special_categories['UNCATEGORIZED'].values()
+                if cat_id is not None)
+        else:
+            self._uncategorized_ids = frozenset()
+
+        # ID -> name, first entry wins as with the linear scans these replace
+        self._accounts_by_id = {}
+        for acc in self.accounts_list:
+            self._accounts_by_id.setdefault(acc['id'], acc['name'])
+        self._categories_by_id = {}
+        for cat in self.categories_list:
+            self._categories_by_id.setdefault(cat['id'], cat['name'])
+        self._subcategories_by_id = {}
+        for subcat in self.subcategories_list:
+            self._subcategories_by_id.setdefault(subcat['id'], subcat['name'])
+        # ID columns -> the one table their IDs are resolved against
+        self._id_names_by_col = {
+            'account': self._accounts_by_id,
+            'category': self._categories_by_id,
+            'sub_category': self._subcategories_by_id,
+        }
+
+        self._cats_by_type = defaultdict(list)
+        self._name_to_catid = defaultdict(dict) # type -> display name -> id, for completer editors
+        self._catid_by_name = {} # (type, stored name) -> id, first match wins
+        for cat in self.categories_list:
+            # SPECIAL CASE: Handle the Bank of America vs UNCATEGORIZED conflict
+            display_name = 'UNCATEGORIZED' if cat['id'] == 1 else cat['name']
+            self._cats_by_type[cat['type']].append((display_name, cat['id']))
+            self._name_to_catid[cat['type']].setdefault(display_name, cat['id'])
+            self._catid_by_name.setdefault((cat['type'], cat['name']), cat['id'])
+        self._subs_by_cat = defaultdict(list)
+        for subcat in self.subcategories_list:
+            self._subs_by_cat[subcat.get('category_id')].append(subcat)
+
+        # Item models handed to the dropdown editors. The account model is built
+        # here; category and subcategory models on first use per type/category.
+        # They are parentless so an editor still showing a replaced model keeps it alive.
+        self._account_model = self._build_item_model(
+            (acc['name'], acc['id']) for acc in self.accounts_list)
+        self._cat_models = {}
+        self._cat_name_models = {}
+        self._subcat_models = {}
+
+    @staticmethod
+    def _build_item_model(entries):
+        """
+        Build a single-column model from (text, user data) pairs in one insert.
+
+        The model also carries data -> row and text -> row maps (first occurrence
+        wins, as with findData/findText) that setEditorData uses instead of scanning.
+        """
+        model = QStandardItemModel()
+        items = []
+        data_index, text_index = {}, {}
+        for row, (text, data) in enumerate(entries):
+            item = QStandardItem(text)
+            item.setData(data, Qt.ItemDataRole.UserRole) # Same role QComboBox.addItem uses for userData
+            items.append(item)
+            data_index.setdefault(data, row)
+            text_index.setdefault(text, row)
+        if items:
+            model.appendColumn(items)
+        model._data_index = data_index
+        model._text_index = text_index
+        return model
+
+    def _category_model(self, transaction_type):
+        model = self._cat_models.get(transaction_type)
+        if model is None:
+            model = self._build_item_model(self._cats_by_type[transaction_type])
+            self._cat_models[transaction_type] = model
+        return model
+
+    def _category_name_model(self, transaction_type):
+        model = self._cat_name_models.get(transaction_type)
+        if model is None:
+            model = QStringListModel([name for name, _ in self._cats_by_type[transaction_type]])
+            self._cat_name_models[transaction_type] = model
+        return model
+
+    def _subcategory_model(self, category_id):
+        model = self._subcat_models.get(category_id)
+        if model is None:
+            model = self._build_item_model(
+                (subcat['name'], subcat['id']) for subcat in self._subs_by_cat.get(category_id, ()))
+            self._subcat_models[category_id] = model
+        return model
 
     def createEditor(self, parent: QWidget, option, index: QModelIndex) -> QWidget:
         col = index.column()
         # Ensure parent_window and COLS exist before accessing
-        col_key = None
-        if self.parent_window and hasattr(self.parent_window, 'COLS') and col < len(self.parent_window.COLS):
-             col_key = self.parent_window.COLS[col]
-        else:
+        try:
+             col_key = self._cols[col]
+        except (AttributeError, IndexError):
              print(f"Warning: Cannot determine column key for col {col}. Parent or COLS missing.")
              return super().createEditor(parent, option, index) # Fallback
 
+        # Recorded up front: the branches below may rebind 'index'
+        self._editing_cell = (index.row(), col)
+
         # Get current transaction data for context (needed for filtering dropdowns)
-        row = index.row()
-        current_transaction_data = None
-        main_gui = self.parent_window
-        # Make sure main_gui exists and has the required lists
-        if main_gui and hasattr(main_gui, 'transactions') and hasattr(main_gui, 'pending'):
-            num_transactions = len(main_gui.transactions)
-            is_pending = row >= num_transactions
-            data_source = None
-            data_index = -1
-
-            if is_pending:
-                 data_source = main_gui.pending
-                 data_index = row - num_transactions
-            elif 0 <= row < num_transactions:
-                 data_source = main_gui.transactions
-                 data_index = row
-
-            if data_source is not None and 0 <= data_index < len(data_source):
-                 current_transaction_data = data_source[data_index]
+        current_transaction_data = self._row_data(index.row())
 
         # --- Editor Creation based on Column Key ---
+        # Editors are reused through a per-column pool (see destroyEditor), so
+        # one-time setup only runs when a new widget has to be built
         if col_key == 'transaction_value':
-            editor = QLineEdit(parent)
-            editor.setAlignment(Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter) # Align numbers right
+            editor = self._take_pooled_editor(col_key, parent)
+            if editor is None:
+                editor = self._pooled(QLineEdit(parent), col_key)
+                editor.setAlignment(Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter) # Align numbers right
             return editor
         elif col_key == 'transaction_date':
-            editor = ArrowDateEdit(parent)
+            editor = self._take_pooled_editor(col_key, parent)
+            if editor is None:
+                editor = self._pooled(ArrowDateEdit(parent), col_key)
+                editor.setObjectName("delegate_dropdown")
+                editor.setDisplayFormat("dd MMM yyyy")
+                editor.setLocale(self.locale)
+                editor.setCalendarPopup(True)
             value = index.model().data(index, Qt.ItemDataRole.EditRole)
-            editor.setDisplayFormat("dd MMM yyyy")
-            editor.setLocale(self.locale)
-            if isinstance(value, str) and len(value) == 10 and value.count('-') == 2:
-                date_val = QDate.fromString(value, "yyyy-MM-dd")
-                if date_val.isValid():
-                    editor.setDate(date_val)
-                else:
-                    editor.setDate(QDate.currentDate())
+            parts = _parse_date_text(value) if isinstance(value, str) else None
+            if parts is not None:
+                editor.setDate(QDate(*parts))
             else:
                 editor.setDate(QDate.currentDate())
             current_year = QDate.currentDate().year()
@@ -125,99 +538,85 @@ class SpreadsheetDelegate(QStyledItemDelegate):
                 QDate(current_year - 10, 1, 1),  # 10 years ago
                 QDate(current_year + 10, 12, 31)  # 10 years in the future
             )
-            editor.setCalendarPopup(True)
             return editor
         elif col_key == 'account':
-            editor = ArrowComboBox(parent)
-            editor.setEditable(False)
-            for acc in self.accounts_list:
-                editor.addItem(acc['name'], userData=acc['id'])
-            if editor.count() == 0:
-                editor.addItem("No Accounts Available")
-                editor.model().item(0).setEnabled(False)
+            editor = self._take_pooled_combo(col_key, parent)
+            if self.accounts_list:
+                editor.setModel(self._account_model)
+            else:
+                self._set_placeholder(editor, "No Accounts Available")
                 editor.setEnabled(False)
-            QTimer.singleShot(0, editor.showPopup)
+            self._schedule_popup(editor)
             return editor
         elif col_key == 'transaction_type':
-            editor = ArrowComboBox(parent)
-            editor.setEditable(False)
-            editor.addItem('Expense', userData='Expense')
-            editor.addItem('Income', userData='Income')
+            editor = self._take_pooled_editor(col_key, parent)
+            if editor is None:
+                editor = self._pooled(ArrowComboBox(parent), col_key)
+                editor.setEditable(False)
+                editor.addItem('Expense', userData='Expense')
+                editor.addItem('Income', userData='Income')
+            editor.setCurrentIndex(0)
             if current_transaction_data and 'transaction_type' in current_transaction_data:
                 current_type = current_transaction_data['transaction_type']
                 index = editor.findText(current_type)
                 if index >= 0:
                     editor.setCurrentIndex(index)
-            QTimer.singleShot(0, editor.showPopup)
+            self._schedule_popup(editor)
             return editor
         elif col_key == 'category':
-            editor = ArrowComboBox(parent)
-            editor.setEditable(False)
             current_type = 'Expense'
             if current_transaction_data and 'transaction_type' in current_transaction_data:
                  current_type = current_transaction_data['transaction_type']
-            has_uncategorized = False
             # CRITICAL FIX: Always ensure UNCATEGORIZED is available for the current transaction type
             # This ensures we always have an UNCATEGORIZED option in the dropdown
-
-            # SPECIAL CASE: Handle the Bank of America vs UNCATEGORIZED conflict
-            # Create a modified categories list that ensures UNCATEGORIZED is displayed for ID 1
-            modified_categories = []
-            for cat in self.categories_list:
-                if cat['id'] == 1 and cat['type'] == current_type:
-                    # Force name to be UNCATEGORIZED for ID 1
-                    modified_cat = cat.copy()
-                    modified_cat['name'] = 'UNCATEGORIZED'
-                    modified_categories.append(modified_cat)
-                    debug_print('CATEGORY', f"DELEGATE EDITOR FIX: Forcing display of UNCATEGORIZED for category_id=1")
-                else:
-                    modified_categories.append(cat)
+            type_categories = self._cats_by_type[current_type]
 
             # First, ensure we have an UNCATEGORIZED category for the current transaction type
-            uncategorized_exists = False
-            for cat in modified_categories:
-                if cat['type'] == current_type and cat['name'] == 'UNCATEGORIZED':
-                    uncategorized_exists = True
-                    break
+            uncategorized_exists = any(name == 'UNCATEGORIZED' for name, _ in type_categories)
 
             # If UNCATEGORIZED doesn't exist for this transaction type, try to create it
             if not uncategorized_exists and self.parent_window and hasattr(self.parent_window, 'db'):
-                debug_print('CATEGORY', f"Creating UNCATEGORIZED category for transaction type {current_type}")
+                debug_print('CATEGORY', "Creating UNCATEGORIZED category for transaction type %s", current_type)
                 # Try to create the UNCATEGORIZED category
                 uncategorized_id = self.parent_window.db.ensure_category('UNCATEGORIZED', current_type)
                 if uncategorized_id:
-                    # Add to our modified categories list
-                    modified_categories.append({
-                        'id': uncategorized_id,
-                        'name': 'UNCATEGORIZED',
-                        'type': current_type
-                    })
-                    # Also add to our categories list for future use
+                    # Also add to our categories list and index for future use
                     self.categories_list.append({
                         'id': uncategorized_id,
                         'name': 'UNCATEGORIZED',
                         'type': current_type
                     })
+                    type_categories.append(('UNCATEGORIZED', uncategorized_id))
+                    self._catid_by_name.setdefault((current_type, 'UNCATEGORIZED'), uncategorized_id)
+                    self._categories_by_id.setdefault(uncategorized_id, 'UNCATEGORIZED')
+                    self._name_to_catid[current_type].setdefault('UNCATEGORIZED', uncategorized_id)
+                    self._cat_models.pop(current_type, None)
+                    self._cat_name_models.pop(current_type, None)
                     # Reload dropdown data in the background
-                    QTimer.singleShot(0, lambda: self.parent_window._load_dropdown_data())
-
-            # Now add all categories of the current type to the dropdown
-            for cat in modified_categories:
-                if cat['type'] == current_type:
-                    editor.addItem(cat['name'], userData=cat['id'])
-                    if cat['name'] == 'UNCATEGORIZED':
-                        has_uncategorized = True
-
-            if editor.count() == 0:
-                editor.addItem(f"No {current_type} Categories")
-                editor.model().item(0).setEnabled(False)
+                    self._schedule_dropdown_reload()
+
+            if len(type_categories) > self._use_completer_threshold:
+                editor = QLineEdit(parent)
+                completer = QCompleter(self._category_name_model(current_type), editor)
+                completer.setCompletionMode(QCompleter.CompletionMode.PopupCompletion)
+                completer.setFilterMode(Qt.MatchFlag.MatchContains)
+                completer.setCaseSensitivity(Qt.CaseSensitivity.CaseInsensitive)
+                editor.setCompleter(completer)
+                # setModelData maps the typed name back to its ID through this dict
+                editor._category_ids = self._name_to_catid[current_type]
+                return editor
+
+            editor = self._take_pooled_combo(col_key, parent)
+            # Now show all categories of the current type in the dropdown
+            if type_categories:
+                editor.setModel(self._category_model(current_type))
+            else:
+                self._set_placeholder(editor, f"No {current_type} Categories")
                 editor.setEnabled(False)
-            editor.setStyleSheet(self.dropdown_style)
-            QTimer.singleShot(0, editor.showPopup)
+            self._schedule_popup(editor)
             return editor
         elif col_key == 'sub_category':
-            editor = ArrowComboBox(parent)
-            editor.setEditable(False)
+            editor = self._take_pooled_combo(col_key, parent)
             current_category_id = None
             if current_transaction_data:
                 if 'category_id' in current_transaction_data:
@@ -227,52 +626,46 @@ class SpreadsheetDelegate(QStyledItemDelegate):
                 elif 'category' in current_transaction_data and self.parent_window:
                     category_name = current_transaction_data['category']
                     transaction_type = current_transaction_data.get('transaction_type', 'Expense')
-                    for cat in self.categories_list:
-                        if cat['name'] == category_name and cat['type'] == transaction_type:
-                            current_category_id = cat['id']
-                            current_transaction_data['category_id'] = cat['id']
-                            break
-            has_uncategorized = False
+                    current_category_id = self._catid_by_name.get((transaction_type, category_name))
+                    if current_category_id is not None:
+                        current_transaction_data['category_id'] = current_category_id
             if current_category_id is not None:
-                for subcat in self.subcategories_list:
-                    if subcat.get('category_id') == current_category_id:
-                        editor.addItem(subcat['name'], userData=subcat['id'])
-                        if subcat['name'] == 'UNCATEGORIZED':
-                            has_uncategorized = True
+                category_subs = self._subs_by_cat.get(current_category_id, ())
+                has_uncategorized = any(subcat['name'] == 'UNCATEGORIZED' for subcat in category_subs)
                 if not has_uncategorized and self.parent_window and hasattr(self.parent_window, 'db'):
                     uncategorized_id = self.parent_window.db.ensure_subcategory('UNCATEGORIZED', current_category_id)
                     if uncategorized_id:
-                        editor.addItem('UNCATEGORIZED', userData=uncategorized_id)
-                        QTimer.singleShot(0, lambda: self.parent_window._load_dropdown_data())
-            if editor.count() == 0:
+                        self._subs_by_cat[current_category_id].append({
+                            'id': uncategorized_id,
+                            'name': 'UNCATEGORIZED',
+                            'category_id': current_category_id
+                        })
+                        self._subcat_models.pop(current_category_id, None)
+                        self._schedule_dropdown_reload()
+            if current_category_id is not None and self._subs_by_cat.get(current_category_id):
+                editor.setModel(self._subcategory_model(current_category_id))
+            else:
                 placeholder = "Select Category First" if current_category_id is None else "No Subcategories"
-                editor.addItem(placeholder)
-                editor.model().item(0).setEnabled(False)
+                self._set_placeholder(editor, placeholder)
                 editor.setEnabled(False if current_category_id is None else True)
-            editor.setStyleSheet(self.dropdown_style)
-            QTimer.singleShot(0, editor.showPopup)
+            self._schedule_popup(editor)
             return editor
         elif col_key == 'transaction_name':
-            editor = QLineEdit(parent)
+            editor = self._take_pooled_editor(col_key, parent)
+            if editor is None:
+                editor = self._pooled(QLineEdit(parent), col_key)
             return editor
         elif col_key == 'transaction_description':
+            editor = self._take_pooled_editor(col_key, parent)
+            if editor is not None:
+                return editor
             # Create a single-line editor for descriptions
-            editor = QLineEdit(parent)
-            editor.setStyleSheet("""
-                QLineEdit {
-                    background-color: #2d323b;
-                    color: #f3f3f3;
-                    border: 1px solid #444;
-                    border-radius: 4px;
-                    padding: 6px;
-                }
-                QLineEdit:focus {
-                    border: 1.5px solid #4fc3f7;
-                }
-            """)
+            editor = self._pooled(QLineEdit(parent), col_key)
+            editor.setObjectName("delegate_description")
             return editor
         else:
             print(f"No specific editor for column {col} (key: {col_key}), preventing edit.")
+            self._editing_cell = None
             return None
 
     def eventFilter(self, editor, event):
@@ -295,6 +688,10 @@ class SpreadsheetDelegate(QStyledItemDelegate):
                 return True
             elif key == Qt.Key.Key_Tab or key == Qt.Key.Key_Backtab:
                  self.commitData.emit(editor)
+                 # The view opens the next cell's editor while handling this key;
+                 # flag it so that editor doesn't pop its list open
+                 self._tab_navigation = True
+                 QTimer.singleShot(0, self._end_tab_navigation)
                  return False
         elif event.type() == event.Type.FocusOut:
             if isinstance(editor, QDateEdit):
@@ -311,31 +708,39 @@ class SpreadsheetDelegate(QStyledItemDelegate):
     def setEditorData(self, editor: QWidget, index: QModelIndex) -> None:
         value = index.model().data(index, Qt.ItemDataRole.EditRole)
         col = index.column()
-        col_key = None
-        if self.parent_window and hasattr(self.parent_window, 'COLS') and col < len(self.parent_window.COLS):
-             col_key = self.parent_window.COLS[col]
-        else:
+        try:
+             col_key = self._cols[col]
+        except (AttributeError, IndexError):
              print(f"Warning in setEditorData: Cannot determine column key for col {col}.")
              super().setEditorData(editor, index); return
+        # Set when the editor shows a substitute (first item, today, 0.00) rather than
+        # the cell's value; accepting it must then still be committed
+        fell_back = False
         if isinstance(editor, QComboBox):
             found_idx = -1
-            if value is not None:
-                 found_idx = editor.findData(value)
-            if found_idx != -1:
-                editor.setCurrentIndex(found_idx)
+            combo_model = editor.model()
+            data_index = getattr(combo_model, '_data_index', None)
+            if data_index is not None:
+                 # Shared delegate model: use its prebuilt maps
+                 if value is not None:
+                      found_idx = data_index.get(value, -1)
+                 if found_idx == -1:
+                      found_idx = combo_model._text_index.get(str(value), -1)
             else:
-                found_idx = editor.findText(str(value))
-                if found_idx != -1:
-                     editor.setCurrentIndex(found_idx)
-                else:
-                     editor.setCurrentIndex(0)
+                 # No prebuilt index: scan the model by data, then by text
+                 if value is not None:
+                      found_idx = editor.findData(value)
+                 if found_idx == -1:
+                      found_idx = editor.findText(str(value))
+            fell_back = found_idx == -1
+            editor.setCurrentIndex(found_idx if found_idx != -1 else 0)
         elif isinstance(editor, QDateEdit) or isinstance(editor, ArrowDateEdit):
             if isinstance(value, str):
-                date_val = QDate.fromString(value, "yyyy-MM-dd")
-                if date_val.isValid():
-                    editor.setDate(date_val)
+                parts = _parse_date_text(value) # ISO and the table's display format
+                if parts is not None:
+                    editor.setDate(QDate(*parts))
                 else:
-                    date_formats = ["dd MMM yyyy", "MM/dd/yyyy", "dd/MM/yyyy"]
+                    date_formats = ["MM/dd/yyyy", "dd/MM/yyyy"]
                     for fmt in date_formats:
                         date_val = QDate.fromString(value, fmt)
                         if date_val.isValid():
@@ -343,51 +748,71 @@ class SpreadsheetDelegate(QStyledItemDelegate):
                             break
                     else:
                         editor.setDate(QDate.currentDate())
+                        fell_back = True
             elif isinstance(value, QDate):
                 editor.setDate(value)
             else:
                 editor.setDate(QDate.currentDate())
+                fell_back = True
         # QTextEdit handling removed - now using QLineEdit for descriptions
         elif isinstance(editor, QLineEdit):
              if col_key == 'transaction_value':
                  amount_decimal = Decimal('0.00')
+                 fell_back = value is None
                  if isinstance(value, Decimal):
                       amount_decimal = value
                  elif isinstance(value, str):
                       try:
-                           cleaned_value = value
-                           for symbol in ['$', '€', '£', '¥', '₹', '₽', '₩', '₴', '₦', '₱', '฿', '₫', '₲', '₪', '₡', '₢', '₣', '₤', '₥', '₧', '₨', '₩', '₭', '₮', '₯', '₰', '₱', '₲', '₳', '₴', '₵', '₶', '₷', '₸', '₹', '₺', '₻', '₼', '₽', '₾', '₿']:
-                               cleaned_value = cleaned_value.replace(symbol, '')
-                           import re
-                           cleaned_value = re.sub(r'\b[A-Z]{3}\b', '', cleaned_value)
-                           cleaned_value = cleaned_value.strip()
-                           cleaned_value = cleaned_value.replace(self.locale.groupSeparator(), '')
-                           cleaned_value = cleaned_value.replace(self.locale.decimalPoint(), '.')
+                           cleaned_value = _CURRENCY_RE.sub('', value).strip().translate(self._amount_table)
                            amount_decimal = Decimal(cleaned_value)
                       except (InvalidOperation, ValueError):
                            print(f"Warning: Could not convert string value '{value}' to Decimal in setEditorData.")
                            amount_decimal = Decimal('0.00')
+                           fell_back = True
                  elif value is not None:
                       try:
                            amount_decimal = Decimal(str(value))
                       except InvalidOperation:
                            print(f"Warning: Could not convert value '{value}' to Decimal in setEditorData.")
                            amount_decimal = Decimal('0.00')
-                 formatted_amount = self.locale.toString(float(amount_decimal), 'f', 2)
+                           fell_back = True
+                 formatted_amount = self._format_amount(amount_decimal)
                  editor.setText(formatted_amount)
                  QTimer.singleShot(0, editor.selectAll)
+             elif col_key == 'category' and isinstance(value, int):
+                 # Completer-based category editor: show the name, not the stored ID
+                 editor.setText(self._find_name_for_id('category', value))
+                 QTimer.singleShot(0, editor.selectAll)
              else:
                  editor.setText(str(value) if value is not None else "")
                  QTimer.singleShot(0, editor.selectAll)
         else:
              super().setEditorData(editor, index)
+        # Remember what the editor started with so setModelData can skip untouched cells;
+        # a fallback value is not the cell's, so it gets no snapshot and always commits
+        editor._initial_state = None if fell_back else self._editor_state(editor)
+
+    @staticmethod
+    def _editor_state(editor):
+        """Return a comparable snapshot of an editor's current value."""
+        if isinstance(editor, QComboBox):
+            return editor.currentIndex()
+        if isinstance(editor, QDateEdit):
+            return editor.date()
+        if isinstance(editor, QLineEdit):
+            return editor.text()
+        return None
 
     def setModelData(self, editor: QWidget, model, index: QModelIndex) -> None:
+        # Fast path: nothing was edited (e.g. tabbing through), so there is nothing
+        # to parse, compare or push onto the undo stack
+        initial_state = getattr(editor, '_initial_state', None)
+        if initial_state is not None and self._editor_state(editor) == initial_state:
+            return
         col = index.column()
-        col_key = None
-        if self.parent_window and hasattr(self.parent_window, 'COLS') and col < len(self.parent_window.COLS):
-             col_key = self.parent_window.COLS[col]
-        else:
+        try:
+             col_key = self._cols[col]
+        except (AttributeError, IndexError):
              print(f"Error in setModelData: Cannot determine column key for col {col}.")
              return
         row = index.row()
@@ -407,52 +832,32 @@ class SpreadsheetDelegate(QStyledItemDelegate):
                     if col_key == 'category' and display_text == 'UNCATEGORIZED':
                         # Find the correct UNCATEGORIZED category ID based on transaction type
                         transaction_type = 'Expense'  # Default
-                        if self.parent_window:
-                            # Try to get the transaction type from the current row
-                            row_data = None
-                            if row < len(self.parent_window.transactions):
-                                row_data = self.parent_window.transactions[row]
-                            elif row - len(self.parent_window.transactions) < len(self.parent_window.pending):
-                                row_data = self.parent_window.pending[row - len(self.parent_window.transactions)]
-
-                            if row_data and 'transaction_type' in row_data:
-                                transaction_type = row_data['transaction_type']
+                        # Try to get the transaction type from the current row
+                        row_data = self._row_data(row)
+                        if row_data and 'transaction_type' in row_data:
+                            transaction_type = row_data['transaction_type']
 
                         # Find the correct UNCATEGORIZED category ID
-                        for cat in self.categories_list:
-                            if cat['name'] == 'UNCATEGORIZED' and cat['type'] == transaction_type:
-                                new_value_for_model = cat['id']
-                                debug_print('CATEGORY', f"SET_MODEL_DATA FIX: Setting category_id to {cat['id']} for UNCATEGORIZED")
-
-                                # Update the underlying data structure directly to ensure consistency
-                                if self.parent_window:
-                                    if row < len(self.parent_window.transactions):
-                                        self.parent_window.transactions[row]['category'] = 'UNCATEGORIZED'
-                                        self.parent_window.transactions[row]['category_id'] = cat['id']
-                                    elif row - len(self.parent_window.transactions) < len(self.parent_window.pending):
-                                        pending_idx = row - len(self.parent_window.transactions)
-                                        self.parent_window.pending[pending_idx]['category'] = 'UNCATEGORIZED'
-                                        self.parent_window.pending[pending_idx]['category_id'] = cat['id']
-                                break
+                        uncategorized_id = self._catid_by_name.get((transaction_type, 'UNCATEGORIZED'))
+                        if uncategorized_id is not None:
+                            new_value_for_model = uncategorized_id
+                            debug_print('CATEGORY', "SET_MODEL_DATA FIX: Setting category_id to %s for UNCATEGORIZED", uncategorized_id)
+
+                            # Update the underlying data structure directly to ensure consistency
+                            if row_data is not None:
+                                row_data['category'] = 'UNCATEGORIZED'
+                                row_data['category_id'] = uncategorized_id
 
                     # SPECIAL CASE: If we're setting category_id to 1, ensure we're setting it for UNCATEGORIZED
                     # This handles the case where the user selects a category that happens to have ID 1
                     elif col_key == 'category' and new_value_for_model == 1:
                         # Force the display text to be UNCATEGORIZED
                         if display_text != 'UNCATEGORIZED':
-                            debug_print('CATEGORY', f"SET_MODEL_DATA FIX: Forcing display text to UNCATEGORIZED for category_id=1")
-                            # Update the item text directly
-                            item = self.parent_window.tbl.item(row, col)
-                            if item:
-                                item.setText('UNCATEGORIZED')
-
-                            # Update the underlying data structure
-                            if self.parent_window:
-                                if row < len(self.parent_window.transactions):
-                                    self.parent_window.transactions[row]['category'] = 'UNCATEGORIZED'
-                                elif row - len(self.parent_window.transactions) < len(self.parent_window.pending):
-                                    pending_idx = row - len(self.parent_window.transactions)
-                                    self.parent_window.pending[pending_idx]['category'] = 'UNCATEGORIZED'
+                            debug_print('CATEGORY', "SET_MODEL_DATA FIX: Forcing display text to UNCATEGORIZED for category_id=1")
+                            # The table model shows ID 1 as UNCATEGORIZED; update the underlying data structure
+                            row_data = self._row_data(row)
+                            if row_data is not None:
+                                row_data['category'] = 'UNCATEGORIZED'
 
                     if new_value_for_model == "" and display_text == "":
                          new_value_for_model = None
@@ -465,15 +870,22 @@ class SpreadsheetDelegate(QStyledItemDelegate):
                 text = editor.text()
                 if col_key == 'transaction_value':
                     try:
-                        cleaned_text = text.replace(self.locale.groupSeparator(),'').replace(self.locale.currencySymbol(),'').replace(self.locale.decimalPoint(),'.')
-                        import re
-                        cleaned_text = re.sub(r'\s[A-Z]{3}$', '', cleaned_text).strip()
+                        cleaned_text = text.replace(self._amount_symbol, '') if self._amount_symbol else text
+                        cleaned_text = cleaned_text.translate(self._amount_table)
+                        cleaned_text = _TRAILING_CODE_RE.sub('', cleaned_text).strip()
                         new_value_for_model = Decimal(cleaned_text)
                         new_value_for_command = new_value_for_model
                     except InvalidOperation:
                         print(f"Warning: Invalid decimal format '{text}' for {col_key}. Reverting.")
                         self.closeEditor.emit(editor, QStyledItemDelegate.EndEditHint.RevertModelCache)
                         return
+                elif col_key == 'category' and hasattr(editor, '_category_ids'):
+                    new_value_for_model = editor._category_ids.get(text.strip())
+                    if new_value_for_model is None:
+                        print(f"Warning: Unknown category '{text}'. Reverting.")
+                        self.closeEditor.emit(editor, QStyledItemDelegate.EndEditHint.RevertModelCache)
+                        return
+                    new_value_for_command = new_value_for_model
                 else:
                     new_value_for_model = text
                     new_value_for_command = new_value_for_model
@@ -486,165 +898,241 @@ class SpreadsheetDelegate(QStyledItemDelegate):
             elif str(new_value_for_model) != str(old_value):
                  changed = True
             if changed:
-                model.setData(index, new_value_for_model, Qt.ItemDataRole.EditRole)
-                if self.parent_window and hasattr(self.parent_window, 'undo_stack'):
-                    command = CellEditCommand(self.parent_window, row, col, old_value, new_value_for_command)
-                    self.parent_window.undo_stack.push(command)
-                else:
-                    print("Warning: Could not create undo command (parent window or undo stack missing).")
+                # The table model applies the edit as a CellEditCommand on the undo stack
+                model.setData(index, new_value_for_command, Qt.ItemDataRole.EditRole)
         except Exception as e:
              print(f"Error in setModelData for row {row}, col {col} (key: {col_key}): {e}")
              self.closeEditor.emit(editor, QStyledItemDelegate.EndEditHint.RevertModelCache)
 
+    def sizeHint(self, option, index):
+        """Return a cached size for fixed-format columns; other columns use the default."""
+        col = index.column()
+        if option.font != self._hint_font:
+            # Measured sizes depend on the font; start over when it changes
+            self._hint_cache.clear()
+            self._hint_font = QFont(option.font)
+        hint = self._hint_cache.get(col)
+        if hint is None:
+            try:
+                col_key = self._cols[col]
+            except (AttributeError, IndexError):
+                col_key = None
+            sample = _SIZE_HINT_SAMPLES.get(col_key)
+            if sample is None:
+                return super().sizeHint(option, index)
+            fm = option.fontMetrics
+            width = fm.horizontalAdvance(sample) + 2 * _CELL_PADDING + ARROW_AREA_WIDTHS.get(col_key, 0)
+            hint = QSize(width, fm.height() + 2 * _CELL_PADDING)
+            self._hint_cache[col] = hint
+        return hint
+
     def updateEditorGeometry(self, editor, option, index):
         editor.setGeometry(option.rect)
 
     def paint(self, painter, option, index):
-        super().paint(painter, option, index)
+        opt = QStyleOptionViewItem(option)
+        self.initStyleOption(opt, index)
+        widget = opt.widget
+        style = widget.style() if widget is not None else QApplication.style()
+        text = opt.text
+        text_rect = style.subElementRect(QStyle.SubElement.SE_ItemViewItemText, opt, widget)
+        # The style draws background, selection and focus; the text is drawn below
+        opt.text = ""
+        style.drawControl(QStyle.ControlElement.CE_ItemViewItem, opt, painter, widget)
+        if text:
+            self._draw_static_text(painter, opt, style, text, text_rect)
+
+        rect = option.rect
+        # Cells painted outside the visible area (e.g. during geometry changes) get no glyph
+        if not rect.intersects(painter.viewport()):
+            return
         col = index.column()
-        col_key = None
-        if self.parent_window and hasattr(self.parent_window, 'COLS') and col < len(self.parent_window.COLS):
-            col_key = self.parent_window.COLS[col]
-        if col_key in ['account', 'transaction_type', 'category', 'sub_category', 'transaction_date']:
-            from PyQt6.QtGui import QColor, QPen, QPolygon, QBrush
-            from PyQt6.QtCore import QPoint, QRect
-            painter.save()
-            rect = option.rect
-            arrow_width = 20
-            arrow_rect = QRect(rect.right() - arrow_width, rect.top(), arrow_width, rect.height())
-            if not hasattr(self, 'arrow_rects'):
-                self.arrow_rects = {}
-            if col_key == 'transaction_date':
-                date_arrow_width = 30
-                date_arrow_rect = QRect(rect.right() - date_arrow_width, rect.top(), date_arrow_width, rect.height())
-                self.arrow_rects[(index.row(), index.column())] = date_arrow_rect
-            else:
-                self.arrow_rects[(index.row(), index.column())] = arrow_rect
-            is_editing = False
-            if self.parent_window and hasattr(self.parent_window, 'tbl'):
-                current_index = self.parent_window.tbl.currentIndex()
-                if current_index.isValid() and current_index.row() == index.row() and current_index.column() == index.column():
-                    editor = self.parent_window.tbl.indexWidget(current_index)
-                    is_editing = editor is not None
-            if not is_editing:
+        try:
+            col_key = self._cols[col]
+        except (AttributeError, IndexError):
+            col_key = None
+        if col_key in ARROW_AREA_WIDTHS:
+            if self._editing_cell != (index.row(), col):
+                # Glyphs are centred 10px in from the right edge (half the 20px arrow area)
+                center_x = rect.right() - 10
+                center_y = rect.center().y()
                 if col_key == 'transaction_date':
-                    painter.setPen(QPen(QColor(150, 150, 150)))
-                    painter.setBrush(Qt.BrushStyle.NoBrush)
-                    center_x = int(rect.right() - (arrow_width / 2))
-                    center_y = rect.center().y()
-                    icon_size = 4
-                    calendar_rect = QRect(
-                        center_x - icon_size,
-                        center_y - icon_size,
-                        icon_size * 2,
-                        icon_size * 2
-                    )
-                    painter.drawRect(calendar_rect)
-                    header_y = center_y - icon_size + 1
-                    painter.drawLine(
-                        center_x - icon_size,
-                        header_y,
-                        center_x + icon_size,
-                        header_y
-                    )
+                    painter.drawPixmap(center_x - 4, center_y - 4, self._calendar_pm)
                 else:
-                    painter.setPen(QPen(QColor(150, 150, 150)))
-                    painter.setBrush(QBrush(QColor(150, 150, 150)))
-                    painter.setBrush(QBrush(QColor(150, 150, 150)))
-                    arrow_size = 3
-                    center_x = int(rect.right() - (arrow_width / 2))
-                    center_y = rect.center().y()
-                    arrow = QPolygon([
-                        QPoint(center_x - arrow_size, int(center_y - arrow_size/2)),
-                        QPoint(center_x + arrow_size, int(center_y - arrow_size/2)),
-                        QPoint(center_x, center_y + arrow_size)
-                    ])
-                    painter.drawPolygon(arrow)
-            painter.restore()
+                    painter.drawPixmap(center_x - 3, center_y - 2, self._arrow_pm)
 
-    def displayText(self, value, locale) -> str:
-        """Converts values to displayable text, handling special cases like UNCATEGORIZED categories."""
-        # Handle Decimal values (monetary values)
-        if isinstance(value, Decimal):
-            try:
-                return self.locale.toString(float(value), 'f', 2)
-            except Exception:
-                pass  # Fall through to default handling
-                
-        # Handle integer IDs with special case handling through CategoryManager
-        if isinstance(value, int) and self.parent_window:
-            # Check if this is a category ID using CategoryManager
-            if self.parent_window.category_manager.is_uncategorized_category(value):
-                return 'UNCATEGORIZED'
-                
-            # For normal category IDs, do a standard lookup
-            for cat in self.categories_list:
-                if cat['id'] == value:
-                    return cat['name']
-                    
-            # For subcategory IDs
-            for subcat in self.subcategories_list:
-                if subcat['id'] == value:
-                    return subcat['name']
-                    
-            # For account IDs
-            for acc in self.accounts_list:
-                if acc['id'] == value:
-                    return acc['name']
-        
-        # Handle string values that might be numeric IDs
-        if isinstance(value, str) and value.isdigit():
+    def _draw_static_text(self, painter, opt, style, text, text_rect):
+        """
+        Draw a cell's text from the QStaticText cache, aligned and clipped to text_rect.
+
+        Text that doesn't fit is elided with the view's textElideMode, as the style
+        would do; the available width is part of the cache key for that reason.
+        """
+        font = opt.font
+        # Same horizontal margin QCommonStyle leaves around item text
+        margin = style.pixelMetric(QStyle.PixelMetric.PM_FocusFrameHMargin, None, opt.widget) + 1
+        area = text_rect.adjusted(margin, 0, -margin, 0)
+
+        key = (text, font.key(), area.width(), opt.textElideMode)
+        static_text = self._static_text_cache.get(key)
+        if static_text is None:
+            if len(self._static_text_cache) >= _STATIC_TEXT_CACHE_SIZE:
+                del self._static_text_cache[next(iter(self._static_text_cache))]
+            shown = opt.fontMetrics.elidedText(text, opt.textElideMode, area.width())
+            static_text = QStaticText(shown)
+            static_text.setTextFormat(Qt.TextFormat.PlainText)
+            static_text.prepare(painter.transform(), font)
+            self._static_text_cache[key] = static_text
+
+        size = static_text.size()
+        align = opt.displayAlignment
+        if align & Qt.AlignmentFlag.AlignRight:
+            x = area.right() - size.width() + 1
+        elif align & Qt.AlignmentFlag.AlignHCenter:
+            x = area.left() + (area.width() - size.width()) / 2
+        else:
+            x = area.left()
+        if align & Qt.AlignmentFlag.AlignTop:
+            y = area.top()
+        elif align & Qt.AlignmentFlag.AlignBottom:
+            y = area.bottom() - size.height() + 1
+        else:
+            y = area.top() + (area.height() - size.height()) / 2
+
+        selected = bool(opt.state & QStyle.StateFlag.State_Selected)
+        # Colour group chosen as QCommonStyle does: Disabled, else Inactive when the
+        # window isn't active, else Normal
+        if not opt.state & QStyle.StateFlag.State_Enabled:
+            group = QPalette.ColorGroup.Disabled
+        elif not opt.state & QStyle.StateFlag.State_Active:
+            group = QPalette.ColorGroup.Inactive
+        else:
+            group = QPalette.ColorGroup.Normal
+        role = QPalette.ColorRole.HighlightedText if selected else QPalette.ColorRole.Text
+
+        painter.save()
+        painter.setClipRect(area, Qt.ClipOperation.IntersectClip)
+        painter.setFont(font)
+        painter.setPen(opt.palette.color(group, role))
+        painter.drawStaticText(QPointF(x, y), static_text)
+        painter.restore()
+
+    def _display_decimal(self, value):
+        """Monetary values, formatted with the locale's separators."""
+        try:
+            return self._format_amount(value)
+        except Exception:
+            return None  # Fall through to default handling
+
+    def _display_int(self, value):
+        """Integer IDs, with special case handling for the UNCATEGORIZED categories."""
+        col_key = self._current_col_key
+        if col_key is not None:
+            # Known column: only ID columns resolve names, and only from their own table
+            names_by_id = self._id_names_by_col.get(col_key)
+            if names_by_id is None:
+                return None
+            if col_key == 'category' and value in self._uncategorized_ids:
+                return _UNCATEGORIZED
+            return names_by_id.get(value)
+
+        # Check if this is one of the CategoryManager's UNCATEGORIZED IDs
+        if value in self._uncategorized_ids:
+            return _UNCATEGORIZED
+        # Category, then subcategory, then account IDs
+        return self._name_for_any_id(value)
+
+    def _display_str(self, value):
+        """Strings holding a numeric ID or an ISO date; anything else is shown as-is."""
+        col_key = self._current_col_key
+        if col_key is not None and col_key != 'transaction_date' and col_key not in self._id_names_by_col:
+            return value # Names, descriptions, amounts: nothing to resolve
+
+        if value.isdigit() and col_key != 'transaction_date':
             try:
                 int_value = int(value)
-                # Check if this is an UNCATEGORIZED category ID
-                if self.parent_window and self.parent_window.category_manager.is_uncategorized_category(int_value):
-                    return 'UNCATEGORIZED'
-                
-                # Try lookups in other lists
-                for cat in self.categories_list:
-                    if cat['id'] == int_value:
-                        return cat['name']
-                        
-                for subcat in self.subcategories_list:
-                    if subcat['id'] == int_value:
-                        return subcat['name']
-                        
-                for acc in self.accounts_list:
-                    if acc['id'] == int_value:
-                        return acc['name']
-            except (ValueError, TypeError):
-                pass  # If conversion fails, continue to default return
-                
+            except ValueError:
+                int_value = None  # e.g. superscript digits
+            if int_value is not None:
+                name = self._display_int(int_value)
+                if name is not None:
+                    return name
+
         # Handle dates - convert ISO format to locale format
-        if isinstance(value, str) and len(value) == 10 and value.count('-') == 2:
+        if len(value) == 10 and col_key in (None, 'transaction_date'):
             try:
-                date = QDate.fromString(value, "yyyy-MM-dd")
-                if date.isValid():
-                    return date.toString("dd MMM yyyy")
+                formatted = _format_iso_date(value)
+                if formatted is not None:
+                    return formatted
             except Exception:
                 pass # Ignore formatting errors, return original string
-                
+        return value
+
+    # displayText handlers by exact value type: one dict probe per cell instead of
+    # an isinstance chain. A handler returning None falls back to str(value).
+    _DISPLAY_HANDLERS = {Decimal: _display_decimal, int: _display_int, str: _display_str}
+
+    def initStyleOption(self, option, index):
+        """Let displayText know which column it is formatting."""
+        try:
+            self._current_col_key = self._cols[index.column()]
+        except IndexError:
+            self._current_col_key = None
+        try:
+            super().initStyleOption(option, index)
+        finally:
+            self._current_col_key = None
+
+    def display_text_for(self, col_key, value):
+        """Display text for a value of the given column, e.g. an ID for 'account'."""
+        self._current_col_key = col_key
+        try:
+            return self.displayText(value, self.locale)
+        finally:
+            self._current_col_key = None
+
+    def displayText(self, value, locale) -> str:
+        """Converts values to displayable text, handling special cases like UNCATEGORIZED categories."""
+        # Empty cells are the most common case; skip the dispatch for them
+        if value is None or value == "":
+            return ""
+        # Exact type match, so bools (an int subclass) are shown as text, not looked up as IDs
+        handler = self._DISPLAY_HANDLERS.get(type(value))
+        if handler is not None:
+            text = handler(self, value)
+            if text is not None:
+                return text
         # Default: return string representation
-        return str(value) if value is not None else ""
+        return str(value)
+
+    def set_conflict_map(self, mapping):
+        """Take the window's ID conflict mapping ({'category': {id: name}, ...})."""
+        self._cat_conflict_map = mapping.get('category', {})
+
+    def _name_for_any_id(self, item_id):
+        """Return the name of the category, subcategory or account (in that order) with this ID, or None."""
+        for names_by_id in (self._categories_by_id, self._subcategories_by_id, self._accounts_by_id):
+            name = names_by_id.get(item_id)
+            if name is not None:
+                return name
+        return None
 
     def _find_name_for_id(self, field_type, item_id, context=None):
-        """Helper to find name for ID within the delegate."""
-        try:
-            # Explicitly handle the special case for ID conflicts - do this first!
-            if field_type == 'category' and item_id == 1:
-                debug_print('CATEGORY', f"_find_name_for_id: CRITICALLY IMPORTANT - Forcing display of UNCATEGORIZED for category_id=1")
-                return 'UNCATEGORIZED'
-
-            if field_type == 'account':
-                return next((acc['name'] for acc in self.accounts_list if acc['id'] == item_id), "")
-            elif field_type == 'category':
-                # Category name doesn't depend on type context for display lookup
-                return next((cat['name'] for cat in self.categories_list if cat['id'] == item_id), "")
-            elif field_type == 'sub_category':
-                # SubCategory name doesn't depend on category context for display lookup
-                return next((subcat['name'] for subcat in self.subcategories_list if subcat['id'] == item_id), "")
-        except Exception as e:
-            print(f"Error finding name for {field_type} ID {item_id}: {e}")
-        return ""
+        """Helper to find name for ID within the delegate (item_id must be hashable)."""
+        # Explicitly handle the special case for ID conflicts - do this first!
+        if field_type == 'category':
+            forced = self._cat_conflict_map.get(item_id)
+            if forced is not None:
+                return forced
+            if item_id == 1:
+                debug_print('CATEGORY', "_find_name_for_id: Forcing display of UNCATEGORIZED for category_id=%s", item_id)
+                return _UNCATEGORIZED
+
+        # Plain dict lookups, which can't fail for hashable IDs; names don't depend on
+        # type or parent category context for display
+        names_by_id = self._id_names_by_col.get(field_type)
+        if names_by_id is None:
+            return ""
+        return names_by_id.get(item_id, "")
 
 # --- END OF FILE delegates.py ---
\ No newline at end of file
@@ -6,13 +6,40 @@ from PyQt6.QtWidgets import (QDialog, QVBoxLayout, QTextEdit,
 from PyQt6.QtCore import Qt
 from PyQt6.QtGui import QIcon
 
+# Stylesheets are module constants so each dialog hands Qt the same string
+# instead of building a fresh literal per open
+_INSTRUCTIONS_STYLE = "color: #a0a0a0; font-style: italic;"
+
+_TEXT_EDIT_STYLE = """
+    QTextEdit {
+        background-color: #2d323b;
+        color: #f3f3f3;
+        border: 1px solid #444;
+        border-radius: 4px;
+        padding: 6px;
+    }
+    QTextEdit:focus {
+        border: 1.5px solid #4fc3f7;
+    }
+"""
+
+# Window icon, looked up once (QIcon.fromTheme scans the icon theme paths)
+_EDIT_ICON = None
+
+def _edit_icon():
+    """Return the dialog's window icon, resolving the theme icon on first use."""
+    global _EDIT_ICON
+    if _EDIT_ICON is None:
+        _EDIT_ICON = QIcon.fromTheme("edit-rename", QIcon(":/icons/edit.png"))
+    return _EDIT_ICON
+
 class DescriptionDialog(QDialog):
     """Dialog for editing multi-line descriptions."""
 
     def __init__(self, parent=None, initial_text=""):
         super().__init__(parent)
         self.setWindowTitle("Edit Description")
-        self.setWindowIcon(QIcon.fromTheme("edit-rename", QIcon(":/icons/edit.png")))
+        self.setWindowIcon(_edit_icon())
         self.setMinimumWidth(400)
         self.setMinimumHeight(250)
 
@@ -20,24 +47,12 @@ class DescriptionDialog(QDialog):
         
         # Add instructions
         instructions = QLabel("Enter your description below. Use Shift+Enter for line breaks.")
-        instructions.setStyleSheet("color: #a0a0a0; font-style: italic;")
+        instructions.setStyleSheet(_INSTRUCTIONS_STYLE)
         layout.addWidget(instructions)
         
         # Text editor
         self.text_edit = QTextEdit()
-        self.text_edit.setText(initial_text)
-        self.text_edit.setStyleSheet("""
-            QTextEdit {
-                background-color: #2d323b;
-                color: #f3f3f3;
-                border: 1px solid #444;
-                border-radius: 4px;
-                padding: 6px;
-            }
-            QTextEdit:focus {
-                border: 1.5px solid #4fc3f7;
-            }
-        """)
+        self.text_edit.setStyleSheet(_TEXT_EDIT_STYLE)
         layout.addWidget(self.text_edit)
         
         # Standard buttons
@@ -47,16 +62,32 @@ class DescriptionDialog(QDialog):
         button_box.rejected.connect(self.reject)
         layout.addWidget(button_box)
         
-        # Set focus to the text edit
+        # Load the text the same way a reused dialog does (plain text, selected, focused)
+        self.reset(initial_text)
+
+    def reset(self, initial_text=""):
+        """Load new text into a reused dialog and give the editor focus."""
+        self.text_edit.setPlainText(initial_text)
+        self.text_edit.selectAll()
         self.text_edit.setFocus()
-    
+
     def get_text(self):
         """Return the edited text."""
         return self.text_edit.toPlainText()
 
 def show_description_dialog(parent, initial_text=""):
-    """Show the description dialog and return the edited text if accepted."""
-    dialog = DescriptionDialog(parent, initial_text)
+    """Show the description dialog and return the edited text if accepted.
+
+    The dialog is built once per parent and reused on later calls; it is owned
+    by the parent, so it goes away with it.
+    """
+    dialog = getattr(parent, '_description_dialog', None) if parent is not None else None
+    if dialog is None:
+        dialog = DescriptionDialog(parent, initial_text)
+        if parent is not None:
+            parent._description_dialog = dialog
+    else:
+        dialog.reset(initial_text)
     result = dialog.exec()
     
     if result == QDialog.DialogCode.Accepted:
@@ -4,26 +4,30 @@ import sys
 import os
 import re
 import sqlite3
+from collections import defaultdict
 from datetime import datetime
+from functools import lru_cache
 from decimal import Decimal, InvalidOperation # Import Decimal
 
 from PyQt6.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout,
-                             QHBoxLayout, QTableWidget, QTableWidgetItem,
+                             QHBoxLayout, QTableView,
                              QPushButton, QLineEdit, QComboBox, QLabel,
                              QMessageBox, QHeaderView, QAbstractItemView, QFrame, QDialog,
                              QGridLayout, QGroupBox, QDateEdit, QToolButton,
-                             QStyle, QToolBar, QTableWidgetSelectionRange)
+                             QStyle, QToolBar)
 # Import QEvent for eventFilter
-from PyQt6.QtCore import Qt, QTimer, QDate, QModelIndex, QSize, QLocale, QEvent, QPoint
+from PyQt6.QtCore import (Qt, QTimer, QDate, QModelIndex, QSize, QLocale, QEvent,
+                          QItemSelection, QItemSelectionModel)
 # Import QIcon
-from PyQt6.QtGui import (QKeySequence, QShortcut, QColor, QFont, QIcon,
-                         QKeyEvent, QUndoStack, QGuiApplication, QBrush)
+from PyQt6.QtGui import (QKeySequence, QShortcut, QColor, QIcon,
+                         QKeyEvent, QUndoStack, QGuiApplication, QBrush, QStandardItem)
 
 # --- Updated Imports ---
-from financial_tracker_app.data.database import Database
+from financial_tracker_app.data.database import Database, to_julian_day
 from financial_tracker_app.gui.delegates import SpreadsheetDelegate
+from financial_tracker_app.gui.transaction_model import TransactionTableModel
 from financial_tracker_app.logic.commands import CellEditCommand
-from financial_tracker_app.data.column_config import TRANSACTION_COLUMNS, DB_FIELDS, DISPLAY_TITLES, get_column_config
+from financial_tracker_app.data.column_config import TRANSACTION_COLUMNS, DB_FIELDS, get_column_config
 from financial_tracker_app.gui.custom_widgets import ArrowComboBox, ArrowDateEdit
 from financial_tracker_app.gui.custom_style import CustomProxyStyle
 from financial_tracker_app.logic.default_values import default_values
@@ -39,10 +43,243 @@ from financial_tracker_app.utils.field_mappings import (
 )
 # --- End Updated Imports ---
 
+@lru_cache(maxsize=None)
+def _icon(theme_name, fallback_path):
+    """Return the theme icon (or the bundled fallback), resolved once per name."""
+    return QIcon.fromTheme(theme_name, QIcon(fallback_path))
+
+# Main window stylesheet (simplified arrow styling), a module constant so window
+# construction doesn't rebuild the string
+_STYLESHEET = r'''
+    QMainWindow { background:#23272e; }
+    QWidget, QTableView, QDateEdit, QDateEdit QCalendarWidget QWidget {
+        background:#23272e; color:#f3f3f3;
+        font-family:Segoe UI,Arial,sans-serif; font-size:14px; }
+    QLineEdit, QComboBox, QDateEdit {
+        border: 1.5px solid #444;
+        border-radius: 4px;
+        padding: 6px;
+        background: #2d323b;
+        color: #f3f3f3;
+    }
+    QLineEdit:focus, QComboBox:focus, QDateEdit:focus {
+        border: 1.5px solid #4fc3f7;
+    }
+
+    ArrowComboBox:focus {
+        border: 1.5px solid #4fc3f7;
+        outline: none;
+    }
+    QLineEdit[error="true"], QComboBox[error="true"] {
+        border: 2px solid #ff5252;
+        background: #5c2c2c;
+    }
+    QHeaderView::section { background:#23272e; color:#f3f3f3;
+                           font-weight:bold; border:1px solid #444; padding:6px; }
+    QLineEdit, QComboBox, QDateEdit, QDateEdit QAbstractItemView {
+        background:#2d323b; color:#f3f3f3;
+        border:1px solid #444; border-radius:4px; padding:6px; }
+
+    /* Common styling for all dropdown widgets */
+    QComboBox, QDateEdit {
+        background: #2d323b;
+        color: #f3f3f3;
+        border: 1px solid #444;
+        border-radius: 4px;
+        padding: 6px;
+        padding-right: 15px; /* Minimal padding for the arrow */
+        min-height: 20px;
+    }
+
+    /* Style the dropdown button for standard QComboBox */
+    QComboBox::drop-down, QDateEdit::drop-down {
+        subcontrol-origin: padding;
+        subcontrol-position: top right;
+        width: 12px; /* Minimal width of the clickable area */
+        background: transparent;
+        border: none; /* No border */
+    }
+
+    /* Hide the default down arrow for QComboBox and QDateEdit */
+    QComboBox::down-arrow, QDateEdit::down-arrow {
+        width: 0px;
+        height: 0px;
+        background: transparent;
+    }
+
+    /* Ensure date fields have the same styling as dropdowns */
+    QDateEdit {
+        padding-right: 15px; /* Space for our custom arrow */
+    }
+
+    /* Style the dropdown popup */
+    QComboBox QAbstractItemView, ArrowComboBox QAbstractItemView, QDateEdit QAbstractItemView {
+        background-color: #2d323b;
+        border: 1px solid #555;
+        selection-background-color: #4a6984;
+        padding: 4px;
+        border-radius: 3px;
+    }
+
+    /* Focus styling */
+    QComboBox:focus, ArrowComboBox:focus, QDateEdit:focus {
+        border: 1.5px solid #4fc3f7;
+        outline: none;
+    }
+    QCalendarWidget QToolButton {
+        color: #f3f3f3; background-color: #3a3f4b; border: none; font-weight: bold;
+        icon-size: 18px; padding: 5px; margin: 2px; }
+    QCalendarWidget QMenu { background-color: #2d323b; color: #f3f3f3; }
+    QCalendarWidget QSpinBox { background-color: #2d323b; color: #f3f3f3; border: 1px solid #444; }
+    QCalendarWidget QWidget#qt_calendar_navigationbar { background-color: #23272e; border-bottom: 1px solid #444; }
+    QCalendarWidget QTableView { background-color: #23272e; alternate-background-color: #262b33; selection-background-color: #4a6984; }
+    QCalendarWidget QWidget#qt_calendar_calendarview { border: none; }
+    QPushButton { background:#3a3f4b; color:#f3f3f3;
+                           border-radius:6px; padding:8px 15px;
+                           font-weight:bold;
+                           padding-left: 30px; /* Space on left for icon */
+                           text-align: left; /* Align text next to icon */
+                           }
+    QPushButton#fab { /* Specific style for FAB */
+        padding: 0px; padding-left: 0px; text-align: center;
+        background:#4fc3f7; color:#23272e; border-radius:28px;
+        font-size:28px; font-weight:bold;
+    }
+    QPushButton#fab:hover { background:#29b6f6; }
+    /* Table cell editors created by SpreadsheetDelegate */
+    ArrowComboBox#delegate_dropdown, QDateEdit#delegate_dropdown {
+        background-color: #2d323b; color: #f3f3f3;
+        border: 1px solid #444; border-radius: 4px;
+        padding: 6px; padding-right: 15px; min-height: 20px;
+    }
+    ArrowComboBox#delegate_dropdown::drop-down {
+        subcontrol-origin: padding; subcontrol-position: top right;
+        width: 12px; background: transparent; border: none;
+    }
+    QLineEdit#delegate_description {
+        background-color: #2d323b; color: #f3f3f3;
+        border: 1px solid #444; border-radius: 4px; padding: 6px;
+    }
+    QLineEdit#delegate_description:focus { border: 1.5px solid #4fc3f7; }
+    QPushButton:hover { background:#4a4f5b; }
+    QPushButton:disabled { background:#444; color:#888; }
+    QTableView { gridline-color: #444; }
+    QTableView::item { padding: 4px; }
+    QTableView::item:selected { background-color: #4a6984; color: #f3f3f3; }
+    QGroupBox { border: 1px solid #444; border-radius: 6px; margin-top: 10px; padding: 10px; }
+    QGroupBox:title { subcontrol-origin: margin; left: 10px; padding: 0 4px 0 4px; color: #81d4fa; font-size: 14px; font-weight: bold; }
+    QToolButton { background-color: #3a3f4b; border-radius: 4px; padding: 4px; }
+    QToolButton:hover { background-color: #4a4f5b; }
+    QToolBar { background-color: #23272e; border: none; spacing: 6px; }
+'''
+
+# Transaction write statements, shared by every save path so sqlite3's statement
+# cache compiles each of them once per connection
+_INSERT_TRANSACTION_SQL = '''
+    INSERT INTO transactions(
+        transaction_name, transaction_value, account_id,
+        transaction_type, transaction_category,
+        transaction_sub_category, transaction_description, transaction_date,
+        transaction_date_jd
+    )
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+'''
+
+_UPDATE_TRANSACTION_SQL = '''
+    UPDATE transactions
+       SET transaction_name=?, transaction_value=?, account_id=?, transaction_type=?,
+           transaction_category=?, transaction_sub_category=?, transaction_description=?, transaction_date=?,
+           transaction_date_jd=?
+     WHERE rowid=?
+'''
+
+def _transaction_params(data):
+    """
+    Return the column values for _INSERT_TRANSACTION_SQL from a validated row.
+
+    _UPDATE_TRANSACTION_SQL takes the same tuple followed by the rowid.
+    transaction_value is a REAL column and sqlite3 can't bind Decimal, hence float().
+    """
+    return (
+        data['transaction_name'],
+        float(data['transaction_value']),
+        data['account_id'],
+        data['transaction_type'],
+        data['transaction_category'],
+        data['transaction_sub_category'],
+        data['transaction_description'],
+        data['transaction_date'],
+        to_julian_day(data['transaction_date']),
+    )
+
+# Fields kept in _original_data_cache. Each saved row is snapshotted as a tuple in
+# this order rather than a dict copy, which is several times smaller per row.
+_SNAPSHOT_FIELDS = ('transaction_name', 'transaction_value', 'account', 'transaction_type',
+                    'category', 'sub_category', 'transaction_description', 'transaction_date',
+                    'account_id', 'transaction_category', 'transaction_sub_category')
+_SNAPSHOT_INDEX = {key: i for i, key in enumerate(_SNAPSHOT_FIELDS)}
+
+def _snapshot(data):
+    """Return the _SNAPSHOT_FIELDS values of a row as a tuple."""
+    return tuple(data.get(key) for key in _SNAPSHOT_FIELDS)
+
+def _fill_combo(combo, entries):
+    """
+    Replace a combo box's items with (text, user data) pairs in one model insert.
+
+    The rows are swapped inside the combo's own model rather than a new one (the
+    default values dialog shares it), so a rebuild costs one removal and one
+    rowsInserted instead of a round of model signals per addItem.
+    """
+    combo.clear()
+    items = []
+    for text, data in entries:
+        item = QStandardItem(text)
+        item.setData(data, Qt.ItemDataRole.UserRole) # Same role QComboBox.addItem uses for userData
+        items.append(item)
+    if items:
+        combo.model().invisibleRootItem().appendRows(items)
+
+# Everything but digits, '.' and '-', stripped from a value cell's text (currency
+# symbol, separators) in one C-level pass before it is parsed back to a Decimal
+_NON_NUMERIC_RE = re.compile(r'[^\d.\-]')
+
+# Marks the form's category/subcategory dropdowns as needing a rebuild (any real
+# type or category ID, including None, compares unequal to it)
+_NOT_FILTERED = object()
+
+def _debug_combo_items(combo, label):
+    """Print a combo's items and their user data (DROPDOWN debugging only)."""
+    for i in range(combo.count()):
+        data = combo.itemData(i)
+        debug_print('DROPDOWN', f"  {label} item {i}: Name='{combo.itemText(i)}', ID={data} (Type: {type(data)})")
+
+# Accounts (kind 0), categories (1) and subcategories (2) for the dropdowns in one
+# statement. k1/k2 reproduce each table's own ORDER BY within its kind.
+_DROPDOWN_SQL = '''
+    SELECT 0 AS kind, id, account AS name, NULL AS extra, account AS k1, NULL AS k2 FROM bank_accounts
+    UNION ALL
+    SELECT 1, id, category, type, type, category FROM categories
+    UNION ALL
+    SELECT 2, id, sub_category, category_id, category_id, sub_category FROM sub_categories
+    ORDER BY kind, k1, k2
+'''
+
+# Table cell backgrounds, see _cell_background (stylesheet might override parts)
+_COLOR_BASE_EVEN = QColor('#23272e'); _COLOR_BASE_ODD = QColor('#262b33')
+_COLOR_ERROR = QColor('#a94442')
+_COLOR_DIRTY = QColor('#4a4a3a')
+_COLOR_ROW_ERROR_SOFT = QColor('#3c2224')
+_COLOR_ROW_DIRTY_SOFT = QColor('#3a3a2c')
+_COLOR_ROW_PENDING_SOFT = QColor('#263038')
+_COLOR_PLUS_ROW = QColor('#23272e')
+
 class ExpenseTrackerGUI(QMainWindow):
     # Define the columns for the *display* table (match the data we'll fetch)
     # Use the column configuration from column_config.py
     COLS = DB_FIELDS
+    # Column key -> table column index, for constant-time lookups by key
+    _col_of = {key: i for i, key in enumerate(DB_FIELDS)}
 
     def __init__(self):
         super().__init__()
@@ -56,7 +293,8 @@ class ExpenseTrackerGUI(QMainWindow):
         self.dirty = set()
         self.dirty_fields = {}
         self.errors = {}
-        self._original_data_cache = {}
+        self._original_data_cache = {} # rowid -> _snapshot() tuple of the row as loaded
+        self._currency_symbols = {} # account_id -> currency symbol (or None), see _currency_symbol
         self.undo_stack = QUndoStack(self)
         self.last_saved_undo_index = 0
         self.selected_rows = set()
@@ -67,19 +305,26 @@ class ExpenseTrackerGUI(QMainWindow):
         self._accounts_data = []
         self._categories_data = []
         self._subcategories_data = []
+        self._id_conflict_mapping = {}
+        self._build_dropdown_indexes()
+        # What the form's category/subcategory dropdowns were last filtered for
+        self._last_filtered_type = _NOT_FILTERED
+        self._last_filtered_cat_id = _NOT_FILTERED
 
         self._build_ui()
         self._load_dropdown_data() # Load dropdown data first
         self._load_transactions() # Then load transactions
+        # The entry form is filled on the first event-loop turn, so the window and
+        # table show without waiting for the form's combo boxes.
+        # (_load_dropdown_data has already handed the data sources to the delegate.)
+        QTimer.singleShot(0, self._init_form)
+
+    def _init_form(self):
+        """Populate the entry form's dropdowns, then apply the stored defaults to it."""
         self._populate_initial_form_dropdowns() # Populate dropdowns based on loaded data
         # Apply default values to the form inputs on startup
         default_values.apply_to_form(self.form_widgets)
 
-        # Pass data sources to the delegate
-        delegate = self.tbl.itemDelegate()
-        if isinstance(delegate, SpreadsheetDelegate): # Ensure it's the correct type
-            delegate.setEditorDataSources(self._accounts_data, self._categories_data, self._subcategories_data)
-
     def _build_ui(self):
         self.setWindowTitle('Expense Tracker')
         self.resize(1200, 800)
@@ -98,113 +343,7 @@ class ExpenseTrackerGUI(QMainWindow):
         debug_action.triggered.connect(show_debug_menu)
 
         # --- Stylesheet (Simplified Arrow Styling) ---
-        self.setStyleSheet(r'''
-            QMainWindow { background:#23272e; }
-            QWidget, QTableWidget, QDateEdit, QDateEdit QCalendarWidget QWidget {
-                background:#23272e; color:#f3f3f3;
-                font-family:Segoe UI,Arial,sans-serif; font-size:14px; }
-            QLineEdit, QComboBox, QDateEdit {
-                border: 1.5px solid #444;
-                border-radius: 4px;
-                padding: 6px;
-                background: #2d323b;
-                color: #f3f3f3;
-            }
-            QLineEdit:focus, QComboBox:focus, QDateEdit:focus {
-                border: 1.5px solid #4fc3f7;
-            }
-
-            ArrowComboBox:focus {
-                border: 1.5px solid #4fc3f7;
-                outline: none;
-            }
-            QLineEdit[error="true"], QComboBox[error="true"] {
-                border: 2px solid #ff5252;
-                background: #5c2c2c;
-            }
-            QHeaderView::section { background:#23272e; color:#f3f3f3;
-                                   font-weight:bold; border:1px solid #444; padding:6px; }
-            QLineEdit, QComboBox, QDateEdit, QDateEdit QAbstractItemView {
-                background:#2d323b; color:#f3f3f3;
-                border:1px solid #444; border-radius:4px; padding:6px; }
-
-            /* Common styling for all dropdown widgets */
-            QComboBox, QDateEdit {
-                background: #2d323b;
-                color: #f3f3f3;
-                border: 1px solid #444;
-                border-radius: 4px;
-                padding: 6px;
-                padding-right: 15px; /* Minimal padding for the arrow */
-                min-height: 20px;
-            }
-
-            /* Style the dropdown button for standard QComboBox */
-            QComboBox::drop-down, QDateEdit::drop-down {
-                subcontrol-origin: padding;
-                subcontrol-position: top right;
-                width: 12px; /* Minimal width of the clickable area */
-                background: transparent;
-                border: none; /* No border */
-            }
-
-            /* Hide the default down arrow for QComboBox and QDateEdit */
-            QComboBox::down-arrow, QDateEdit::down-arrow {
-                width: 0px;
-                height: 0px;
-                background: transparent;
-            }
-
-            /* Ensure date fields have the same styling as dropdowns */
-            QDateEdit {
-                padding-right: 15px; /* Space for our custom arrow */
-            }
-
-            /* Style the dropdown popup */
-            QComboBox QAbstractItemView, ArrowComboBox QAbstractItemView, QDateEdit QAbstractItemView {
-                background-color: #2d323b;
-                border: 1px solid #555;
-                selection-background-color: #4a6984;
-                padding: 4px;
-                border-radius: 3px;
-            }
-
-            /* Focus styling */
-            QComboBox:focus, ArrowComboBox:focus, QDateEdit:focus {
-                border: 1.5px solid #4fc3f7;
-                outline: none;
-            }
-            QCalendarWidget QToolButton {
-                color: #f3f3f3; background-color: #3a3f4b; border: none; font-weight: bold;
-                icon-size: 18px; padding: 5px; margin: 2px; }
-            QCalendarWidget QMenu { background-color: #2d323b; color: #f3f3f3; }
-            QCalendarWidget QSpinBox { background-color: #2d323b; color: #f3f3f3; border: 1px solid #444; }
-            QCalendarWidget QWidget#qt_calendar_navigationbar { background-color: #23272e; border-bottom: 1px solid #444; }
-            QCalendarWidget QTableView { background-color: #23272e; alternate-background-color: #262b33; selection-background-color: #4a6984; }
-            QCalendarWidget QWidget#qt_calendar_calendarview { border: none; }
-            QPushButton { background:#3a3f4b; color:#f3f3f3;
-                                   border-radius:6px; padding:8px 15px;
-                                   font-weight:bold;
-                                   padding-left: 30px; /* Space on left for icon */
-                                   text-align: left; /* Align text next to icon */
-                                   }
-            QPushButton#fab { /* Specific style for FAB */
-                padding: 0px; padding-left: 0px; text-align: center;
-                background:#4fc3f7; color:#23272e; border-radius:28px;
-                font-size:28px; font-weight:bold;
-            }
-            QPushButton#fab:hover { background:#29b6f6; }
-            QPushButton:hover { background:#4a4f5b; }
-            QPushButton:disabled { background:#444; color:#888; }
-            QTableWidget { gridline-color: #444; }
-            QTableWidget::item { padding: 4px; }
-            QTableWidget::item:selected { background-color: #4a6984; color: #f3f3f3; }
-            QGroupBox { border: 1px solid #444; border-radius: 6px; margin-top: 10px; padding: 10px; }
-            QGroupBox:title { subcontrol-origin: margin; left: 10px; padding: 0 4px 0 4px; color: #81d4fa; font-size: 14px; font-weight: bold; }
-            QToolButton { background-color: #3a3f4b; border-radius: 4px; padding: 4px; }
-            QToolButton:hover { background-color: #4a4f5b; }
-            QToolBar { background-color: #23272e; border: none; spacing: 6px; }
-        ''')
+        self.setStyleSheet(_STYLESHEET)
 
         # --- Form Group ---
         form_group = QGroupBox('Add Transaction')
@@ -275,13 +414,13 @@ class ExpenseTrackerGUI(QMainWindow):
         form_grid.addWidget(self.date_in, 4, 1)
 
         self.add_btn = QPushButton('Add Transaction')
-        self.add_btn.setIcon(QIcon.fromTheme("list-add", QIcon(":/icons/add.png")))
+        self.add_btn.setIcon(_icon("list-add", ":/icons/add.png"))
         self.add_btn.clicked.connect(self._add_form)
         form_grid.addWidget(self.add_btn, 5, 0, 1, 2) # Span 2 columns
 
         # Button to open Default Values dialog
         self.defaults_btn = QPushButton('Defaults')
-        self.defaults_btn.setIcon(QIcon.fromTheme("preferences-system", QIcon(":/icons/settings.png")))
+        self.defaults_btn.setIcon(_icon("preferences-system", ":/icons/settings.png"))
         self.defaults_btn.setToolTip("Set default values for new transactions")
         self.defaults_btn.clicked.connect(self._open_default_values)
         form_grid.addWidget(self.defaults_btn, 5, 2, 1, 2) # Span 2 columns
@@ -298,7 +437,7 @@ class ExpenseTrackerGUI(QMainWindow):
 
         # Edit Transaction button - first in the group for prominence
         self.edit_btn = QPushButton('Edit Transaction')
-        self.edit_btn.setIcon(QIcon.fromTheme("document-properties", QIcon(":/icons/edit.png")))
+        self.edit_btn.setIcon(_icon("document-properties", ":/icons/edit.png"))
         self.edit_btn.setToolTip("Edit the selected transaction in a detailed form")
         self.edit_btn.clicked.connect(self._edit_selected_transaction)
         self.edit_btn.setEnabled(False)  # Disabled until a row is selected
@@ -306,14 +445,14 @@ class ExpenseTrackerGUI(QMainWindow):
 
         # Delete Transaction button
         self.del_btn = QPushButton('Delete')
-        self.del_btn.setIcon(QIcon.fromTheme("edit-delete", QIcon(":/icons/delete.png")))
+        self.del_btn.setIcon(_icon("edit-delete", ":/icons/delete.png"))
         self.del_btn.setToolTip("Delete selected row(s) from the database (Del)")
         self.del_btn.clicked.connect(self._delete_rows)
         data_btn_layout.addWidget(self.del_btn)
 
         # Clear New Rows button
         self.clear_btn = QPushButton('Clear New Rows')
-        self.clear_btn.setIcon(QIcon.fromTheme("edit-clear", QIcon(":/icons/clear.png")))
+        self.clear_btn.setIcon(_icon("edit-clear", ":/icons/clear.png"))
         self.clear_btn.setToolTip("Clear newly added rows that haven't been saved yet.")
         self.clear_btn.clicked.connect(self._clear_pending)
         data_btn_layout.addWidget(self.clear_btn)
@@ -324,7 +463,7 @@ class ExpenseTrackerGUI(QMainWindow):
 
         # Discard Changes button
         self.discard_btn = QPushButton('Discard Changes')
-        self.discard_btn.setIcon(QIcon.fromTheme("document-revert", QIcon(":/icons/revert.png")))
+        self.discard_btn.setIcon(_icon("document-revert", ":/icons/revert.png"))
         self.discard_btn.setToolTip("Discard all unsaved additions and modifications")
         self.discard_btn.setEnabled(False)
         self.discard_btn.clicked.connect(self._discard_changes)
@@ -332,7 +471,7 @@ class ExpenseTrackerGUI(QMainWindow):
 
         # Save Changes button
         self.save_btn = QPushButton('Save Changes')
-        self.save_btn.setIcon(QIcon.fromTheme("document-save", QIcon(":/icons/save.png")))
+        self.save_btn.setIcon(_icon("document-save", ":/icons/save.png"))
         self.save_btn.setToolTip("Save all pending additions and modifications (Ctrl+S)")
         self.save_btn.setEnabled(False)
         self.save_btn.clicked.connect(self._save_changes)
@@ -352,8 +491,11 @@ class ExpenseTrackerGUI(QMainWindow):
         tblbox = QVBoxLayout(frame)
         tblbox.setContentsMargins(0,0,0,0)
 
-        self.tbl = QTableWidget(0, len(self.COLS))
-        self.tbl.setHorizontalHeaderLabels(DISPLAY_TITLES)
+        # The view reads the rows through the model (see TransactionTableModel),
+        # which formats only the cells being painted
+        self.tbl = QTableView()
+        self.tbl_model = TransactionTableModel(self)
+        self.tbl.setModel(self.tbl_model)
 
         # Set column widths based on configuration
         for col_idx, col_field in enumerate(self.COLS):
@@ -373,9 +515,11 @@ class ExpenseTrackerGUI(QMainWindow):
         self.tbl.setSelectionMode(QAbstractItemView.SelectionMode.ExtendedSelection)
 
         # Pass the main window instance (self) to the delegate
-        self.tbl.setItemDelegate(SpreadsheetDelegate(self))
-        self.tbl.cellChanged.connect(self._cell_edited)
-        self.tbl.itemSelectionChanged.connect(self._capture_selection)
+        delegate = SpreadsheetDelegate(self)
+        self.tbl.setItemDelegate(delegate)
+        delegate.attach_to_model(self.tbl_model)
+        self.tbl_model.dataChanged.connect(self._cell_data_changed)
+        self.tbl.selectionModel().selectionChanged.connect(self._capture_selection)
         self.tbl.installEventFilter(self)
 
         copy_shortcut = QShortcut(QKeySequence.StandardKey.Copy, self.tbl, self._copy_selection)
@@ -431,12 +575,7 @@ class ExpenseTrackerGUI(QMainWindow):
         new_text = show_description_dialog(self, current_text)
 
         if new_text is not None:  # None means dialog was canceled
-            # Update the cell text
-            item = self.tbl.item(row, col)
-            if item:
-                # Update the display text (no longer adding [...] indicator)
-                item.setText(new_text if new_text else "")
-
+            if self._row_data(row) is not None:
                 # Update the underlying data
                 if row < len(self.transactions):
                     # Update existing transaction
@@ -450,6 +589,8 @@ class ExpenseTrackerGUI(QMainWindow):
                     pending_idx = row - len(self.transactions)
                     self.pending[pending_idx]['transaction_description'] = new_text
 
+                # Repaint the row with the new text and its dirty state
+                self._recolor_row(row)
                 self._update_button_states()
                 self._show_message("Description updated.", error=False)
 
@@ -479,9 +620,9 @@ class ExpenseTrackerGUI(QMainWindow):
             self._show_message("No transaction data found.", error=True)
             return
 
-        # Make a deep copy of the original data for comparison
-        import copy
-        original_data = copy.deepcopy(transaction_data)
+        # Snapshot the original data for comparison; rows are flat dicts of
+        # immutable scalars (str, int, Decimal), so a shallow copy is enough
+        original_data = dict(transaction_data)
 
         # Show the transaction details dialog
         updated_data = show_transaction_details_dialog(
@@ -507,41 +648,19 @@ class ExpenseTrackerGUI(QMainWindow):
                     debug_print('TRANSACTION_EDIT', f"Directly saving changes for rowid {rowid} to database")
 
                     try:
-                        # Prepare the update query
-                        self.db.conn.execute('''
-                            UPDATE transactions
-                            SET transaction_name=?,
-                                transaction_value=?,
-                                account_id=?,
-                                transaction_type=?,
-                                transaction_category=?,
-                                transaction_sub_category=?,
-                                transaction_description=?,
-                                transaction_date=?
-                            WHERE rowid=?
-                        ''', (
-                            updated_data['transaction_name'],
-                            float(updated_data['transaction_value']),
-                            updated_data['account_id'],
-                            updated_data['transaction_type'],
-                            updated_data['transaction_category'],
-                            updated_data['transaction_sub_category'],
-                            updated_data['transaction_description'],
-                            updated_data['transaction_date'],
-                            rowid
-                        ))
-
-                        # Commit the changes
-                        self.db.conn.commit()
+                        # A single statement autocommits (the connection runs with
+                        # isolation_level=None), so no explicit transaction is needed
+                        self.db.conn.execute(_UPDATE_TRANSACTION_SQL,
+                                             _transaction_params(updated_data) + (rowid,))
 
                         # Update the transaction data in memory
                         self.transactions[row] = updated_data
 
                         # Update the original data cache with the new data
-                        self._original_data_cache[rowid] = copy.deepcopy(updated_data)
+                        self._original_data_cache[rowid] = _snapshot(updated_data)
 
-                        # Refresh the display
-                        self._refresh()
+                        # Only this row changed; repopulate it rather than the whole table
+                        self._refresh_row(row)
                         self._update_button_states()
                         self._show_message("Transaction updated and saved to database.", error=False)
 
@@ -550,44 +669,39 @@ class ExpenseTrackerGUI(QMainWindow):
                         debug_print('TRANSACTION_EDIT', f"Error saving transaction: {e}")
                         self._show_message(f"Error saving transaction: {e}", error=True)
 
-                        # Roll back any changes
-                        if self.db.conn.in_transaction:
-                            self.db.conn.rollback()
-
             elif row - len(self.transactions) < len(self.pending):
                 # For pending transactions, just update the data in memory
                 # These will be saved when the user clicks "Save Changes"
                 pending_idx = row - len(self.transactions)
                 self.pending[pending_idx] = updated_data
 
-                # Refresh the display
-                self._refresh()
+                # Only this row changed; repopulate it rather than the whole table
+                self._refresh_row(row)
                 self._update_button_states()
                 self._show_message("New transaction updated. Don't forget to save changes!", error=False)
 
     def _ensure_uncategorized_subcategories(self):
         """Ensure every category has an UNCATEGORIZED subcategory."""
-        for category in self._categories_data:
-            # Check if this category already has an UNCATEGORIZED subcategory
-            has_uncategorized = False
-            for subcat in self._subcategories_data:
-                if subcat['category_id'] == category['id'] and subcat['name'] == 'UNCATEGORIZED':
-                    has_uncategorized = True
-                    break
-
-            # If not, create one
-            if not has_uncategorized:
-                print(f"Creating UNCATEGORIZED subcategory for category {category['name']} (ID: {category['id']})")
-                subcategory_id = self.db.ensure_subcategory('UNCATEGORIZED', category['id'])
-                if subcategory_id:
-                    # Add to our local data
-                    self._subcategories_data.append({
-                        'id': subcategory_id,
-                        'name': 'UNCATEGORIZED',
-                        'category_id': category['id']
-                    })
-                else:
-                    print(f"Failed to create UNCATEGORIZED subcategory for category {category['name']}")
+        # Category IDs that already have an UNCATEGORIZED subcategory, collected in one pass
+        has_uncategorized = {subcat['category_id'] for subcat in self._subcategories_data
+                             if subcat['name'] == 'UNCATEGORIZED'}
+        # Commit any newly created subcategories together instead of one by one
+        with self.db.bulk_ensure():
+            for category in self._categories_data:
+                # If this category has no UNCATEGORIZED subcategory yet, create one
+                if category['id'] not in has_uncategorized:
+                    print(f"Creating UNCATEGORIZED subcategory for category {category['name']} (ID: {category['id']})")
+                    subcategory_id = self.db.ensure_subcategory('UNCATEGORIZED', category['id'])
+                    if subcategory_id:
+                        # Add to our local data
+                        self._subcategories_data.append({
+                            'id': subcategory_id,
+                            'name': 'UNCATEGORIZED',
+                            'category_id': category['id']
+                        })
+                        has_uncategorized.add(category['id'])
+                    else:
+                        print(f"Failed to create UNCATEGORIZED subcategory for category {category['name']}")
 
     def _load_dropdown_data(self):
         """Load data needed for dropdowns (accounts, categories, etc.)."""
@@ -595,6 +709,7 @@ class ExpenseTrackerGUI(QMainWindow):
         self._accounts_data = []
         self._categories_data = []
         self._subcategories_data = []
+        self._currency_symbols = {}
 
         # CRITICAL FIX: Create a mapping of ID conflicts
         # This ensures that category ID 1 is always treated as UNCATEGORIZED, not Bank of America
@@ -612,16 +727,17 @@ class ExpenseTrackerGUI(QMainWindow):
         }
 
         try:
-            cur = self.db.conn.cursor()
-            cur.execute("SELECT id, account FROM bank_accounts ORDER BY account")
-            self._accounts_data = [{'id': row[0], 'name': row[1]} for row in cur.fetchall()]
+            rows_by_kind = ([], [], [])
+            for row in self.db.conn.execute(_DROPDOWN_SQL):
+                rows_by_kind[row[0]].append(row)
+
+            self._accounts_data = [{'id': row[1], 'name': row[2]} for row in rows_by_kind[0]]
 
             # Load categories with ID conflict detection
-            cur.execute("SELECT id, category, type FROM categories ORDER BY type, category")
-            for row in cur.fetchall():
-                category_id = row[0]
-                category_name = row[1]
-                category_type = row[2]
+            for row in rows_by_kind[1]:
+                category_id = row[1]
+                category_name = row[2]
+                category_type = row[3]
 
                 # Check for ID conflicts
                 if category_id in self._seen_ids['category']:
@@ -646,11 +762,10 @@ class ExpenseTrackerGUI(QMainWindow):
                 })
 
             # Load subcategories with ID conflict detection
-            cur.execute("SELECT id, sub_category, category_id FROM sub_categories ORDER BY category_id, sub_category")
-            for row in cur.fetchall():
-                subcategory_id = row[0]
-                subcategory_name = row[1]
-                category_id = row[2]
+            for row in rows_by_kind[2]:
+                subcategory_id = row[1]
+                subcategory_name = row[2]
+                category_id = row[3]
 
                 # Check for ID conflicts
                 if subcategory_id in self._seen_ids['sub_category']:
@@ -678,6 +793,11 @@ class ExpenseTrackerGUI(QMainWindow):
             self._categories_data = []
             self._subcategories_data = []
 
+        self._build_dropdown_indexes()
+        # The form dropdowns were filled from the old data; rebuild them on next filter
+        self._last_filtered_type = _NOT_FILTERED
+        self._last_filtered_cat_id = _NOT_FILTERED
+
         # Ensure the delegate's data sources are updated after any changes
         if hasattr(self.tbl, 'itemDelegate'):
             delegate = self.tbl.itemDelegate()
@@ -687,19 +807,55 @@ class ExpenseTrackerGUI(QMainWindow):
                     self._categories_data,
                     self._subcategories_data
                 )
+                delegate.set_conflict_map(self._id_conflict_mapping)
+        # Names and currencies shown in the table may have changed
+        self.tbl_model.refresh_all()
+
+    def _build_dropdown_indexes(self):
+        """
+        Index the dropdown data by ID, name and parent for the form and row lookups.
+
+        Rebuilt by _load_dropdown_data only. Where IDs or names repeat, the first
+        entry wins, as with the linear scans these replace. Also stores each
+        category's and subcategory's 'display_name' (its name after the ID
+        conflict mapping), so the form filters don't consult the mapping per item.
+        """
+        cat_conflicts = self._id_conflict_mapping.get('category', {})
+        subcat_conflicts = self._id_conflict_mapping.get('sub_category', {})
+        self._acct_by_id = {}
+        self._acct_by_name = {}
+        for acc in self._accounts_data:
+            self._acct_by_id.setdefault(acc['id'], acc)
+            self._acct_by_name.setdefault(acc['name'], acc)
+        self._cat_by_id = {}
+        self._cat_name_to_id = {}
+        self._cats_by_type = defaultdict(list) # type -> categories, in load order
+        for cat in self._categories_data:
+            cat['display_name'] = cat_conflicts.get(cat['id'], cat['name'])
+            self._cat_by_id.setdefault(cat['id'], cat)
+            self._cat_name_to_id.setdefault(cat['name'], cat['id'])
+            self._cats_by_type[cat['type']].append(cat)
+        self._subcats_by_category_id = defaultdict(list) # category ID -> subcategories
+        for subcat in self._subcategories_data:
+            subcat['display_name'] = subcat_conflicts.get(subcat['id'], subcat['name'])
+            self._subcats_by_category_id[subcat['category_id']].append(subcat)
+
+    def _add_subcategory_data(self, subcategory_id, category_id, name='UNCATEGORIZED'):
+        """Record a subcategory created on the fly in the dropdown data and its index."""
+        subcat = {'id': subcategory_id, 'name': name, 'category_id': category_id,
+                  'display_name': self._id_conflict_mapping.get('sub_category', {}).get(subcategory_id, name)}
+        self._subcategories_data.append(subcat)
+        self._subcats_by_category_id[category_id].append(subcat)
 
     def _populate_initial_form_dropdowns(self):
         """Populate form dropdowns initially after data is loaded."""
-        # Populate accounts
-        self.account_in.clear()
+        # Populate accounts (ID stored in userData)
         debug_print('DROPDOWN', "--- Populating Accounts Dropdown ---")
-        for i, acc in enumerate(self._accounts_data):
-            # Debug Print for dropdown population
-            debug_print('DROPDOWN', f"Adding item {i}: Name='{acc['name']}', ID={acc['id']} (Type: {type(acc['id'])})")
-            self.account_in.addItem(acc['name'], userData=acc['id']) # Store ID in userData
-            # Verification Print
-            added_data = self.account_in.itemData(i)
-            debug_print('DROPDOWN', f"  > Verified itemData({i}): {added_data} (Type: {type(added_data)})")
+        _fill_combo(self.account_in, ((acc['name'], acc['id']) for acc in self._accounts_data))
+        # Checked once per rebuild: the per-item listing is skipped entirely
+        # unless DROPDOWN debugging is on
+        if debug_config.is_enabled('DROPDOWN'):
+            _debug_combo_items(self.account_in, "Account")
         debug_print('DROPDOWN', "--- Accounts Populated ---")
 
         if not self._accounts_data:
@@ -715,32 +871,27 @@ class ExpenseTrackerGUI(QMainWindow):
     def _filter_categories_for_form(self):
         """Filters the category dropdown based on the selected transaction type."""
         selected_type = self.type_in.currentText()
+        if selected_type == self._last_filtered_type:
+            return # Already showing this type's categories
+        self._last_filtered_type = selected_type
         current_category_id = self.cat_in.currentData() # Get previously stored ID if any
 
-        debug_print('DROPDOWN', f"--- Filtering Categories for Type: {selected_type} ---")
+        debug_print('DROPDOWN', "--- Filtering Categories for Type: %s ---", selected_type)
         self.cat_in.blockSignals(True)
-        self.cat_in.clear()
         found_current = False
         default_index = -1
-        for i, cat in enumerate(self._categories_data):
-            if cat['type'] == selected_type:
-                # Check if this category ID has a conflict mapping
-                display_name = cat['name']
-                if cat['id'] in self._id_conflict_mapping.get('category', {}):
-                    display_name = self._id_conflict_mapping['category'][cat['id']]
-                    debug_print('DROPDOWN', f"  Using conflict mapping for category ID {cat['id']}: '{display_name}' instead of '{cat['name']}'")
-
-                # Debug Print for category dropdown
-                debug_print('DROPDOWN', f"  Adding Cat item {self.cat_in.count()}: Name='{display_name}', ID={cat['id']} (Type: {type(cat['id'])})")
-                self.cat_in.addItem(display_name, userData=cat['id'])
-                # Verification Print
-                added_data = self.cat_in.itemData(self.cat_in.count() - 1)
-                debug_print('DROPDOWN', f"    > Verified itemData({self.cat_in.count() - 1}): {added_data} (Type: {type(added_data)})")
-
-                if cat['id'] == current_category_id:
-                    found_current = True
-                if cat['name'] == 'UNCATEGORIZED':
-                    default_index = self.cat_in.count() - 1
+        entries = []
+        for cat in self._cats_by_type.get(selected_type, ()):
+            # display_name already has the ID conflict mapping applied
+            entries.append((cat['display_name'], cat['id']))
+
+            if cat['id'] == current_category_id:
+                found_current = True
+            if cat['name'] == 'UNCATEGORIZED':
+                default_index = len(entries) - 1
+        _fill_combo(self.cat_in, entries)
+        if debug_config.is_enabled('DROPDOWN'):
+            _debug_combo_items(self.cat_in, "Cat")
 
         # Restore selection or set default
         restored_idx = -1
@@ -755,7 +906,7 @@ class ExpenseTrackerGUI(QMainWindow):
             self.cat_in.setCurrentIndex(0)
         else:
             self.cat_in.setPlaceholderText(f"No {selected_type} Categories")
-        debug_print('DROPDOWN', f"--- Categories Filtered. Selected index: {restored_idx} ---")
+        debug_print('DROPDOWN', "--- Categories Filtered. Selected index: %s ---", restored_idx)
 
         self.cat_in.blockSignals(False)
         # Must trigger subcategory filter AFTER potentially changing category index
@@ -764,34 +915,29 @@ class ExpenseTrackerGUI(QMainWindow):
     def _filter_subcategories_for_form(self):
         """Filters the subcategory dropdown based on the selected category."""
         selected_category_id = self.cat_in.currentData() # Get ID from category dropdown
+        if selected_category_id == self._last_filtered_cat_id:
+            return # Already showing this category's subcategories
+        self._last_filtered_cat_id = selected_category_id
         current_subcategory_id = self.subcat_in.currentData() # Get previously stored ID if any
 
-        debug_print('DROPDOWN', f"--- Filtering SubCats for Category ID: {selected_category_id} ---")
+        debug_print('DROPDOWN', "--- Filtering SubCats for Category ID: %s ---", selected_category_id)
         self.subcat_in.blockSignals(True)
-        self.subcat_in.clear()
         found_current = False
         default_index = -1
+        entries = []
 
         if selected_category_id is not None:
-            for i, subcat in enumerate(self._subcategories_data):
-                if subcat['category_id'] == selected_category_id:
-                    # Check if this subcategory ID has a conflict mapping
-                    display_name = subcat['name']
-                    if subcat['id'] in self._id_conflict_mapping.get('sub_category', {}):
-                        display_name = self._id_conflict_mapping['sub_category'][subcat['id']]
-                        debug_print('DROPDOWN', f"  Using conflict mapping for subcategory ID {subcat['id']}: '{display_name}' instead of '{subcat['name']}'")
-
-                    # Debug Print for subcategory dropdown
-                    debug_print('DROPDOWN', f"  Adding SubCat item {self.subcat_in.count()}: Name='{display_name}', ID={subcat['id']} (Type: {type(subcat['id'])})")
-                    self.subcat_in.addItem(display_name, userData=subcat['id'])
-                    # Verification Print
-                    added_data = self.subcat_in.itemData(self.subcat_in.count() - 1)
-                    debug_print('DROPDOWN', f"    > Verified itemData({self.subcat_in.count() - 1}): {added_data} (Type: {type(added_data)})")
-
-                    if subcat['id'] == current_subcategory_id:
-                        found_current = True
-                    if subcat['name'] == 'UNCATEGORIZED':
-                         default_index = self.subcat_in.count() - 1
+            for subcat in self._subcats_by_category_id.get(selected_category_id, ()):
+                # display_name already has the ID conflict mapping applied
+                entries.append((subcat['display_name'], subcat['id']))
+
+                if subcat['id'] == current_subcategory_id:
+                    found_current = True
+                if subcat['name'] == 'UNCATEGORIZED':
+                     default_index = len(entries) - 1
+        _fill_combo(self.subcat_in, entries)
+        if debug_config.is_enabled('DROPDOWN'):
+            _debug_combo_items(self.subcat_in, "SubCat")
 
         # Restore selection or set default
         restored_idx = -1
@@ -806,16 +952,50 @@ class ExpenseTrackerGUI(QMainWindow):
             self.subcat_in.setCurrentIndex(0)
         else:
             self.subcat_in.setPlaceholderText("No Subcategories")
-        debug_print('DROPDOWN', f"--- Subcategories Filtered. Selected index: {restored_idx} ---")
+        debug_print('DROPDOWN', "--- Subcategories Filtered. Selected index: %s ---", restored_idx)
 
         self.subcat_in.blockSignals(False)
 
-    def _get_category_id(self, category_name):
-        for cat in self._categories_data:
-            if cat['name'] == category_name:
-                return cat['id']
+    def _row_data(self, row):
+        """Return the live data dict behind a table row (saved or pending), or None."""
+        num_transactions = len(self.transactions)
+        if 0 <= row < num_transactions:
+            return self.transactions[row]
+        pending_idx = row - num_transactions
+        if 0 <= pending_idx < len(self.pending):
+            return self.pending[pending_idx]
         return None
 
+    def _currency_symbol(self, account_id):
+        """
+        Return the currency symbol of an account, or None if it has no currency.
+
+        Looked up once per account rather than once per value cell; the cache is
+        cleared whenever accounts or transactions are reloaded.
+        """
+        try:
+            return self._currency_symbols[account_id]
+        except KeyError:
+            currency_info = self.db.get_account_currency(account_id)
+            symbol = currency_info.get('currency_symbol') if currency_info else None
+            self._currency_symbols[account_id] = symbol
+            return symbol
+
+    def _original_value(self, rowid, key):
+        """Return a field of a saved row as last loaded from the database, or None."""
+        snapshot = self._original_data_cache.get(rowid)
+        index = _SNAPSHOT_INDEX.get(key)
+        if snapshot is None or index is None:
+            return None
+        return snapshot[index]
+
+    def _original_row(self, rowid):
+        """Return the snapshot of a saved row as a dict (empty if not cached)."""
+        snapshot = self._original_data_cache.get(rowid)
+        if snapshot is None:
+            return {}
+        return dict(zip(_SNAPSHOT_FIELDS, snapshot))
+
     def _load_transactions(self, refresh_ui=True):
         """Load transactions from the database and update internal state."""
         cur=self.db.conn.cursor()
@@ -839,7 +1019,7 @@ class ExpenseTrackerGUI(QMainWindow):
                 LEFT JOIN bank_accounts ba ON t.account_id = ba.id
                 LEFT JOIN categories c ON t.transaction_category = c.id
                 LEFT JOIN sub_categories sc ON t.transaction_sub_category = sc.id
-                ORDER BY t.transaction_date DESC, t.id DESC
+                ORDER BY t.transaction_date_jd DESC, t.id DESC
             """)
         except sqlite3.Error as e:
              # Handle potential errors more gracefully
@@ -851,43 +1031,47 @@ class ExpenseTrackerGUI(QMainWindow):
 
         self.transactions = [] # Renamed from self.expenses
         self._original_data_cache = {} # Clear cache
+        self._currency_symbols = {} # Re-read account currencies with the transactions
         # Define the keys corresponding to the SELECT statement order
         # Reverted to original column names
         data_keys = ['rowid', 'transaction_name', 'transaction_value', 'account', 'transaction_type', 'category', 'sub_category', 'transaction_description', 'transaction_date', 'account_id', 'transaction_category', 'transaction_sub_category']
 
         fetched_data = cur.fetchall() if cur else []
+        acct_by_name = self._acct_by_name
 
         for r in fetched_data:
             rowid = r[0] # Use the first column (t.id) as the rowid
-            # Map fetched data using data_keys
+            # Map fetched data using data_keys (every key is present, one per SELECT column)
             data = dict(zip(data_keys, r))
 
             # Convert transaction_value to Decimal for proper formatting
-            if 'transaction_value' in data and data['transaction_value'] is not None:
-                data['transaction_value'] = Decimal(str(data['transaction_value']))
+            value = data['transaction_value']
+            if value is not None and type(value) is not Decimal:
+                data['transaction_value'] = Decimal(str(value))
 
             # Ensure account_id is available for currency display
-            if 'account' in data and isinstance(data['account'], str):
+            if isinstance(data['account'], str):
                 # Make sure account_id is an integer
-                if 'account_id' in data and data['account_id'] is not None:
+                if data['account_id'] is not None:
                     try:
                         data['account_id'] = int(data['account_id'])
-                        debug_print('ACCOUNT_CONVERSION', f"Converted account_id to int: {data['account_id']} for account {data['account']}")
+                        debug_print('ACCOUNT_CONVERSION', "Converted account_id to int: %s for account %s", data['account_id'], data['account'])
                     except (ValueError, TypeError):
                         # If account_id is not a valid integer, try to find it from account name
                         data['account_id'] = None
 
                 # If account_id is still None or not set, try to find it from account name
-                if not data.get('account_id'):
-                    for acc in self._accounts_data:
-                        if acc['name'] == data['account']:
-                            data['account_id'] = acc['id']
-                            break
+                if not data['account_id']:
+                    acc = acct_by_name.get(data['account'])
+                    if acc is not None:
+                        data['account_id'] = acc['id']
 
             # Ensure rowid is stored explicitly if needed elsewhere (though data['id'] covers it)
             # data['rowid'] = rowid # Reverted - 'rowid' is now the first key in data_keys
             self.transactions.append(data)
-            self._original_data_cache[rowid] = data.copy()
+            self._original_data_cache[rowid] = _snapshot(data)
+            # Fixed up after the snapshot, so a repaired category still counts as loaded
+            self._repair_row(data)
 
         self.pending.clear()
         self.dirty.clear()
@@ -978,18 +1162,27 @@ class ExpenseTrackerGUI(QMainWindow):
         else:
             self._show_message('Failed to add transaction.', error=True)
 
+    def _cell_data_changed(self, top_left, bottom_right, roles=()):
+        """Run _cell_edited for cells whose stored value changed (dataChanged with EditRole)."""
+        # Repaints (refresh_row/refresh_all) carry no roles and are not edits
+        if Qt.ItemDataRole.EditRole not in roles:
+            return
+        for row in range(top_left.row(), bottom_right.row() + 1):
+            for col in range(top_left.column(), bottom_right.column() + 1):
+                self._cell_edited(row, col)
+
     def _cell_edited(self, row, col):
-        # This signal is emitted *after* the data in the model has changed.
-        # The Undo/Redo command system now handles updating the *underlying* data structures
+        # Called *after* a CellEditCommand has changed the data (on redo and undo alike).
+        # The Undo/Redo command system handles updating the *underlying* data structures
         # (self.transactions, self.pending) and the dirty/error state based on the command's redo/undo.
 
-        # Check if the account column was edited (col 2)
-        if col == 2:  # Account column
+        # Check if the account column was edited
+        if col == self._col_of['account']:
             # Update the currency display for the transaction value
             self._update_currency_display_for_row(row)
 
-        # Check if the category column was edited (col 4)
-        if col == 4:  # Category column
+        # Check if the category column was edited
+        if col == self._col_of['category']:
             # Get the current row data
             row_data = None
             if row < len(self.transactions):
@@ -998,13 +1191,10 @@ class ExpenseTrackerGUI(QMainWindow):
                 row_data = self.pending[row - len(self.transactions)]
 
             # SPECIAL CASE: Handle the Bank of America vs UNCATEGORIZED conflict
-            if row_data and row_data.get('category_id') == 1:
-                # Force the display to show UNCATEGORIZED
-                item = self.tbl.item(row, col)
-                if item and item.text() != 'UNCATEGORIZED':
-                    debug_print('CATEGORY', f"_cell_edited: Forcing display of UNCATEGORIZED for category_id=1 in row {row}")
-                    item.setText('UNCATEGORIZED')
-                    row_data['category'] = 'UNCATEGORIZED'
+            # (the cell already shows UNCATEGORIZED through the conflict mapping)
+            if row_data and row_data.get('category_id') == 1 and row_data.get('category') != 'UNCATEGORIZED':
+                debug_print('CATEGORY', f"_cell_edited: Forcing UNCATEGORIZED for category_id=1 in row {row}")
+                row_data['category'] = 'UNCATEGORIZED'
 
         # We need to ensure recoloring and button states are updated.
         self._recolor_row(row)
@@ -1017,80 +1207,41 @@ class ExpenseTrackerGUI(QMainWindow):
 
     def _update_currency_display_for_row(self, row):
         """Update the currency display for a specific row when the account changes."""
-        # Get the account name from the table
-        account_item = self.tbl.item(row, 2)  # Column 2 is Account
-        if not account_item or not account_item.text():
+        row_data = self._row_data(row)
+        if row_data is None:
+            return
+        account = row_data.get('account')
+        if not account:
             return
 
-        account_text = account_item.text()
-
-        # Check if the account text is an ID instead of a name
+        # Check if the account holds an ID instead of a name
         try:
-            # If the text is a number, it might be an ID
-            account_id = int(account_text)
+            # If it is a number, it might be an ID
+            account_id = int(account)
             # Find the account name for this ID
-            account_name = None
-            for acc in self._accounts_data:
-                if acc['id'] == account_id:
-                    account_name = acc['name']
-                    # Update the account cell with the name instead of ID
-                    account_item.setText(account_name)
-                    break
-
-            if not account_name:
+            acc = self._acct_by_id.get(account_id)
+            if acc is None:
                 return
+            account_name = acc['name']
         except (ValueError, TypeError):
             # If it's not a number, assume it's already the account name
-            account_name = account_text
+            account_name = account
             # Find the account_id for this account name
-            account_id = None
-            for acc in self._accounts_data:
-                if acc['name'] == account_name:
-                    account_id = acc['id']
-                    break
+            acc = self._acct_by_name.get(account_name)
+            account_id = acc['id'] if acc is not None else None
 
         if not account_id:
             return
 
         # Get the currency for this account
-        currency_info = self.db.get_account_currency(account_id)
-        if not currency_info or 'currency_symbol' not in currency_info:
-            return
-
-        # Get the current value from the table
-        value_item = self.tbl.item(row, 1)  # Column 1 is Value
-        if not value_item:
+        if self._currency_symbol(account_id) is None:
             return
 
-        # Get the current value as a Decimal
-        try:
-            # Try to extract just the numeric part from the display text
-            display_text = value_item.text()
-            # Remove any currency symbols or non-numeric characters except decimal point
-            numeric_text = ''.join(c for c in display_text if c.isdigit() or c == '.' or c == '-')
-            if not numeric_text:
-                numeric_text = "0.00"
-            value = Decimal(numeric_text)
-        except (InvalidOperation, ValueError):
-            value = Decimal("0.00")
-
-        # Format with the currency symbol
-        formatted_value = self.locale.toString(float(value), 'f', 2)
-        display_text = f"{currency_info['currency_symbol']} {formatted_value}"
-
-        # Update the table cell
-        value_item.setText(display_text)
-
-        # Also update the underlying data
-        num_transactions = len(self.transactions)
-        if row < num_transactions:
-            self.transactions[row]['account'] = account_name
-            self.transactions[row]['account_id'] = account_id
-        else:
-            pending_idx = row - num_transactions
-            if pending_idx < len(self.pending):
-                self.pending[pending_idx]['account'] = account_name
-                self.pending[pending_idx]['account_id'] = account_id
+        # Update the underlying data; the value cell's text is built from
+        # account_id (see _cell_text), so repainting the row shows the new symbol
+        row_data['account'] = account_name
+        row_data['account_id'] = account_id
+        self.tbl_model.refresh_row(row)
 
     def _add_blank_row(self, focus_col=0):
         # --- Initialize Base Structure --- #
@@ -1116,10 +1267,9 @@ class ExpenseTrackerGUI(QMainWindow):
         # --- Populate Names based on IDs (after defaults applied) ---
         # Account Name
         if new_row_data.get('account_id') is not None:
-            for acc in self._accounts_data:
-                if acc['id'] == new_row_data['account_id']:
-                    new_row_data['account'] = acc['name']
-                    break
+            acc = self._acct_by_id.get(new_row_data['account_id'])
+            if acc is not None:
+                new_row_data['account'] = acc['name']
         elif self._accounts_data: # If no default ID, use first account as fallback?
              new_row_data['account_id'] = self._accounts_data[0]['id']
              new_row_data['account'] = self._accounts_data[0]['name']
@@ -1133,14 +1283,14 @@ class ExpenseTrackerGUI(QMainWindow):
                 new_row_data['category'] = 'UNCATEGORIZED'
                 debug_print('CATEGORY', f"_add_blank_row: Forcing category name to UNCATEGORIZED for category_id=1")
             else:
-                for cat in self._categories_data:
-                    if cat['id'] == new_row_data['category_id'] and cat['type'] == current_type:
+                for cat in self._cats_by_type.get(current_type, ()):
+                    if cat['id'] == new_row_data['category_id']:
                         new_row_data['category'] = cat['name']
                         break
             # If ID is invalid for type, try finding UNCATEGORIZED for the type
             if not new_row_data.get('category'):
-                 for cat in self._categories_data:
-                      if cat['name'] == 'UNCATEGORIZED' and cat['type'] == current_type:
+                 for cat in self._cats_by_type.get(current_type, ()):
+                      if cat['name'] == 'UNCATEGORIZED':
                            new_row_data['category_id'] = cat['id']
                            new_row_data['category'] = cat['name']
                            break
@@ -1148,14 +1298,14 @@ class ExpenseTrackerGUI(QMainWindow):
         # Subcategory Name (depends on Category)
         current_cat_id = new_row_data.get('category_id')
         if current_cat_id is not None and new_row_data.get('sub_category_id') is not None:
-            for subcat in self._subcategories_data:
-                if subcat['id'] == new_row_data['sub_category_id'] and subcat['category_id'] == current_cat_id:
+            for subcat in self._subcats_by_category_id.get(current_cat_id, ()):
+                if subcat['id'] == new_row_data['sub_category_id']:
                     new_row_data['sub_category'] = subcat['name']
                     break
             # If ID is invalid for category, try finding UNCATEGORIZED for the category
             if not new_row_data['sub_category']:
-                 for subcat in self._subcategories_data:
-                      if subcat['name'] == 'UNCATEGORIZED' and subcat['category_id'] == current_cat_id:
+                 for subcat in self._subcats_by_category_id.get(current_cat_id, ()):
+                      if subcat['name'] == 'UNCATEGORIZED':
                            new_row_data['sub_category_id'] = subcat['id']
                            new_row_data['sub_category'] = subcat['name']
                            break
@@ -1193,75 +1343,25 @@ class ExpenseTrackerGUI(QMainWindow):
                  pass
 
 
-        self.pending.append(new_row_data)
-        self._refresh()
-
+        self._repair_row(new_row_data)
+        # Inserted as one row ahead of the '+' row; the rest of the table is untouched
+        self.tbl_model.append_pending(new_row_data)
         new_row_index = len(self.transactions) + len(self.pending) - 1
+        self._update_button_states()
+
         if new_row_index >= 0 and focus_col >= 0: # Only focus if focus_col is valid
             # Ensure the new row is visible and selected
-            self.tbl.scrollToItem(self.tbl.item(new_row_index, 0), QAbstractItemView.ScrollHint.EnsureVisible)
-            self.tbl.setCurrentCell(new_row_index, focus_col)
+            new_index = self.tbl_model.index(new_row_index, focus_col)
+            self.tbl.scrollTo(new_index, QAbstractItemView.ScrollHint.EnsureVisible)
+            self.tbl.setCurrentIndex(new_index)
 
         # Print the table contents to the terminal
         self._debug_print_table()
 
     def _recolor_row(self, row):
-        if row < 0 or row >= self.tbl.rowCount(): return # Added bounds check
-        self.tbl.blockSignals(True) # Prevent cellChanged from firing during recoloring
-
-        color_text = QColor('#f3f3f3')
-        color_base_even = QColor('#23272e'); color_base_odd = QColor('#262b33')
-        color_pending = QColor('#2a3949'); color_dirty = QColor('#4a4a3a')
-        color_error = QColor('#a94442')
-        color_row_error_soft = QColor('#3c2224') # Darker red background
-        color_row_dirty_soft = QColor('#3a3a2c') # Darker yellow/brown background for dirty rows
-        color_row_pending_soft = QColor('#263038') # Darker blue background for pending rows
-        color_plus_row = QColor('#23272e')
-
-        num_transactions = len(self.transactions)
-        num_pending = len(self.pending)
-        empty_row_index = num_transactions + num_pending
-
-        row_has_error = row in self.errors and bool(self.errors[row])
-        row_is_dirty_or_pending = False
-        rowid = None
-        base_bg = color_base_even if row % 2 == 0 else color_base_odd
-        row_base_color = base_bg
-
-        if row < num_transactions: # Existing transaction row
-            rowid = self.transactions[row].get('rowid')
-            if rowid in self.dirty: row_is_dirty_or_pending = True
-            if row_has_error: row_base_color = color_row_error_soft
-            elif row_is_dirty_or_pending: row_base_color = color_row_dirty_soft
-            else: row_base_color = base_bg
-        elif row < empty_row_index: # Pending row
-            rowid = None # Pending rows don't have a rowid yet
-            row_is_dirty_or_pending = True # Pending rows are always considered "changed"
-            if row_has_error: row_base_color = color_row_error_soft
-            else: row_base_color = color_row_pending_soft
-        elif row == empty_row_index: # '+' row
-             row_base_color = color_plus_row
-        else:
-            self.tbl.blockSignals(False); return # Should not happen if rowCount is correct
-
-        field_errors = self.errors.get(row, {})
-        dirty_fields_set = self.dirty_fields.get(rowid, set()) if rowid else set()
-
-        for c, key in enumerate(self.COLS):
-            item = self.tbl.item(row, c)
-            if item:
-                cell_bg = row_base_color
-                # Apply error color only if the specific cell has an error
-                if key in field_errors: cell_bg = color_error
-                # Apply dirty color only if the specific cell is marked as dirty AND the row isn't errored
-                elif rowid and key in dirty_fields_set and not row_has_error: cell_bg = color_dirty
-
-                item.setBackground(cell_bg)
-                # Ensure foreground color is consistent across cells in the row
-                item.setForeground(color_text)
-                # Item flags are set during _refresh
-
-        self.tbl.blockSignals(False) # Re-enable signals
+        """Repaint a row after its dirty, error or pending state changed."""
+        # Colours come from _cell_background when the view repaints the row
+        self.tbl_model.refresh_row(row)
 
     def _ensure_category(self, category):
         if not category: return False
@@ -1273,7 +1373,6 @@ class ExpenseTrackerGUI(QMainWindow):
             cur.execute('SELECT id FROM categories WHERE category=?', (category,))
             if not cur.fetchone():
                 cur.execute('INSERT INTO categories (category) VALUES (?)', (category,))
-                self.db.conn.commit()
                 self._show_message(f"Category '{category}' added.", error=False)
                 # Reload categories in the background to update the combobox options
                 QTimer.singleShot(0, self._load_categories)
@@ -1282,11 +1381,13 @@ class ExpenseTrackerGUI(QMainWindow):
             # Avoid flooding messages for the same error
             if not str(self._message.text()).startswith(f"DB Error ensuring category"):
                  self._show_message(f"DB Error ensuring category '{category}': {e}", error=True)
-            self.db.conn.rollback()
             return False
 
     def _get_category_id(self, category):
         if not category: return None
+        category_id = self._cat_name_to_id.get(category)
+        if category_id is not None:
+            return category_id
         try:
             cur = self.db.conn.cursor()
             cur.execute('SELECT id FROM categories WHERE category=?', (category,))
@@ -1608,16 +1709,7 @@ class ExpenseTrackerGUI(QMainWindow):
                             self.errors[row_idx_visual]['sub_category'] = "Sub-category ID is missing"
                         valid_data = None
                     else:
-                        inserts_to_execute.append((
-                            valid_data['transaction_name'],
-                            float(valid_data['transaction_value']),
-                            valid_data['account_id'],
-                            valid_data['transaction_type'],
-                            valid_data['transaction_category'],
-                            valid_data['transaction_sub_category'],
-                            valid_data['transaction_description'],
-                            valid_data['transaction_date']
-                        ))
+                        inserts_to_execute.append(_transaction_params(valid_data))
                         pending_rows_that_passed_validation_indices.add(i)
                 else:
                     pending_rows_that_failed_validation_indices.append(i)
@@ -1641,17 +1733,7 @@ class ExpenseTrackerGUI(QMainWindow):
                             valid_data = None # Mark as invalid
 
                     if valid_data:
-                        updates_to_execute.append((
-                            valid_data['transaction_name'],
-                            float(valid_data['transaction_value']),
-                            valid_data['account_id'],  # Include account_id for updates
-                            valid_data['transaction_type'],  # Include transaction_type for updates
-                            valid_data['transaction_category'],
-                            valid_data['transaction_sub_category'],  # Include sub_category for updates
-                            valid_data['transaction_description'],
-                            valid_data['transaction_date'],
-                            rowid # rowid for WHERE clause
-                        ))
+                        updates_to_execute.append(_transaction_params(valid_data) + (rowid,)) # rowid for WHERE clause
                         dirty_rowids_that_passed_validation.add(rowid)
                     else:
                         dirty_rowids_that_failed_validation.add(rowid)
@@ -1669,25 +1751,12 @@ class ExpenseTrackerGUI(QMainWindow):
             # --- Phase 2: Attempt to commit valid changes ---
             if inserts_to_execute or updates_to_execute:
                  self.db.conn.execute('BEGIN')
-                 if inserts_to_execute:
-                     self.db.conn.executemany('''
-                         INSERT INTO transactions(
-                             transaction_name, transaction_value, account_id,
-                             transaction_type, transaction_category,
-                             transaction_sub_category, transaction_description, transaction_date
-                         )
-                         VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-                     ''', inserts_to_execute) # Updated to include all required columns
-
-                 if updates_to_execute:
-                     self.db.conn.executemany('''
-                         UPDATE transactions
-                            SET transaction_name=?, transaction_value=?, account_id=?, transaction_type=?,
-                                transaction_category=?, transaction_sub_category=?, transaction_description=?, transaction_date=?
-                          WHERE rowid=?
-                     ''', updates_to_execute) # Updated to include all columns
-
-                 self.db.conn.commit()
+                 with self.db.conn:
+                     if inserts_to_execute:
+                         self.db.conn.executemany(_INSERT_TRANSACTION_SQL, inserts_to_execute)
+
+                     if updates_to_execute:
+                         self.db.conn.executemany(_UPDATE_TRANSACTION_SQL, updates_to_execute)
                  commit_successful = True
                  self.last_saved_undo_index = self.undo_stack.index()
                  self.undo_stack.setClean() # Mark stack as clean after successful save
@@ -1695,8 +1764,6 @@ class ExpenseTrackerGUI(QMainWindow):
         except sqlite3.Error as e:
             db_error_occurred = True
             commit_successful = False
-            if self.db.conn.in_transaction:
-                 self.db.conn.rollback()
 
             # Combine validation errors with the DB error message
             db_error_state_to_restore = validation_errors.copy()
@@ -1838,9 +1905,9 @@ class ExpenseTrackerGUI(QMainWindow):
             self.undo_stack.clear()
             self.last_saved_undo_index = 0 # Reset saved index
 
-    def _capture_selection(self):
+    def _capture_selection(self, *args):
         # Store just the row indices of selected items
-        selected_rows_indices = {idx.row() for idx in self.tbl.selectedIndexes()}
+        selected_rows_indices = {idx.row() for idx in self.tbl.selectionModel().selectedIndexes()}
         self.selected_rows = selected_rows_indices
         self._update_button_states() # Update delete button state based on selection
 
@@ -1889,11 +1956,12 @@ class ExpenseTrackerGUI(QMainWindow):
         # Delete saved rows from the database
         if saved_rowids_to_delete:
             try:
-                self.db.conn.execute('BEGIN')
                 placeholders = ','.join('?' * len(saved_rowids_to_delete))
-                cursor = self.db.conn.execute(f'DELETE FROM transactions WHERE rowid IN ({placeholders})', saved_rowids_to_delete)
+                # A single statement, so it is atomic on its own in autocommit;
+                # without a BEGIN this block does not open a transaction.
+                with self.db.conn:
+                    cursor = self.db.conn.execute(f'DELETE FROM transactions WHERE rowid IN ({placeholders})', saved_rowids_to_delete)
                 saved_rows_deleted_count = cursor.rowcount
-                self.db.conn.commit()
 
                 # Update dirty/cache tracking immediately
                 self.dirty.difference_update(saved_rowids_to_delete)
@@ -1916,7 +1984,6 @@ class ExpenseTrackerGUI(QMainWindow):
                 return # Exit as _load_transactions already refreshed
 
             except sqlite3.Error as e:
-                self.db.conn.rollback()
                 self._show_message(f"DB Error deleting saved rows: {e}", error=True)
                 # Don't reload if DB delete failed, just refresh current state
                 self._refresh()
@@ -2005,18 +2072,18 @@ class ExpenseTrackerGUI(QMainWindow):
 
 
     def _copy_selection(self):
-        selection = self.tbl.selectedRanges()
-        if not selection: return
+        selection = self.tbl.selectionModel().selection()
+        if selection.isEmpty(): return
 
         # Determine the overall bounding box of the selection
-        min_row, max_row = self.tbl.rowCount(), -1
-        min_col, max_col = self.tbl.columnCount(), -1
+        min_row, max_row = self.tbl_model.rowCount(), -1
+        min_col, max_col = self.tbl_model.columnCount(), -1
 
         for r in selection:
-            min_row = min(min_row, r.topRow())
-            max_row = max(max_row, r.bottomRow())
-            min_col = min(min_col, r.leftColumn())
-            max_col = max(max_col, r.rightColumn())
+            min_row = min(min_row, r.top())
+            max_row = max(max_row, r.bottom())
+            min_col = min(min_col, r.left())
+            max_col = max(max_col, r.right())
 
         if min_row > max_row or min_col > max_col: return
 
@@ -2029,17 +2096,11 @@ class ExpenseTrackerGUI(QMainWindow):
         for r in range(min_row, max_row + 1):
             row_data = []
             for c in range(min_col, max_col + 1):
+                index = self.tbl_model.index(r, c)
                 # Check if this specific cell is within any of the selected ranges
-                cell_is_selected = any(
-                    sel_range.topRow() <= r <= sel_range.bottomRow() and
-                    sel_range.leftColumn() <= c <= sel_range.rightColumn()
-                    for sel_range in selection
-                )
-
-                if cell_is_selected:
-                    item = self.tbl.item(r, c)
+                if selection.contains(index):
                     # Get the display text for copied data (what user sees)
-                    display_text = item.text() if item else ""
+                    display_text = index.data() or ""
                     # Replace newline characters to prevent breaking TSV structure
                     display_text = display_text.replace('\n', ' ').replace('\t', ' ')
                     row_data.append(display_text)
@@ -2260,7 +2321,7 @@ class ExpenseTrackerGUI(QMainWindow):
             self.undo_stack.endMacro()
 
             # Update currency display for any rows where account was changed
-            account_col_index = self.COLS.index('account') if 'account' in self.COLS else -1
+            account_col_index = self._col_of.get('account', -1)
             if account_col_index >= 0:
                 for row, col in affected_rows_cols:
                     if col == account_col_index:
@@ -2284,496 +2345,231 @@ class ExpenseTrackerGUI(QMainWindow):
 
     def _refresh(self):
         """Refreshes the table display based on self.transactions and self.pending."""
-        self.tbl.blockSignals(True)
-        current_selection = self.tbl.selectedRanges() # Preserve selection if possible
+        # The model reads the rows on demand, so a rebuild is a model reset; the
+        # selection, current cell and scroll position are put back after it
+        selection_model = self.tbl.selectionModel()
+        current_selection = [(r.top(), r.left(), r.bottom(), r.right()) for r in selection_model.selection()]
+        current_index = self.tbl.currentIndex()
         current_v_scroll = self.tbl.verticalScrollBar().value() # Preserve scroll
         current_h_scroll = self.tbl.horizontalScrollBar().value()
 
-        num_transactions = len(self.transactions)
-        num_pending = len(self.pending)
-        total_rows_required = num_transactions + num_pending + 1 # +1 for '+' row
-
-        # Adjust row count if necessary
-        if total_rows_required != self.tbl.rowCount():
-             self.tbl.setRowCount(total_rows_required)
-
-        font = QFont('Segoe UI', 11)
-        delegate = self.tbl.itemDelegate() # Get delegate for formatting
-
-        # Define colors directly (stylesheet might override parts)
-        color_text = QColor('#f3f3f3')
-        color_base_even = QColor('#23272e'); color_base_odd = QColor('#262b33')
-        color_error = QColor('#a94442')
-        color_dirty = QColor('#4a4a3a')
-        color_row_error_soft = QColor('#3c2224')
-        color_row_dirty_soft = QColor('#3a3a2c')
-        color_row_pending_soft = QColor('#263038')
-        color_plus_row = QColor('#23272e')
-
-        # --- Populate Rows ---
-        all_data = self.transactions + self.pending # Use self.transactions
-        for r, row_data in enumerate(all_data):
-            rowid = row_data.get('rowid') if r < num_transactions else None
-            is_pending = r >= num_transactions
-            row_has_error = r in self.errors and bool(self.errors[r])
-            row_is_dirty = rowid in self.dirty if rowid else False
-
-            # Ensure account_id is properly set for each row
-            if 'account' in row_data and isinstance(row_data['account'], str):
-                # Make sure account_id is an integer
-                if 'account_id' in row_data and row_data['account_id'] is not None:
-                    try:
-                        row_data['account_id'] = int(row_data['account_id'])
-                    except (ValueError, TypeError):
-                        # If account_id is not a valid integer, try to find it from account name
-                        row_data['account_id'] = None
-
-                # If account_id is still None or not set, try to find it from account name
-                if not row_data.get('account_id'):
-                    for acc in self._accounts_data:
-                        if acc['name'] == row_data['account']:
-                            row_data['account_id'] = acc['id']
-                            break
-
-            # Determine base row color
-            base_bg = color_base_even if r % 2 == 0 else color_base_odd
-            if row_has_error: row_base_color = color_row_error_soft
-            elif is_pending: row_base_color = color_row_pending_soft
-            elif row_is_dirty: row_base_color = color_row_dirty_soft
-            else: row_base_color = base_bg
-
-            field_errors = self.errors.get(r, {}) # Errors are keyed by visual row index
-            dirty_fields_set = self.dirty_fields.get(rowid, set()) if rowid else set()
-
-            # Use self.COLS for display columns
-            for c, key in enumerate(self.COLS):
-                # Get the value from row_data based on the key defined in self.COLS
-                # Handle potential missing keys gracefully, although _load_transactions should provide them
-                value = row_data.get(key, '')
-
-                # Special handling for account, category, and sub_category to ensure we display names, not IDs
-                if key == 'account' and isinstance(value, int):
-                    # If we have an account ID instead of a name, look up the name
-                    for acc in self._accounts_data:
-                        if acc['id'] == value:
-                            value = acc['name']
-                            break
-                elif key == 'category':
-                    # CRITICAL FIX: Handle ID conflicts using the mapping
-                    if row_data.get('category_id') in self._id_conflict_mapping.get('category', {}):
-                        forced_name = self._id_conflict_mapping['category'][row_data['category_id']]
-                        value = forced_name
-                        # Also update the underlying data to ensure consistency
-                        row_data['category'] = forced_name
-                        debug_print('CATEGORY', f"REFRESH FIX: Forcing display of {forced_name} for category_id={row_data['category_id']} in row {r} (is_pending={is_pending})")
-                    # If we have a category ID instead of a name, look up the name
-                    elif isinstance(value, int):
-                        for cat in self._categories_data:
-                            if cat['id'] == value:
-                                value = cat['name']
-                                # Update the underlying data to ensure consistency
-                                row_data['category'] = cat['name']
-                                break
-                    # If the value is a string but matches an account name, it's likely a mistake
-                    # This fixes the issue where bank account names appear in the category column
-                    elif isinstance(value, str):
-                        is_account_name = False
-                        for acc in self._accounts_data:
-                            if acc['name'] == value:
-                                is_account_name = True
-                                break
-
-                        # If it's an account name or if it's not a valid category name, set to UNCATEGORIZED
-                        if is_account_name or value not in [cat['name'] for cat in self._categories_data]:
-                            # Find UNCATEGORIZED category for the current transaction type
-                            transaction_type = row_data.get('transaction_type', 'Expense')
-                            uncategorized_cat = None
-                            for cat in self._categories_data:
-                                if cat['name'] == 'UNCATEGORIZED' and cat['type'] == transaction_type:
-                                    uncategorized_cat = cat
-                                    break
-
-                            if uncategorized_cat:
-                                value = 'UNCATEGORIZED'
-                                # Update the underlying data to fix the issue
-                                row_data['category'] = 'UNCATEGORIZED'
-                                row_data['category_id'] = uncategorized_cat['id']
-
-                                # Find or create UNCATEGORIZED subcategory for this category
-                                uncategorized_subcat = None
-                                for subcat in self._subcategories_data:
-                                    if subcat['category_id'] == uncategorized_cat['id'] and subcat['name'] == 'UNCATEGORIZED':
-                                        uncategorized_subcat = subcat
-                                        break
-
-                                if uncategorized_subcat:
-                                    row_data['sub_category'] = 'UNCATEGORIZED'
-                                    row_data['sub_category_id'] = uncategorized_subcat['id']
-                                else:
-                                    # Create UNCATEGORIZED subcategory if it doesn't exist
-                                    uncategorized_id = self.db.ensure_subcategory('UNCATEGORIZED', uncategorized_cat['id'])
-                                    if uncategorized_id:
-                                        row_data['sub_category'] = 'UNCATEGORIZED'
-                                        row_data['sub_category_id'] = uncategorized_id
-                                        # Reload dropdown data in the background
-                                        QTimer.singleShot(0, self._load_dropdown_data)
-                elif key == 'sub_category':
-                    # If we have a subcategory ID instead of a name, look up the name
-                    if isinstance(value, int):
-                        for subcat in self._subcategories_data:
-                            if subcat['id'] == value:
-                                value = subcat['name']
-                                break
-                    # If the subcategory is empty or invalid but we have a category, set to UNCATEGORIZED
-                    elif row_data.get('category_id') is not None:
-                        # Check if the current subcategory is valid for this category
-                        is_valid = False
-                        if value:
-                            for subcat in self._subcategories_data:
-                                if subcat['category_id'] == row_data.get('category_id') and subcat['name'] == value:
-                                    is_valid = True
-                                    row_data['sub_category_id'] = subcat['id']
-                                    break
-
-                        # If not valid or if category is UNCATEGORIZED, set subcategory to UNCATEGORIZED
-                        category_is_uncategorized = False
-                        for cat in self._categories_data:
-                            if cat['id'] == row_data.get('category_id') and cat['name'] == 'UNCATEGORIZED':
-                                category_is_uncategorized = True
-                                break
-
-                        if not is_valid or category_is_uncategorized:
-                            # Find or create UNCATEGORIZED subcategory for this category
-                            category_id = row_data.get('category_id')
-                            if category_id:
-                                uncategorized_found = False
-                                for subcat in self._subcategories_data:
-                                    if subcat['category_id'] == category_id and subcat['name'] == 'UNCATEGORIZED':
-                                        value = 'UNCATEGORIZED'
-                                        row_data['sub_category'] = 'UNCATEGORIZED'
-                                        row_data['sub_category_id'] = subcat['id']
-                                        uncategorized_found = True
-                                        debug_print('SUBCATEGORY', f"Fixed: Set subcategory to UNCATEGORIZED (ID: {subcat['id']})")
-                                        break
-
-                                # If not found, create it
-                                if not uncategorized_found and self.db:
-                                    debug_print('SUBCATEGORY', f"Creating UNCATEGORIZED subcategory for category ID {category_id}")
-                                    uncategorized_id = self.db.ensure_subcategory('UNCATEGORIZED', category_id)
-                                    if uncategorized_id:
-                                        value = 'UNCATEGORIZED'
-                                        row_data['sub_category'] = 'UNCATEGORIZED'
-                                        row_data['sub_category_id'] = uncategorized_id
-                                        debug_print('SUBCATEGORY', f"Created and set subcategory to UNCATEGORIZED (ID: {uncategorized_id})")
-                                        # Add to our local data
-                                        self._subcategories_data.append({
-                                            'id': uncategorized_id,
-                                            'name': 'UNCATEGORIZED',
-                                            'category_id': category_id
-                                        })
-                                        # Reload dropdown data in the background
-                                        QTimer.singleShot(0, self._load_dropdown_data)
-
-                item = self.tbl.item(r, c)
-                if item is None:
-                    item = QTableWidgetItem()
-                    self.tbl.setItem(r, c, item)
-
-                # Special handling for transaction_value to ensure correct currency
-                if key == 'transaction_value' and isinstance(value, Decimal):
-                    # Format with the correct currency based on the account
-                    account_name = row_data.get('account')
-                    account_id = row_data.get('account_id')
-
-                    # If we have an account name but no ID, try to find the ID
-                    if account_name and not account_id:
-                        for acc in self._accounts_data:
-                            if acc['name'] == account_name:
-                                account_id = acc['id']
-                                row_data['account_id'] = account_id
-                                break
-
-                    # Get the currency for this account
-                    if account_id:
-                        currency_info = self.db.get_account_currency(account_id)
-                        if currency_info and 'currency_symbol' in currency_info:
-                            # Format with the currency symbol
-                            formatted_value = self.locale.toString(float(value), 'f', 2)
-                            display_text = f"{currency_info['currency_symbol']} {formatted_value}"
-                        else:
-                            # Use delegate's displayText as fallback
-                            display_text = delegate.displayText(value, self.locale)
-                    else:
-                        # Use delegate's displayText as fallback
-                        display_text = delegate.displayText(value, self.locale)
-                else:
-                    # Use delegate's displayText for formatting (especially for numbers/dates)
-                    # The delegate itself will need updating later for new types like account/category
-                    display_text = delegate.displayText(value, self.locale) # Pass locale
-
-                # Special handling for category display
-                if key == 'category':
-                    # SPECIAL CASE: Direct fix for the Bank of America vs UNCATEGORIZED conflict
-                    # If display_text is "Bank of America" but we're trying to set UNCATEGORIZED
-                    if display_text == "Bank of America" and (value == "UNCATEGORIZED" or row_data.get('category') == "UNCATEGORIZED"):
-                        debug_print('CATEGORY', f"DIRECT FIX: Found 'Bank of America' in category field when it should be 'UNCATEGORIZED' for row {r}")
-
-                        # Force it to be UNCATEGORIZED
-                        display_text = 'UNCATEGORIZED'
-                        row_data['category'] = 'UNCATEGORIZED'
-
-                        # Find the correct UNCATEGORIZED category ID
-                        transaction_type = row_data.get('transaction_type', 'Expense')
-                        for cat in self._categories_data:
-                            if cat['name'] == 'UNCATEGORIZED' and cat['type'] == transaction_type:
-                                row_data['category_id'] = cat['id']
-                                break
-
-                        # Force immediate update of the display text for this cell
-                        item.setText('UNCATEGORIZED')
-
-                        # Also update the subcategory cell if it exists
-                        subcat_item = self.tbl.item(r, 5)  # Column 5 is subcategory
-                        if subcat_item:
-                            subcat_item.setText('UNCATEGORIZED')
-
-                    # First, check if the current display text is an account name (which would be wrong)
-                    # Do this check first before any other processing
-                    is_account_name = False
-                    for acc in self._accounts_data:
-                        if acc['name'] == display_text or acc['name'] == value:
-                            is_account_name = True
-                            debug_print('CATEGORY', f"Found account name '{display_text}' in category field for row {r}")
-                            break
-
-                    # If it's an account name, fix it immediately by setting to UNCATEGORIZED
-                    if is_account_name:
-                        transaction_type = row_data.get('transaction_type', 'Expense')
-                        for cat in self._categories_data:
-                            if cat['name'] == 'UNCATEGORIZED' and cat['type'] == transaction_type:
-                                display_text = 'UNCATEGORIZED'
-                                row_data['category'] = 'UNCATEGORIZED'
-                                row_data['category_id'] = cat['id']
-                                debug_print('CATEGORY', f"Fixed account name in category field to UNCATEGORIZED (ID: {cat['id']})")
-
-                                # Also update subcategory to match
-                                for subcat in self._subcategories_data:
-                                    if subcat['category_id'] == cat['id'] and subcat['name'] == 'UNCATEGORIZED':
-                                        row_data['sub_category'] = 'UNCATEGORIZED'
-                                        row_data['sub_category_id'] = subcat['id']
-                                        break
+        self.tbl_model.reload()
+        total_rows = self.tbl_model.rowCount() # Includes the '+' row
 
-                                # Force immediate update of the display text for this cell
-                                item.setText('UNCATEGORIZED')
-
-                                # Also update the subcategory cell if it exists
-                                subcat_item = self.tbl.item(r, 5)  # Column 5 is subcategory
-                                if subcat_item:
-                                    subcat_item.setText('UNCATEGORIZED')
-                                break
-                    # If not an account name, proceed with normal category handling
-                    else:
-                        # Check if we have a valid category_id
-                        if row_data.get('category_id'):
-                            # SPECIAL CASE: If category_id is 1, ALWAYS display as UNCATEGORIZED
-                            # This handles the specific ID conflict between Bank of America (ID 1) and UNCATEGORIZED (ID 1)
-                            if row_data.get('category_id') == 1:
-                                # Make sure we're displaying UNCATEGORIZED, not Bank of America
-                                display_text = 'UNCATEGORIZED'
-                                # Force immediate update of the display text for this cell
-                                item.setText('UNCATEGORIZED')
-                                # Also ensure the underlying data is consistent
-                                row_data['category'] = 'UNCATEGORIZED'
-                                debug_print('CATEGORY', f"CRITICAL FIX: Forced display of UNCATEGORIZED for category_id=1 in row {r}")
-
-                            # Check if the category_id matches an account_id (which would be wrong)
-                            is_account_id = False
-                            for acc in self._accounts_data:
-                                if acc['id'] == row_data.get('category_id'):
-                                    is_account_id = True
-                                    debug_print('CATEGORY', f"Found account ID {acc['id']} in category_id field for row {r}")
-                                    break
-
-                            # If it's an account ID, fix it by setting to UNCATEGORIZED
-                            if is_account_id:
-                                transaction_type = row_data.get('transaction_type', 'Expense')
-                                for cat in self._categories_data:
-                                    if cat['name'] == 'UNCATEGORIZED' and cat['type'] == transaction_type:
-                                        display_text = 'UNCATEGORIZED'
-                                        row_data['category'] = 'UNCATEGORIZED'
-                                        row_data['category_id'] = cat['id']
-                                        debug_print('CATEGORY', f"Fixed account ID in category_id field to UNCATEGORIZED (ID: {cat['id']})")
-
-                                        # Also update subcategory to match
-                                        for subcat in self._subcategories_data:
-                                            if subcat['category_id'] == cat['id'] and subcat['name'] == 'UNCATEGORIZED':
-                                                row_data['sub_category'] = 'UNCATEGORIZED'
-                                                row_data['sub_category_id'] = subcat['id']
-                                                break
-
-                                        # Force immediate update of the display text for this cell
-                                        item.setText('UNCATEGORIZED')
-
-                                        # Also update the subcategory cell if it exists
-                                        subcat_item = self.tbl.item(r, 5)  # Column 5 is subcategory
-                                        if subcat_item:
-                                            subcat_item.setText('UNCATEGORIZED')
-                                        break
-                            # If not an account ID, ensure we display the correct category name
-                            else:
-                                category_found = False
-                                for cat in self._categories_data:
-                                    if cat['id'] == row_data.get('category_id'):
-                                        display_text = cat['name']
-                                        category_found = True
-                                        # Also update the underlying data to ensure consistency
-                                        row_data['category'] = cat['name']
-                                        break
-
-                                # If category ID doesn't match any known category, set to UNCATEGORIZED
-                                if not category_found:
-                                    transaction_type = row_data.get('transaction_type', 'Expense')
-                                    for cat in self._categories_data:
-                                        if cat['name'] == 'UNCATEGORIZED' and cat['type'] == transaction_type:
-                                            display_text = 'UNCATEGORIZED'
-                                            row_data['category'] = 'UNCATEGORIZED'
-                                            row_data['category_id'] = cat['id']
-                                            debug_print('CATEGORY', f"Fixed invalid category ID {row_data.get('category_id')} to UNCATEGORIZED (ID: {cat['id']})")
-
-                                            # Force immediate update of the display text for this cell
-                                            item.setText('UNCATEGORIZED')
-
-                                            # Also update subcategory to match
-                                            for subcat in self._subcategories_data:
-                                                if subcat['category_id'] == cat['id'] and subcat['name'] == 'UNCATEGORIZED':
-                                                    row_data['sub_category'] = 'UNCATEGORIZED'
-                                                    row_data['sub_category_id'] = subcat['id']
-
-                                                    # Update the subcategory cell if it exists
-                                                    subcat_item = self.tbl.item(r, 5)  # Column 5 is subcategory
-                                                    if subcat_item:
-                                                        subcat_item.setText('UNCATEGORIZED')
-                                                    break
-                                            break
-
-                # Special handling for subcategory display
-                if key == 'sub_category':
-                    # Debug print to see what's happening with subcategory values
-                    debug_print('SUBCATEGORY', f"Row {r}, ID={row_data.get('sub_category_id')}, Value='{value}', Display='{display_text}'")
-
-                    # Ensure we display the correct subcategory name based on the ID
-                    if row_data.get('sub_category_id'):
-                        found = False
-                        for subcat in self._subcategories_data:
-                            if subcat['id'] == row_data.get('sub_category_id'):
-                                # Verify this subcategory belongs to the current category
-                                if subcat['category_id'] == row_data.get('category_id'):
-                                    display_text = subcat['name']
-                                    found = True
-
-                                    break
-                                else:
-                                    debug_print('SUBCATEGORY', f"WARNING: Subcategory ID {subcat['id']} belongs to category {subcat['category_id']}, not {row_data.get('category_id')}")
-
-                        if not found:
-                            # If we couldn't find the subcategory or it doesn't belong to the current category, force it to UNCATEGORIZED
-                            debug_print('SUBCATEGORY', f"WARNING: Valid subcategory ID {row_data.get('sub_category_id')} not found for category ID {row_data.get('category_id')}")
-                            # Find the correct UNCATEGORIZED subcategory for this category
-                            category_id = row_data.get('category_id')
-                            if category_id:
-                                uncategorized_found = False
-                                for subcat in self._subcategories_data:
-                                    if subcat['category_id'] == category_id and subcat['name'] == 'UNCATEGORIZED':
-                                        display_text = 'UNCATEGORIZED'
-                                        row_data['sub_category'] = 'UNCATEGORIZED'
-                                        row_data['sub_category_id'] = subcat['id']
-                                        uncategorized_found = True
-                                        debug_print('SUBCATEGORY', f"Fixed: Set subcategory to UNCATEGORIZED (ID: {subcat['id']})")
-                                        break
-
-                                # If we couldn't find an UNCATEGORIZED subcategory, create one
-                                if not uncategorized_found and self.db:
-                                    debug_print('SUBCATEGORY', f"Creating UNCATEGORIZED subcategory for category ID {category_id}")
-                                    uncategorized_id = self.db.ensure_subcategory('UNCATEGORIZED', category_id)
-                                    if uncategorized_id:
-                                        display_text = 'UNCATEGORIZED'
-                                        row_data['sub_category'] = 'UNCATEGORIZED'
-                                        row_data['sub_category_id'] = uncategorized_id
-                                        debug_print('SUBCATEGORY', f"Created and set subcategory to UNCATEGORIZED (ID: {uncategorized_id})")
-                                        # Add to our local data
-                                        self._subcategories_data.append({
-                                            'id': uncategorized_id,
-                                            'name': 'UNCATEGORIZED',
-                                            'category_id': category_id
-                                        })
-                                        # Reload dropdown data in the background
-                                        QTimer.singleShot(0, self._load_dropdown_data)
-
-                item.setText(display_text)
-
-                # Apply special styling for description field - smaller, grayer text
-                if key == 'transaction_description':
-                    description_font = QFont('Segoe UI', 10)  # Smaller font
-                    description_font.setItalic(True)  # Italic for less prominence
-                    item.setFont(description_font)
-                    item.setForeground(QColor('#a0a0a0'))  # Lighter gray color
-
-                    # No longer adding the [...] indicator since we have the Edit button
-                else:
-                    item.setFont(font)
-                    item.setForeground(color_text)
-
-                # Determine cell background color
-                cell_bg = row_base_color # Start with row base
-                # Highlight specific cells with errors
-                if key in field_errors: cell_bg = color_error
-                # Highlight specific dirty cells (only if no error on the cell)
-                elif rowid and key in dirty_fields_set and key not in field_errors: cell_bg = color_dirty
-
-                item.setBackground(cell_bg)
-                # Set flags (editable depends on column type - delegate will handle this better later)
-                item.setFlags(Qt.ItemFlag.ItemIsEnabled | Qt.ItemFlag.ItemIsSelectable | Qt.ItemFlag.ItemIsEditable)
-
-        # --- Populate '+' Row ---
-        r_empty = num_transactions + num_pending
-        for c in range(len(self.COLS)):
-             item = self.tbl.item(r_empty, c)
-             if item is None:
-                 item = QTableWidgetItem()
-                 self.tbl.setItem(r_empty, c, item)
-             # Display '+' in the first column only (index 0)
-             item.setText('+' if c == 0 else '')
-             item.setFont(font)
-             item.setForeground(color_text)
-             item.setBackground(color_plus_row)
-             # Make '+' row selectable but not editable
-             item.setFlags(Qt.ItemFlag.ItemIsEnabled | Qt.ItemFlag.ItemIsSelectable)
-
-        # --- Restore UI State ---
-        self.tbl.blockSignals(False)
+        if current_index.isValid() and current_index.row() < total_rows:
+            selection_model.setCurrentIndex(self.tbl_model.index(current_index.row(), current_index.column()),
+                                            QItemSelectionModel.SelectionFlag.NoUpdate)
+        # Restore selection (might be imperfect if rows were added/deleted)
+        selection = QItemSelection()
+        for top_row, left_col, bottom_row, right_col in current_selection:
+            # Adjust range if it extends beyond new row count
+            bottom_row = min(bottom_row, total_rows - 1)
+            if bottom_row >= top_row:
+                selection.select(self.tbl_model.index(top_row, left_col),
+                                 self.tbl_model.index(bottom_row, right_col))
+        selection_model.select(selection, QItemSelectionModel.SelectionFlag.ClearAndSelect)
+
+        # Lay the view out now, so the scroll bars have their new ranges
+        self.tbl.doItemsLayout()
         self.tbl.verticalScrollBar().setValue(current_v_scroll)
         self.tbl.horizontalScrollBar().setValue(current_h_scroll)
-        # Restore selection (might be imperfect if rows were added/deleted)
-        self.tbl.clearSelection()
-        for sel_range in current_selection:
-             # Adjust range if it extends beyond new row count
-             top_row = sel_range.topRow()
-             bottom_row = min(sel_range.bottomRow(), total_rows_required - 1)
-             if bottom_row >= top_row:
-                 # Create a new selection range instead of modifying the existing one
-                 new_range = QTableWidgetSelectionRange(
-                     top_row,
-                     sel_range.leftColumn(),
-                     bottom_row,
-                     sel_range.rightColumn()
-                 )
-                 self.tbl.setRangeSelected(new_range, True)
 
         self._update_button_states() # Update button states based on pending/dirty
 
         # Print the table contents to the terminal
         self._debug_print_table()
 
+    def _refresh_row(self, r):
+        """
+        Repaint a single table row after its data was replaced in place.
+
+        The row is repaired first, as a loaded or added row is (see _repair_row).
+        """
+        row_data = self._row_data(r)
+        if row_data is None:
+            self._refresh()
+            return
+        self._repair_row(row_data)
+        self.tbl_model.refresh_row(r)
+        self._debug_print_table()
+
+    def _repair_row(self, row_data):
+        """
+        Fix up a row's account, category and subcategory fields against the dropdown data.
+
+        Run when rows are loaded, added or replaced, so that showing them (see
+        _cell_text) changes nothing. A missing account_id is looked up from the
+        account name; a category that is really an account (by name or ID) or is
+        unknown becomes the type's UNCATEGORIZED category; a missing or mismatched
+        subcategory becomes the category's UNCATEGORIZED one, which is created in
+        the database if needed.
+        """
+        # Ensure account_id is properly set
+        if isinstance(row_data.get('account'), str):
+            # Make sure account_id is an integer
+            if row_data.get('account_id') is not None:
+                try:
+                    row_data['account_id'] = int(row_data['account_id'])
+                except (ValueError, TypeError):
+                    # If account_id is not a valid integer, try to find it from account name
+                    row_data['account_id'] = None
+
+            # If account_id is still None or not set, try to find it from account name
+            if not row_data.get('account_id'):
+                acc = self._acct_by_name.get(row_data['account'])
+                if acc is not None:
+                    row_data['account_id'] = acc['id']
+
+        # --- Category name ---
+        category = row_data.get('category', '')
+        forced_name = self._id_conflict_mapping.get('category', {}).get(row_data.get('category_id'))
+        if forced_name is not None:
+            # CRITICAL FIX: Handle ID conflicts using the mapping
+            row_data['category'] = forced_name
+            debug_print('CATEGORY', "REPAIR: Forcing %s for category_id=%s", forced_name, row_data['category_id'])
+        elif isinstance(category, int):
+            # A category ID instead of a name
+            cat = self._cat_by_id.get(category)
+            if cat is not None:
+                row_data['category'] = cat['name']
+        elif isinstance(category, str) and (category in self._acct_by_name or category not in self._cat_name_to_id):
+            # A bank account name in the category column, or not a category at all
+            self._set_uncategorized(row_data, create_subcategory=True)
+
+        # --- Category ID ---
+        category_id = row_data.get('category_id')
+        if row_data.get('category') in self._acct_by_name:
+            debug_print('CATEGORY', "Found account name '%s' in category field", row_data['category'])
+            self._set_uncategorized(row_data)
+        elif category_id:
+            # SPECIAL CASE: category ID 1 is always UNCATEGORIZED, never Bank of America
+            if category_id == 1:
+                row_data['category'] = 'UNCATEGORIZED'
+            if category_id in self._acct_by_id:
+                # An account ID in the category_id field
+                debug_print('CATEGORY', "Found account ID %s in category_id field", category_id)
+                self._set_uncategorized(row_data)
+            else:
+                cat = self._cat_by_id.get(category_id)
+                if cat is not None:
+                    row_data['category'] = cat['name']
+                else:
+                    debug_print('CATEGORY', "Fixing invalid category ID %s to UNCATEGORIZED", category_id)
+                    self._set_uncategorized(row_data)
+
+        # --- Subcategory ---
+        category_id = row_data.get('category_id')
+        subcategory = row_data.get('sub_category', '')
+        if not isinstance(subcategory, int) and category_id is not None:
+            # Check if the current subcategory is valid for this category
+            is_valid = False
+            if subcategory:
+                for subcat in self._subcats_by_category_id.get(category_id, ()):
+                    if subcat['name'] == subcategory:
+                        is_valid = True
+                        row_data['sub_category_id'] = subcat['id']
+                        break
+            category_is_uncategorized = any(cat['id'] == category_id and cat['name'] == 'UNCATEGORIZED'
+                                            for cat in self._categories_data)
+            # If not valid or if category is UNCATEGORIZED, set subcategory to UNCATEGORIZED
+            if (not is_valid or category_is_uncategorized) and category_id:
+                self._set_uncategorized_subcategory(row_data, category_id, create=True)
+
+        # A subcategory ID that doesn't belong to the row's category
+        subcategory_id = row_data.get('sub_category_id')
+        if subcategory_id and category_id and not any(
+                subcat['id'] == subcategory_id for subcat in self._subcats_by_category_id.get(category_id, ())):
+            debug_print('SUBCATEGORY', "Subcategory ID %s not found for category ID %s", subcategory_id, category_id)
+            self._set_uncategorized_subcategory(row_data, category_id, create=True)
+
+    def _set_uncategorized(self, row_data, create_subcategory=False):
+        """Point a row at its type's UNCATEGORIZED category and subcategory, if that category exists."""
+        for cat in self._cats_by_type.get(row_data.get('transaction_type', 'Expense'), ()):
+            if cat['name'] == 'UNCATEGORIZED':
+                row_data['category'] = 'UNCATEGORIZED'
+                row_data['category_id'] = cat['id']
+                self._set_uncategorized_subcategory(row_data, cat['id'], create=create_subcategory)
+                return
+
+    def _set_uncategorized_subcategory(self, row_data, category_id, create=False):
+        """
+        Point a row at a category's UNCATEGORIZED subcategory.
+
+        With create, a missing one is created in the database, added to the
+        dropdown data and the dropdowns are reloaded in the background.
+        """
+        subcategory_id = None
+        for subcat in self._subcats_by_category_id.get(category_id, ()):
+            if subcat['name'] == 'UNCATEGORIZED':
+                subcategory_id = subcat['id']
+                break
+        if subcategory_id is None and create and self.db:
+            debug_print('SUBCATEGORY', "Creating UNCATEGORIZED subcategory for category ID %s", category_id)
+            subcategory_id = self.db.ensure_subcategory('UNCATEGORIZED', category_id)
+            if subcategory_id:
+                self._add_subcategory_data(subcategory_id, category_id)
+                QTimer.singleShot(0, self._load_dropdown_data)
+        if subcategory_id:
+            row_data['sub_category'] = 'UNCATEGORIZED'
+            row_data['sub_category_id'] = subcategory_id
+
+    def _cell_text(self, row_data, key):
+        """
+        Return the text shown in the table for one field of a transaction or pending row.
+
+        Called by the table model for the cells being painted; reads the row only.
+        """
+        delegate = self.tbl.itemDelegate()
+        value = row_data.get(key, '')
+        if key == 'transaction_value' and isinstance(value, Decimal):
+            # Format with the correct currency based on the account, using the
+            # delegate's cached formatter for the amount
+            formatted_value = delegate.display_text_for(key, value)
+            account_id = row_data.get('account_id')
+            if not account_id:
+                acc = self._acct_by_name.get(row_data.get('account'))
+                account_id = acc['id'] if acc is not None else None
+            currency_symbol = self._currency_symbol(account_id) if account_id else None
+            if currency_symbol is None:
+                return formatted_value
+            return f"{currency_symbol} {formatted_value}"
+        if key == 'category':
+            # Category IDs in the conflict mapping (ID 1 is always UNCATEGORIZED) show the forced name
+            forced_name = self._id_conflict_mapping.get('category', {}).get(row_data.get('category_id'))
+            if forced_name is not None:
+                return forced_name
+        elif key == 'sub_category':
+            # The subcategory named by the ID, as long as it belongs to the row's category
+            subcategory_id = row_data.get('sub_category_id')
+            if subcategory_id:
+                for subcat in self._subcats_by_category_id.get(row_data.get('category_id'), ()):
+                    if subcat['id'] == subcategory_id:
+                        return subcat['name']
+        # The delegate formats dates and amounts and resolves IDs against the column's table
+        return delegate.display_text_for(key, value)
+
+    def _cell_background(self, row, key):
+        """Return a cell's background colour from its row's error, pending and dirty state."""
+        num_transactions = len(self.transactions)
+        if row >= num_transactions + len(self.pending):
+            return _COLOR_PLUS_ROW
+        field_errors = self.errors.get(row) # Errors are keyed by visual row index
+        # Highlight specific cells with errors
+        if field_errors and key in field_errors:
+            return _COLOR_ERROR
+        rowid = self.transactions[row].get('rowid') if row < num_transactions else None
+        # Highlight specific dirty cells (only if no error on the cell)
+        if rowid and key in self.dirty_fields.get(rowid, ()):
+            return _COLOR_DIRTY
+        # Otherwise the row's base colour
+        if field_errors:
+            return _COLOR_ROW_ERROR_SOFT
+        if row >= num_transactions:
+            return _COLOR_ROW_PENDING_SOFT
+        if rowid and rowid in self.dirty:
+            return _COLOR_ROW_DIRTY_SOFT
+        return _COLOR_BASE_EVEN if row % 2 == 0 else _COLOR_BASE_ODD
+
     def _debug_print_table(self):
         """Debug function to print the table contents to the terminal."""
         # Only print table contents if TABLE_DISPLAY debug category is enabled
@@ -2785,11 +2581,10 @@ class ExpenseTrackerGUI(QMainWindow):
             num_transactions = len(self.transactions)
             all_data = self.transactions + self.pending
 
-            for row in range(self.tbl.rowCount() - 1):  # Skip the '+' row
+            for row in range(self.tbl_model.rowCount() - 1):  # Skip the '+' row
                 row_data = []
-                for col in range(self.tbl.columnCount()):
-                    item = self.tbl.item(row, col)
-                    text = item.text() if item else ""
+                for col in range(self.tbl_model.columnCount()):
+                    text = self.tbl_model.index(row, col).data() or ""
 
                     # Check if we need to convert an ID to a name for display
                     if row < len(all_data) and col < len(self.COLS):
@@ -2828,7 +2623,7 @@ class ExpenseTrackerGUI(QMainWindow):
                         is_dirty = True
                     # Also check if any field in the row is different from the original
                     elif rowid in self._original_data_cache:
-                        original = self._original_data_cache.get(rowid, {})
+                        original = self._original_row(rowid)
                         for key, value in transaction.items():
                             if key.startswith('_') or key == 'rowid':
                                 continue
@@ -2861,7 +2656,7 @@ class ExpenseTrackerGUI(QMainWindow):
                 modified_fields = []
                 if row < num_transactions and self.transactions[row].get('rowid') in self.dirty:
                     rowid = self.transactions[row].get('rowid')
-                    original = self._original_data_cache.get(rowid, {})
+                    original = self._original_row(rowid)
                     # Check which fields are modified
                     if original.get('transaction_name') != self.transactions[row].get('transaction_name'):
                         modified_fields.append(0)  # Transaction Name column
@@ -2907,7 +2702,7 @@ class ExpenseTrackerGUI(QMainWindow):
                         is_dirty = True
                     # Also check if any field in the row is different from the original
                     elif rowid in self._original_data_cache:
-                        original = self._original_data_cache.get(rowid, {})
+                        original = self._original_row(rowid)
                         for key, value in data.items():
                             if key.startswith('_') or key == 'rowid':
                                 continue
@@ -2970,7 +2765,7 @@ class ExpenseTrackerGUI(QMainWindow):
                 # If the row is dirty or has errors, show what fields are modified or have errors
                 if is_dirty if i < num_transactions else False:
                     rowid = data.get('rowid')
-                    original = self._original_data_cache.get(rowid, {})
+                    original = self._original_row(rowid)
                     changes = []
                     for key, value in data.items():
                         if key.startswith('_') or key == 'rowid':
@@ -3017,7 +2812,7 @@ class ExpenseTrackerGUI(QMainWindow):
 
 
     def _clear_selected_cells_content(self):
-        selected_indexes = self.tbl.selectedIndexes()
+        selected_indexes = self.tbl.selectionModel().selectedIndexes()
         if not selected_indexes: return
 
         empty_row_index = len(self.transactions) + len(self.pending)
@@ -3190,12 +2985,9 @@ class ExpenseTrackerGUI(QMainWindow):
                         delegate = self.tbl.itemDelegate()
                         click_on_icon = False
 
-                        if hasattr(delegate, 'arrow_rects') and (row, col) in delegate.arrow_rects:
-                            # Convert pos to cell coordinates
-                            cell_rect = self.tbl.visualRect(idx)
-                            cell_pos = QPoint(pos.x() - cell_rect.left(), pos.y() - cell_rect.top())
-                            arrow_rect = delegate.arrow_rects[(row, col)]
-
+                        cell_rect = self.tbl.visualRect(idx)
+                        arrow_rect = delegate.arrow_rect(cell_rect, col_key) if hasattr(delegate, 'arrow_rect') else None
+                        if arrow_rect is not None:
                             # Check if click is within the arrow/icon area - use relative coordinates
                             relative_x = cell_rect.right() - pos.x()
 
@@ -3214,7 +3006,7 @@ class ExpenseTrackerGUI(QMainWindow):
                         # If clicked directly on the arrow/icon, force immediate dropdown/calendar opening
                         if click_on_icon and row < empty_row_index:
                             # First select the cell
-                            self.tbl.setCurrentCell(row, col)
+                            self.tbl.setCurrentIndex(idx)
 
                             # Then immediately start editing
                             editor = self.tbl.edit(idx)
@@ -3239,7 +3031,7 @@ class ExpenseTrackerGUI(QMainWindow):
                         # Otherwise, if it's a dropdown/date column and not the empty row, just start editing
                         elif (is_dropdown_column or is_date_column) and row < empty_row_index:
                             # Set current cell and start editing
-                            self.tbl.setCurrentCell(row, col)
+                            self.tbl.setCurrentIndex(idx)
                             self.tbl.edit(idx)
                             return True  # Handled
 
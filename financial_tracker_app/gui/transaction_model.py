@@ -0,0 +1,161 @@
+# --- START OF FILE transaction_model.py ---
+
+import weakref
+from PyQt6.QtCore import Qt, QAbstractTableModel, QModelIndex
+from PyQt6.QtGui import QColor, QFont
+
+from financial_tracker_app.data.column_config import DISPLAY_TITLES
+from financial_tracker_app.logic.commands import CellEditCommand
+
+_COLOR_TEXT = QColor('#f3f3f3')
+_COLOR_DESCRIPTION = QColor('#a0a0a0') # Descriptions are drawn smaller and greyer
+
+_EDITABLE = Qt.ItemFlag.ItemIsEnabled | Qt.ItemFlag.ItemIsSelectable | Qt.ItemFlag.ItemIsEditable
+_PLUS_ROW = Qt.ItemFlag.ItemIsEnabled | Qt.ItemFlag.ItemIsSelectable # Selectable but not editable
+
+class TransactionTableModel(QAbstractTableModel):
+    """
+    Table model over the main window's transactions and pending rows.
+
+    The rows are the window's transactions, then its pending rows, then the
+    trailing '+' row used to add a transaction. Nothing is copied into the
+    model: data() reads the window's row dicts, so only the cells the view
+    actually paints are formatted. Display text is cached per column and
+    dropped for the cells in every dataChanged.
+
+    The window reports its changes here: reload() after rows were replaced,
+    added or removed, append_pending() for a single new row, and
+    refresh_row()/refresh_all() after values or row states changed.
+    """
+
+    def __init__(self, window):
+        super().__init__(window)
+        # Weak, like the delegate's reference: the window owns the model
+        self._window_ref = weakref.ref(window)
+        self._cols = tuple(window.COLS)
+        # Display text by column, then by row; filled as cells are painted
+        self._display_cache = [{} for _ in self._cols]
+        self._description_col = self._cols.index('transaction_description') if 'transaction_description' in self._cols else -1
+        self._font = QFont('Segoe UI', 11)
+        self._description_font = QFont('Segoe UI', 10)
+        self._description_font.setItalic(True)
+        self.dataChanged.connect(self._drop_cached)
+
+    @property
+    def parent_window(self):
+        """The main window whose rows this model shows, or None once it is gone."""
+        return self._window_ref()
+
+    def _plus_row(self):
+        """Index of the '+' row (the number of transaction and pending rows)."""
+        window = self.parent_window
+        return len(window.transactions) + len(window.pending)
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid() or self.parent_window is None:
+            return 0
+        return self._plus_row() + 1
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._cols)
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if orientation == Qt.Orientation.Horizontal and role == Qt.ItemDataRole.DisplayRole:
+            return DISPLAY_TITLES[section] if 0 <= section < len(DISPLAY_TITLES) else None
+        return super().headerData(section, orientation, role)
+
+    def flags(self, index):
+        if not index.isValid():
+            return Qt.ItemFlag.NoItemFlags
+        return _PLUS_ROW if index.row() == self._plus_row() else _EDITABLE
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        window = self.parent_window
+        if not index.isValid() or window is None:
+            return None
+        row, col = index.row(), index.column()
+        if role == Qt.ItemDataRole.DisplayRole:
+            cache = self._display_cache[col]
+            text = cache.get(row)
+            if text is None:
+                if row == self._plus_row():
+                    text = '+' if col == 0 else '' # '+' in the first column only
+                else:
+                    row_data = window._row_data(row)
+                    if row_data is None:
+                        return None
+                    text = window._cell_text(row_data, self._cols[col])
+                cache[row] = text
+            return text
+        if role == Qt.ItemDataRole.EditRole:
+            # The stored value (a Decimal amount, an ISO date, a name), which the
+            # delegate's editors and the undo commands work with
+            row_data = window._row_data(row)
+            return None if row_data is None else row_data.get(self._cols[col], '')
+        if role == Qt.ItemDataRole.BackgroundRole:
+            return window._cell_background(row, self._cols[col])
+        if role == Qt.ItemDataRole.ForegroundRole:
+            return _COLOR_DESCRIPTION if col == self._description_col and row != self._plus_row() else _COLOR_TEXT
+        if role == Qt.ItemDataRole.FontRole:
+            return self._description_font if col == self._description_col and row != self._plus_row() else self._font
+        return None
+
+    def setData(self, index, value, role=Qt.ItemDataRole.EditRole):
+        """
+        Apply an edit through a CellEditCommand on the window's undo stack.
+
+        The command's redo() writes the row dict and emits dataChanged for the
+        cell, so the edit can be undone like any other.
+        """
+        if role != Qt.ItemDataRole.EditRole or not index.isValid():
+            return False
+        window = self.parent_window
+        row, col = index.row(), index.column()
+        if window is None or window._row_data(row) is None:
+            return False
+        command = CellEditCommand(window, row, col, self.data(index, Qt.ItemDataRole.EditRole), value)
+        if command.isObsolete():
+            return False
+        window.undo_stack.push(command) # Runs redo()
+        return True
+
+    def _drop_cached(self, top_left, bottom_right, roles=()):
+        """Forget the cached display text of the cells in a dataChanged range."""
+        top, bottom = top_left.row(), bottom_right.row()
+        every_row = top == 0 and bottom >= self.rowCount() - 1
+        for cache in self._display_cache[top_left.column():bottom_right.column() + 1]:
+            if every_row:
+                cache.clear()
+            else:
+                for row in range(top, bottom + 1):
+                    cache.pop(row, None)
+
+    def reload(self):
+        """Reset the model after the window's rows were replaced, added or removed."""
+        self.beginResetModel()
+        for cache in self._display_cache:
+            cache.clear()
+        self.endResetModel()
+
+    def append_pending(self, row_data):
+        """Append a row to the window's pending rows, ahead of the '+' row."""
+        row = self._plus_row()
+        self.beginInsertRows(QModelIndex(), row, row)
+        self.parent_window.pending.append(row_data)
+        # The '+' row moves down one; its cached text now belongs to the new row's index
+        for cache in self._display_cache:
+            cache.pop(row, None)
+        self.endInsertRows()
+
+    def refresh_row(self, row):
+        """Repaint every cell of a row after its values or its dirty/error state changed."""
+        if 0 <= row < self.rowCount():
+            self.dataChanged.emit(self.index(row, 0), self.index(row, len(self._cols) - 1))
+
+    def refresh_all(self):
+        """Repaint every cell, e.g. after the dropdown names or currencies were reloaded."""
+        last_row = self.rowCount() - 1
+        if last_row >= 0:
+            self.dataChanged.emit(self.index(0, 0), self.index(last_row, len(self._cols) - 1))
+
+# --- END OF FILE transaction_model.py ---
@@ -51,6 +51,14 @@ class CategoryManager:
         except sqlite3.Error as e:
             print(f"Error loading special categories: {e}")
     
+    def has_special_categories(self) -> bool:
+        """Return True if every special category was found when loading."""
+        return all(
+            cat_id is not None
+            for types in self.special_categories.values()
+            for cat_id in types.values()
+        )
+
     def ensure_special_categories(self):
         """Ensure all special categories exist in the database."""
         for name, types in self.special_categories.items():
@@ -82,7 +90,6 @@ class CategoryManager:
                 "INSERT INTO categories (category, type) VALUES (?, ?)",
                 (name, transaction_type)
             )
-            self.conn.commit()
             return cursor.lastrowid
         except sqlite3.Error as e:
             print(f"Error creating category {name} for {transaction_type}: {e}")
@@ -116,7 +123,6 @@ class CategoryManager:
                 "INSERT INTO sub_categories (sub_category, category_id) VALUES (?, ?)",
                 (name, category_id)
             )
-            self.conn.commit()
             return cursor.lastrowid
         except sqlite3.Error as e:
             print(f"Error ensuring subcategory {name} for category {category_id}: {e}")
@@ -3,7 +3,6 @@
 from decimal import Decimal, InvalidOperation, ROUND_HALF_UP # Re-add InvalidOperation and ROUND_HALF_UP
 from PyQt6.QtGui import QUndoCommand
 from PyQt6.QtCore import Qt, QTimer # Import Qt for roles and QTimer
-from PyQt6.QtWidgets import QTableWidgetItem
 
 # Import debug configuration
 try:
@@ -223,7 +222,7 @@ class CellEditCommand(QUndoCommand):
 
         # --- Update Dirty State (for existing transactions only) ---
         if not self.is_pending and self.rowid is not None:
-            original_db_value = self.main_window._original_data_cache.get(self.rowid, {}).get(self.col_key)
+            original_db_value = self.main_window._original_value(self.rowid, self.col_key)
             current_value_in_dict = self.target_data_dict.get(self.col_key) # Use .get for safety
 
             # Compare appropriately (Decimal vs Decimal, others as string)
@@ -260,9 +259,9 @@ class CellEditCommand(QUndoCommand):
         model = self.main_window.tbl.model()
         if model:
              model_index = model.index(self.row, self.col)
-             # Emit dataChanged for the specific cell and potentially related cells if names changed
+             # Emit dataChanged for the edited cell; EditRole marks it as an edit for the window.
+             # Related cells whose names changed with an ID are repainted by _recolor_row below.
              model.dataChanged.emit(model_index, model_index, [Qt.ItemDataRole.DisplayRole, Qt.ItemDataRole.EditRole])
-             # TODO: If name fields were updated due to ID change, emit dataChanged for those cells too
 
         self.main_window._recolor_row(self.row)
         self.main_window._update_button_states()
@@ -5,6 +5,7 @@ This module provides functionality to store and manage default values for transa
 """
 import json
 import os
+from contextlib import contextmanager
 from datetime import datetime
 from decimal import Decimal, InvalidOperation
 from PyQt6.QtCore import QDate
@@ -40,6 +41,9 @@ class DefaultValues:
     def __init__(self):
         """Initialize and load default values from file."""
         self._defaults = {}
+        # Inside batch() saves are deferred and flushed once on exit
+        self._batch_depth = 0
+        self._save_pending = False
         self.load()
 
     def load(self):
@@ -62,17 +66,52 @@ class DefaultValues:
 
     def save(self):
         """Save the current default values to the JSON file."""
+        if self._batch_depth:
+            self._save_pending = True
+            return
+
         try:
-            with open(DEFAULT_VALUES_FILE, 'w') as f:
+            # Write to a temporary file and swap it in, so a failed write never
+            # leaves a truncated defaults file behind
+            tmp_path = DEFAULT_VALUES_FILE + ".tmp"
+            with open(tmp_path, 'w') as f:
                 json.dump(self._defaults, f, indent=4)
+            os.replace(tmp_path, DEFAULT_VALUES_FILE)
+            # Guarded so the defaults dict isn't formatted on every save when debugging is off
+            if debug_config.is_enabled('DEFAULTS'):
                 debug_print('DEFAULTS', f"Saved defaults: {self._defaults}")
         except Exception as e:
             debug_print('DEFAULTS', f"Error saving defaults: {e}")
 
+    @contextmanager
+    def batch(self):
+        """
+        Defer saving until the block exits, then write the file once if anything changed.
+
+        Example:
+            with default_values.batch():
+                default_values.set_value('name_in', 'Groceries')
+                default_values.set_value('type_in', 'Expense')
+        """
+        self._batch_depth += 1
+        try:
+            yield self
+        finally:
+            self._batch_depth -= 1
+            if not self._batch_depth and self._save_pending:
+                self._save_pending = False
+                self.save()
+
     def get_value(self, field_key):
         """Get the default value for a specific field key."""
         return self._defaults.get(field_key)
 
+    def set_many(self, values):
+        """Set several defaults (field key -> value, None clears) and save once."""
+        with self.batch():
+            for field_key, value in values.items():
+                self.set_value(field_key, value)
+
     def set_value(self, field_key, value):
         """Set a default value for a field key and save."""
         if field_key in self.DEFAULTABLE_FIELDS:
@@ -85,13 +124,15 @@ class DefaultValues:
                  # Allow explicitly clearing a default
                  if field_key in self._defaults:
                      del self._defaults[field_key]
-                     debug_print('DEFAULTS', f"Cleared default for '{field_key}'")
+                     if debug_config.is_enabled('DEFAULTS'):
+                         debug_print('DEFAULTS', f"Cleared default for '{field_key}'")
                      self.save()
                  return # Don't store None
 
             if self._defaults.get(field_key) != value:
                 self._defaults[field_key] = value
-                debug_print('DEFAULTS', f"Set default '{field_key}' to '{value}'")
+                if debug_config.is_enabled('DEFAULTS'):
+                    debug_print('DEFAULTS', f"Set default '{field_key}' to '{value}'")
                 self.save()
         else:
             debug_print('DEFAULTS', f"Warning: Attempted to set default for unknown field '{field_key}'")
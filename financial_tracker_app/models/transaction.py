@@ -14,6 +14,14 @@ class Transaction:
     including validation and formatting.
     """
 
+    # Fixed attribute set: no per-instance __dict__, so each loaded transaction
+    # is smaller and attribute access skips the dict lookup
+    __slots__ = (
+        'rowid', 'name', 'value', 'account_id', 'transaction_type',
+        'category_id', 'subcategory_id', 'description', 'date',
+        'account_name', 'category_name', 'subcategory_name', 'currency_info',
+    )
+
     def __init__(self, rowid=None, name="", value=0.0, account_id=None, transaction_type="Expense",
                  category_id=None, subcategory_id=None, description="", date=None):
         """
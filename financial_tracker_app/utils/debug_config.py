@@ -118,7 +118,15 @@ class DebugConfig:
 debug_config = DebugConfig()
 
 
-def debug_print(category, message):
-    """Print a debug message if the category is enabled"""
+def debug_print(category, message, *args):
+    """Print a debug message if the category is enabled.
+
+    Extra arguments are %-formatted into the message only when the category is
+    enabled, so hot paths can pass raw values instead of building an f-string:
+
+        debug_print('CATEGORY', "Forcing %s for category_id=%s", name, cat_id)
+    """
     if debug_config.is_enabled(category):
+        if args:
+            message = message % args
         print(f"DEBUG {category}: {message}")
@@ -219,6 +219,33 @@ def apply_retention_policy():
     if deleted_count > 0:
         print(f"Removed {deleted_count} old backups according to retention policy")
 
+def copy_database(src_path, dst_path):
+    """
+    Copy a SQLite database through SQLite's online backup API.
+
+    The app runs the database in WAL mode, so recently committed transactions may
+    still live in the -wal file until a checkpoint; a plain file copy of the .db
+    would silently miss them. The copy is switched back to a rollback journal so
+    it is a single self-contained file.
+    """
+    src = sqlite3.connect(src_path)
+    try:
+        dst = sqlite3.connect(dst_path)
+        try:
+            src.backup(dst)
+            dst.execute("PRAGMA journal_mode = DELETE")
+        finally:
+            dst.close()
+    finally:
+        src.close()
+
+def remove_wal_files(db_path):
+    """Delete a database's -wal and -shm files, so stale WAL frames can't be replayed onto it."""
+    for suffix in ("-wal", "-shm"):
+        path = db_path + suffix
+        if os.path.exists(path):
+            os.remove(path)
+
 def create_backup(force=False):
     """Create a backup of the database"""
     if not os.path.exists(DB_FILE):
@@ -238,7 +265,7 @@ def create_backup(force=False):
     
     # Copy the database file
     try:
-        shutil.copy2(DB_FILE, backup_file)
+        copy_database(DB_FILE, backup_file)
         print(f"Backup created: {backup_file}")
         
         # Update last backup time in config
@@ -313,13 +340,17 @@ def restore_backup(backup_id=None):
         timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
         pre_restore_backup = os.path.join(BACKUP_DIR, f"{timestamp}_pre_restore_{os.path.basename(DB_FILE)}")
         try:
-            shutil.copy2(DB_FILE, pre_restore_backup)
+            # Through SQLite, so transactions still in the -wal file are kept
+            copy_database(DB_FILE, pre_restore_backup)
             print(f"Created backup of current database: {pre_restore_backup}")
         except Exception as e:
             print(f"Warning: Could not backup current database: {e}")
     
-    # Restore the selected backup
+    # Restore the selected backup. The current -wal/-shm belong to the old database
+    # (their content is in the pre-restore backup); left in place, SQLite would
+    # replay them onto the restored file.
     try:
+        remove_wal_files(DB_FILE)
         shutil.copy2(backup_file, DB_FILE)
         print(f"Successfully restored database from: {os.path.basename(backup_file)}")
         return True